@@ -22,7 +22,11 @@ class TrueMarkForge:
         self.vault = VaultFusionBridge(vault_base_path)
         self.renderer = ForensicCertificateRenderer()
         self.crypto = CryptoAnchorEngine()
-        self.skg_bridge = CertificateSKGBridge(vault_base_path)
+        self.skg_bridge = CertificateSKGBridge(
+            vault_base_path,
+            serial_index=self.vault.serial_index,
+            fusion_queue=self.vault.fusion_queue
+        )
 
     async def mint_official_certificate(self, metadata: dict) -> dict:
         """
@@ -52,7 +56,7 @@ class TrueMarkForge:
         # 4. Render forensic PDF with embedded signature
         pdf_path = await self.renderer.create_forensic_pdf(
             data={**metadata, **payload, **signature_bundle},
-            output_dir=self.vault.certificates_path
+            output_dir=self.vault.certificate_dir_for(dals_serial)
         )
         # 5. WorkerVaultWriter log (creates immutable record)
         vault_txn = await self.vault.record_certificate_issuance(
@@ -60,12 +64,14 @@ class TrueMarkForge:
             dals_serial=dals_serial,
             pdf_path=pdf_path,
             payload=payload,
-            signature=signature_bundle['ed25519_signature']
+            signature=signature_bundle['ed25519_signature'],
+            payload_hash=signature_bundle['payload_hash']
         )
 
-        # 5.5. SKG Integration (NEW - Swarm Knowledge Graph ingestion)
+        # 5.5. SKG Integration (queued; ingested by the SKG background worker)
+        certificate_data = {**metadata, **payload, **signature_bundle}
         skg_payload = await self.skg_bridge.on_certificate_minted(
-            certificate_data={**metadata, **payload, **signature_bundle},
+            certificate_data=certificate_data,
             vault_txn_id=vault_txn
         )
 
@@ -75,7 +81,8 @@ class TrueMarkForge:
             "dals_serial": dals_serial,
             "vault_txn": vault_txn,
             "skg_payload": skg_payload,  # Include SKG data
-            "asset_metadata": payload
+            "asset_metadata": payload,
+            "certificate_data": certificate_data  # What peer SKGs ingest (title, signature bundle)
         })
 
         # 7. Return verification package
@@ -107,6 +114,10 @@ class TrueMarkForge:
         stardate = f"{now.year - 1900}{now.month:02d}{now.day:02d}.{now.hour:02d}{now.minute:02d}"
         return stardate
 
+    def close(self):
+        """Drain pending SKG ingestion and release the graph."""
+        self.skg_bridge.close()
+
 # CLI Wrapper (run this)
 if __name__ == "__main__":
     import argparse
@@ -133,6 +144,7 @@ if __name__ == "__main__":
     }
 
     result = asyncio.run(forge.mint_official_certificate(metadata))
+    forge.close()
 
     print("✅ CERTIFICATE MINTED & ANCHORED")
     print(f"📄 PDF: {result['certificate_pdf']}")
@@ -0,0 +1,478 @@
+# fusion_queue_engine.py
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+
+class TopicLog:
+    """
+    One topic's append-only log, split into size/age-rotated segments.
+
+    Segments are named by the offset of their first record
+    (``{base_offset:020d}.jsonl``) so the segment holding any offset is a
+    bisect over file names.
+    """
+
+    def __init__(self, topic_path: Path, segment_max_bytes: int, segment_max_age: float):
+        self.topic_path = topic_path
+        self.topic_path.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+
+        self.segments: List[int] = sorted(int(p.stem) for p in topic_path.glob("*.jsonl"))
+        if not self.segments:
+            self.segments = [0]
+
+        self.next_offset = self._recover_next_offset()
+        self._hot_file = open(self.segment_path(self.hot_base), "ab")
+        self._hot_size = self._hot_file.tell()
+        self._hot_opened_at = time.time()
+
+        # Offsets below this are fsynced (see FusionQueueEngine.publish)
+        self.synced_offset = 0
+        self.sync_lock = threading.Lock()
+
+    @property
+    def hot_base(self) -> int:
+        return self.segments[-1]
+
+    @property
+    def earliest_offset(self) -> int:
+        return self.segments[0]
+
+    def segment_path(self, base_offset: int) -> Path:
+        return self.topic_path / f"{base_offset:020d}.jsonl"
+
+    def segment_for(self, offset: int) -> int:
+        """Base offset of the segment that holds (or would hold) ``offset``."""
+        return self.segments[max(bisect_right(self.segments, offset) - 1, 0)]
+
+    def next_segment(self, base_offset: int) -> Optional[int]:
+        i = bisect_right(self.segments, base_offset)
+        return self.segments[i] if i < len(self.segments) else None
+
+    def append(self, key: Optional[str], payload: Any, timestamp: Optional[str] = None) -> dict:
+        if self._hot_size and (
+            self._hot_size >= self.segment_max_bytes
+            or time.time() - self._hot_opened_at >= self.segment_max_age
+        ):
+            self.roll()
+
+        offset, position = self.next_offset, self._hot_size
+        line = json.dumps({
+            "offset": offset,
+            "timestamp": timestamp or datetime.utcnow().isoformat() + "Z",
+            "key": key,
+            "payload": payload
+        }).encode() + b"\n"
+
+        self._hot_file.write(line)
+        self._hot_file.flush()
+        self._hot_size += len(line)
+        self.next_offset += 1
+        return {"offset": offset, "segment": self.hot_base, "position": position, "length": len(line)}
+
+    def read_at(self, base_offset: int, position: int, length: int) -> bytes:
+        """Positioned read of a raw record."""
+        self._hot_file.flush()
+        with open(self.segment_path(base_offset), "rb") as f:
+            return os.pread(f.fileno(), length, position)
+
+    def roll(self):
+        """Seal (and fsync) the hot segment and open a new one."""
+        self._hot_file.flush()
+        os.fsync(self._hot_file.fileno())
+        self._hot_file.close()
+        self.synced_offset = max(self.synced_offset, self.next_offset)
+        self.segments.append(self.next_offset)
+        self._hot_file = open(self.segment_path(self.hot_base), "ab")
+        self._fsync_dir()
+        self._hot_size = 0
+        self._hot_opened_at = time.time()
+
+    def sync(self, offset: int, lock: threading.RLock):
+        """
+        Group fsync: make every record up to ``offset`` durable. One fsync
+        covers every record appended before it started, so concurrent
+        callers mostly find their record already synced. ``lock`` guards
+        appends and is only held to pick up the hot file.
+        """
+        with self.sync_lock:
+            if self.synced_offset > offset:
+                return
+            with lock:
+                fd = os.dup(self._hot_file.fileno())
+                through = self.next_offset
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.synced_offset = max(self.synced_offset, through)
+
+    def close(self):
+        self._hot_file.close()
+
+    def _fsync_dir(self):
+        """Persist the directory entry of a newly created segment."""
+        fd = os.open(self.topic_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _recover_next_offset(self) -> int:
+        """Find the next offset from the hot segment, dropping a torn tail."""
+        path = self.segment_path(self.hot_base)
+        next_offset, valid_bytes = self.hot_base, 0
+        if path.exists():
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    next_offset = json.loads(line)["offset"] + 1
+                    valid_bytes += len(line)
+            if valid_bytes != path.stat().st_size:
+                os.truncate(path, valid_bytes)
+        return next_offset
+
+
+class FusionQueueEngine:
+    """
+    Local, file-backed FusionQueue.
+
+    Producers append to per-topic segmented logs; consumer groups track their
+    own committed offsets so each one reads only what it has not yet seen.
+    Sealed segments are subject to time/size retention and key compaction.
+    Consumers are expected to share the producing process's engine instance.
+    """
+
+    SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+    SEGMENT_MAX_AGE = 3600.0
+    RETENTION_SECONDS = 7 * 24 * 3600.0
+
+    def __init__(self, queue_path: Path, segment_max_bytes: int = SEGMENT_MAX_BYTES,
+                 segment_max_age: float = SEGMENT_MAX_AGE,
+                 retention_seconds: Optional[float] = RETENTION_SECONDS,
+                 retention_bytes: Optional[int] = None):
+        self.queue_path = queue_path
+        self.queue_path.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.retention_seconds = retention_seconds
+        self.retention_bytes = retention_bytes
+
+        self._topics: Dict[str, TopicLog] = {}
+        self._lock = threading.RLock()
+        self._new_records = threading.Condition(self._lock)
+
+    def topic(self, name: str) -> TopicLog:
+        with self._lock:
+            if name not in self._topics:
+                self._topics[name] = TopicLog(self.queue_path / name,
+                                              self.segment_max_bytes, self.segment_max_age)
+                self._import_legacy_file(name)
+            return self._topics[name]
+
+    def publish(self, topic: str, payload: Any, key: Optional[str] = None, sync: bool = False) -> dict:
+        """
+        Append a record to a topic.
+        Returns its receipt: offset plus the segment/position it was written at.
+        By default the record is only flushed to the OS; with ``sync`` it is
+        fsynced (grouped with concurrent publishers) before returning.
+        """
+        with self._lock:
+            log = self.topic(topic)
+            receipt = log.append(key, payload)
+            self._new_records.notify_all()
+        if sync:
+            log.sync(receipt["offset"], self._lock)
+        return receipt
+
+    def consumer(self, topic: str, group_id: str) -> "FusionQueueConsumer":
+        return FusionQueueConsumer(self, topic, group_id)
+
+    def next_offset(self, topic: str) -> int:
+        """Offset the next record published to ``topic`` will get."""
+        return self.topic(topic).next_offset
+
+    def wait_for_records(self, timeout: float):
+        with self._new_records:
+            self._new_records.wait(timeout)
+
+    def enforce_retention(self, topic: str) -> List[int]:
+        """
+        Drop sealed segments past the retention window or size budget.
+        Returns the base offsets that were removed.
+        """
+        with self._lock:
+            log = self.topic(topic)
+            removed = []
+            now = time.time()
+            sealed = log.segments[:-1]
+            sizes = {base: log.segment_path(base).stat().st_size for base in sealed}
+            total_bytes = sum(sizes.values()) + log.segment_path(log.hot_base).stat().st_size
+
+            for base in sealed:
+                path = log.segment_path(base)
+                expired = (self.retention_seconds is not None
+                           and now - path.stat().st_mtime > self.retention_seconds)
+                oversized = self.retention_bytes is not None and total_bytes > self.retention_bytes
+                if not (expired or oversized):
+                    break
+                path.unlink()
+                total_bytes -= sizes[base]
+                log.segments.remove(base)
+                removed.append(base)
+
+            return removed
+
+    def compact(self, topic: str) -> dict:
+        """
+        Keep only the latest record per key in sealed segments.
+
+        Records without a key are never compacted. Offsets are preserved, so
+        committed consumer positions stay valid; segments are swapped in with
+        an atomic rename.
+        """
+        with self._lock:
+            log = self.topic(topic)
+            latest: Dict[str, int] = {}
+            for base in log.segments:
+                with open(log.segment_path(base), "rb") as f:
+                    for line in f:
+                        if line.endswith(b"\n"):
+                            record = json.loads(line)
+                            if record.get("key") is not None:
+                                latest[record["key"]] = record["offset"]
+
+            stats = {"segments_rewritten": 0, "records_dropped": 0}
+            for base in log.segments[:-1]:
+                path = log.segment_path(base)
+                tmp_path = path.with_suffix(".compacting")
+                dropped = 0
+                with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                    for line in src:
+                        record = json.loads(line)
+                        key = record.get("key")
+                        if key is None or latest.get(key) == record["offset"]:
+                            dst.write(line)
+                        else:
+                            dropped += 1
+                if dropped:
+                    os.replace(tmp_path, path)
+                    stats["segments_rewritten"] += 1
+                    stats["records_dropped"] += dropped
+                else:
+                    tmp_path.unlink()
+
+            return stats
+
+    def close(self):
+        with self._lock:
+            for log in self._topics.values():
+                log.close()
+
+    def _import_legacy_file(self, topic: str):
+        """Adopt a pre-segment ``{topic}.jsonl`` file as the start of the topic."""
+        legacy_path = self.queue_path / f"{topic}.jsonl"
+        log = self._topics[topic]
+        if not legacy_path.exists() or log.next_offset:
+            return
+
+        with open(legacy_path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                payload = record.get("payload", {})
+                key = payload.get("certificate_event", {}).get("dals_serial")
+                log.append(key, payload, timestamp=record.get("timestamp"))
+
+        legacy_path.rename(legacy_path.with_suffix(".jsonl.migrated"))
+
+
+class FusionQueueConsumer:
+    """
+    Consumer-group cursor over a topic with explicit offset commits.
+    """
+
+    def __init__(self, engine: FusionQueueEngine, topic: str, group_id: str):
+        self.engine = engine
+        self.topic = topic
+        self.group_id = group_id
+        self.log = engine.topic(topic)
+
+        self.offsets_path = self.log.topic_path / "consumers" / f"{group_id}.json"
+        self.offsets_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.committed_offset = self._load_committed()
+        self.position = self.committed_offset
+
+        # Read cursor cache: (segment base, segment inode, byte position)
+        self._cursor = None
+
+    def poll(self, max_records: int = 500, timeout: float = 0.0) -> List[dict]:
+        """
+        Return up to ``max_records`` records past the current position,
+        waiting up to ``timeout`` seconds for at least one to arrive.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            records = self._read(max_records)
+            remaining = deadline - time.monotonic()
+            if records or remaining <= 0:
+                return records
+            self.engine.wait_for_records(min(remaining, 0.05))
+
+    def commit(self, offset: Optional[int] = None):
+        """Durably commit the consumer position (defaults to everything polled)."""
+        self.committed_offset = self.position if offset is None else offset
+        tmp_path = self.offsets_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"topic": self.topic, "group_id": self.group_id,
+                       "offset": self.committed_offset,
+                       "committed_at": datetime.utcnow().isoformat() + "Z"}, f)
+        os.replace(tmp_path, self.offsets_path)
+
+    def seek(self, offset: int):
+        self.position = offset
+        self._cursor = None
+
+    def lag(self) -> int:
+        return max(self.log.next_offset - self.position, 0)
+
+    def _load_committed(self) -> int:
+        if self.offsets_path.exists():
+            with open(self.offsets_path, "r") as f:
+                return json.load(f)["offset"]
+        return 0
+
+    def _read(self, max_records: int) -> List[dict]:
+        records: List[dict] = []
+        if self.position < self.log.earliest_offset:
+            # Retention removed our position; resume from the oldest record
+            self.seek(self.log.earliest_offset)
+
+        while len(records) < max_records and self.position < self.log.next_offset:
+            base = self.log.segment_for(self.position)
+            path = self.log.segment_path(base)
+            try:
+                inode = path.stat().st_ino
+            except FileNotFoundError:
+                self._cursor = None
+                continue
+
+            byte_pos = 0
+            if self._cursor and self._cursor[0] == base and self._cursor[1] == inode:
+                byte_pos = self._cursor[2]
+
+            with open(path, "rb") as f:
+                f.seek(byte_pos)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    byte_pos += len(line)
+                    record = json.loads(line)
+                    if record["offset"] < self.position:
+                        continue
+                    records.append(record)
+                    self.position = record["offset"] + 1
+                    if len(records) >= max_records:
+                        break
+
+            self._cursor = (base, inode, byte_pos)
+
+            if len(records) < max_records:
+                next_base = self.log.next_segment(base)
+                if next_base is None:
+                    break
+                # Segment exhausted (possibly with compacted gaps)
+                self.position = max(self.position, next_base)
+
+        return records
+
+
+class InProcessFusionQueue:
+    """
+    In-memory stand-in for FusionQueueEngine with the same publish/consumer API.
+    Useful for SKG workers living in the same process and for tests.
+    """
+
+    def __init__(self, max_records: Optional[int] = None):
+        self._topics: Dict[str, Deque[dict]] = {}
+        self._next_offsets: Dict[str, int] = {}
+        self._committed: Dict[tuple, int] = {}
+        self._lock = threading.RLock()
+        self._new_records = threading.Condition(self._lock)
+        self.max_records = max_records
+
+    def publish(self, topic: str, payload: Any, key: Optional[str] = None, sync: bool = False) -> dict:
+        with self._lock:
+            records = self._topics.setdefault(topic, deque(maxlen=self.max_records))
+            offset = self._next_offsets.get(topic, 0)
+            records.append({
+                "offset": offset,
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "key": key,
+                "payload": payload
+            })
+            self._next_offsets[topic] = offset + 1
+            self._new_records.notify_all()
+        return {"offset": offset, "segment": None, "position": None, "length": None}
+
+    def consumer(self, topic: str, group_id: str) -> "InProcessConsumer":
+        return InProcessConsumer(self, topic, group_id)
+
+    def next_offset(self, topic: str) -> int:
+        with self._lock:
+            return self._next_offsets.get(topic, 0)
+
+    def wait_for_records(self, timeout: float):
+        with self._new_records:
+            self._new_records.wait(timeout)
+
+
+class InProcessConsumer:
+    """Consumer-group cursor for InProcessFusionQueue."""
+
+    def __init__(self, queue: InProcessFusionQueue, topic: str, group_id: str):
+        self.queue = queue
+        self.topic = topic
+        self.group_id = group_id
+        self.committed_offset = queue._committed.get((topic, group_id), 0)
+        self.position = self.committed_offset
+
+    def poll(self, max_records: int = 500, timeout: float = 0.0) -> List[dict]:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.queue._lock:
+                buffered = self.queue._topics.get(self.topic, ())
+                if buffered and self.position < buffered[0]["offset"]:
+                    self.position = buffered[0]["offset"]
+                start = self.position - buffered[0]["offset"] if buffered else 0
+                records = list(islice(buffered, start, start + max_records))
+                if records:
+                    self.position = records[-1]["offset"] + 1
+                    return records
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self.queue._new_records.wait(remaining)
+
+    def commit(self, offset: Optional[int] = None):
+        self.committed_offset = self.position if offset is None else offset
+        with self.queue._lock:
+            self.queue._committed[(self.topic, self.group_id)] = self.committed_offset
+
+    def seek(self, offset: int):
+        self.position = offset
+
+    def lag(self) -> int:
+        return max(self.queue._next_offsets.get(self.topic, 0) - self.position, 0)
@@ -2,8 +2,10 @@
 from pathlib import Path
 import json
 from datetime import datetime
-# from worker_vault_writer import WorkerVaultWriter  # Import when available
-# from fusion_queue_engine import FusionQueueEngine  # Import when available
+from summary_store import CertificateSummaryStore, certificate_shard
+from worker_vault_writer import WorkerVaultWriter
+from fusion_queue_engine import FusionQueueEngine
+from vault_index import VaultSerialIndex
 
 class VaultFusionBridge:
     """
@@ -11,16 +13,40 @@ class VaultFusionBridge:
     """
 
     def __init__(self, vault_base_path: Path):
-        # self.vault_writer = WorkerVaultWriter(vault_base_path)  # Uncomment when available
-        # self.fusion_queue = FusionQueueEngine()  # Uncomment when available
+        self.vault_writer = WorkerVaultWriter(vault_base_path)
+        self.fusion_queue = FusionQueueEngine(vault_base_path / "fusion_queue")
         self.vault_base_path = vault_base_path
         self.certificates_path = vault_base_path / "certificates" / "issued"
         self.certificates_path.mkdir(parents=True, exist_ok=True)
+        self.summary_store = CertificateSummaryStore(vault_base_path / "certificates" / "summaries")
+
+        # Serial/payload_hash/wallet → record locations across all vault logs
+        self.serial_index = VaultSerialIndex(vault_base_path / "index" / "serial_index.db")
+        self.serial_index.register_reader(
+            "events:",
+            lambda log, segment, offset, length: self.vault_writer.log_for(log.split(":", 1)[1]).read_at(segment, offset, length)
+        )
+        self.serial_index.register_reader(
+            "summaries",
+            lambda log, segment, offset, length: self.summary_store.read_at(segment, offset, length)
+        )
+        self.serial_index.register_reader(
+            "fusion:",
+            lambda log, segment, offset, length: self.fusion_queue.topic(log.split(":", 1)[1]).read_at(segment, offset, length)
+        )
+
+    def certificate_dir_for(self, dals_serial: str) -> Path:
+        """Sharded output directory for a certificate's PDF."""
+        shard_dir = self.certificates_path / certificate_shard(dals_serial)
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        return shard_dir
 
     async def record_certificate_issuance(self, worker_id: str, dals_serial: str,
-                                         pdf_path: Path, payload: dict, signature: str):
+                                         pdf_path: Path, payload: dict, signature: str,
+                                         payload_hash: str):
         """
         Logs certificate genesis to worker vault and creates audit trail.
+        ``payload_hash`` comes from the signature bundle, not the payload.
         """
 
         # Write event to worker events.jsonl (simplified)
@@ -29,40 +55,74 @@ class VaultFusionBridge:
             "event_type": "CERTIFICATE_MINTED",
             "dals_serial": dals_serial,
             "worker_id": worker_id,
-            "payload_hash": payload.get('payload_hash', ''),
+            "payload_hash": payload_hash,
             "signature": signature[:32] + "...",  # Truncate for display
             "pdf_size_bytes": pdf_path.stat().st_size if pdf_path.exists() else 0
         }
 
-        # Save to events file
-        events_file = self.vault_base_path / "workers" / f"{worker_id}_events.jsonl"
-        events_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(events_file, "a") as f:
-            json.dump(event_record, f)
-            f.write("\n")
+        # Append to hash-chained worker events log
+        receipt = self.vault_writer.append_event(worker_id, event_record)
+        index_keys = {
+            "serial": dals_serial,
+            "payload_hash": payload_hash,
+            "wallet": payload.get('wallet')
+        }
+        self.serial_index.add(f"events:{worker_id}", receipt["segment"], receipt["offset"], receipt["length"], **index_keys)
 
-        # Write summary to summary.json
+        # Append summary to packed segment store
         summary = {
             "dals_serial": dals_serial,
             "minted_at": datetime.utcnow().isoformat() + "Z",
             "pdf_path": str(pdf_path),
             "payload": payload,
             "verification_url": f"https://verify.truemark.io/{dals_serial}",
-            "vault_integrity_hash": self._calculate_vault_hash()
+            "vault_integrity_hash": event_record["chain_hash"],
+            "vault_integrity_seq": event_record["seq"]
         }
 
-        summary_path = self.certificates_path / f"{dals_serial}_summary.json"
-        with open(summary_path, "w") as f:
-            json.dump(summary, f, indent=2)
+        segment, offset, length = self.summary_store.append(dals_serial, summary)
+        self.serial_index.add("summaries", segment, offset, length, **index_keys)
 
         return f"VAULT_TXN_{dals_serial}_{datetime.utcnow().timestamp()}"
 
+    def get_certificate_summary(self, dals_serial: str):
+        """
+        Fetch a certificate summary from the segment store.
+        """
+        return self.summary_store.get(dals_serial)
+
+    def lookup_certificate(self, dals_serial: str) -> dict:
+        """
+        Join everything the vault holds about a serial using the serial index:
+        worker events, summary, swarm broadcasts and SKG records.
+        """
+        joined = {
+            "dals_serial": dals_serial,
+            "events": [],
+            "summary": None,
+            "broadcasts": [],
+            "skg": {"nodes": [], "edges": [], "transactions": []}
+        }
+
+        for log, raw_records in self.serial_index.lookup("serial", dals_serial).items():
+            records = [json.loads(raw) for raw in raw_records]
+            if log.startswith("events:"):
+                joined["events"].extend(records)
+            elif log == "summaries":
+                joined["summary"] = records[-1]
+            elif log.startswith("fusion:"):
+                joined["broadcasts"].extend(records)
+            elif log.startswith("skg:"):
+                joined["skg"][log.rsplit(":", 1)[1]].extend(records)
+
+        return joined
+
     async def broadcast_to_swarm(self, certificate_data: dict):
         """
         Broadcasts certificate metadata to swarm via FusionQueue.
         """
 
-        # Create Fusion payload (simplified - save to file)
+        # Create Fusion payload
         fusion_payload = {
             "certificate_event": certificate_data,
             "ingest_to_caleon": True,
@@ -70,26 +130,17 @@ class VaultFusionBridge:
             "priority": "high"
         }
 
-        # Save to fusion queue file
-        queue_file = self.vault_base_path / "fusion_queue" / "certificate_broadcasts.jsonl"
-        queue_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(queue_file, "a") as f:
-            json.dump({
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "payload": fusion_payload
-            }, f)
-            f.write("\n")
+        # Publish to the certificate broadcast topic (keyed by serial)
+        receipt = self.fusion_queue.publish(
+            "certificate_broadcasts",
+            fusion_payload,
+            key=certificate_data['dals_serial']
+        )
+        self.serial_index.add(
+            "fusion:certificate_broadcasts",
+            receipt["segment"], receipt["position"], receipt["length"],
+            serial=certificate_data['dals_serial'],
+            wallet=certificate_data.get('asset_metadata', {}).get('wallet')
+        )
 
         return f"SWARM_TXN_{certificate_data['dals_serial']}"
-
-    def _calculate_vault_hash(self) -> str:
-        """Calculate integrity hash of vault system."""
-        import hashlib
-
-        vault_state = json.dumps({
-            "vault_version": "1.0",
-            "last_repair": datetime.utcnow().isoformat(),
-            "worker_count": 1  # Simplified
-        }, sort_keys=True)
-
-        return hashlib.sha256(vault_state.encode()).hexdigest()[:16]
\ No newline at end of file
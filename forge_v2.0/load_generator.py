@@ -0,0 +1,324 @@
+# load_generator.py
+import asyncio
+import hashlib
+import json
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Add vault_system to path for SKG imports
+sys.path.insert(0, str(Path(__file__).parent / "vault_system" / "skg_core"))
+
+# Issuance mix (weights)
+KEP_CATEGORIES = {"Knowledge": 0.55, "Asset": 0.30, "Identity": 0.10, "Research": 0.05}
+CHAINS = {"Polygon": 0.70, "Ethereum": 0.20, "Base": 0.10}
+
+FIRST_NAMES = ["Alice", "Bjorn", "Chen", "Dara", "Emeka", "Farah", "Goran", "Hana", "Ivo", "Jun",
+               "Kofi", "Lena", "Mateo", "Nia", "Omar", "Priya", "Quinn", "Rosa", "Sven", "Tariq"]
+LAST_NAMES = ["Archive", "Labs", "Holdings", "Studio", "Foundation", "Collective", "Partners",
+              "Ventures", "Trust", "Guild", "Works", "Institute"]
+TITLE_WORDS = ["Genesis", "Ledger", "Harbor", "Quantum", "Aurora", "Atlas", "Meridian", "Cipher",
+               "Sonata", "Prism", "Summit", "Delta", "Orbit", "Relic", "Codex", "Beacon"]
+TITLE_KINDS = {"Knowledge": "Thesis", "Asset": "Deed", "Identity": "Credential", "Research": "Dataset"}
+
+BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE32 = "abcdefghijklmnopqrstuvwxyz234567"
+
+
+class SyntheticWorkload:
+    """
+    Deterministic certificate metadata at production-like scale.
+
+    The same seed always yields the same stream. Wallets are drawn from a
+    Zipf distribution (a few large holders, a long tail of one-off minters);
+    categories and chains follow weighted mixes; IPFS hashes are CIDv0 or
+    CIDv1, with a share re-minting earlier content and a few malformed ones.
+    Arrival times come from a two-state process: a Poisson baseline at
+    ``rate`` certificates/s that switches into bursts of ``burst_factor``
+    times the rate (e.g. drops, batch imports).
+    """
+
+    def __init__(self, seed: int = 42, wallets: int = 10_000, zipf_exponent: float = 0.9,
+                 rate: float = 2.0, burst_probability: float = 0.001, burst_length: int = 200,
+                 burst_factor: float = 50.0, duplicate_rate: float = 0.01,
+                 malformed_rate: float = 0.002, cidv1_share: float = 0.35,
+                 start: datetime = datetime(2025, 12, 10)):
+        self.seed = seed
+        self.wallets = wallets
+        self.rate = rate
+        self.burst_probability = burst_probability
+        self.burst_length = burst_length
+        self.burst_factor = burst_factor
+        self.duplicate_rate = duplicate_rate
+        self.malformed_rate = malformed_rate
+        self.cidv1_share = cidv1_share
+        self.start = start
+        self._wallet_weights = list(accumulate(1 / rank ** zipf_exponent for rank in range(1, wallets + 1)))
+
+    def certificates(self, count: int) -> Iterator[dict]:
+        """Forge metadata plus ``arrival`` (seconds from start) and ``burst``."""
+        rng = random.Random(self.seed)
+        categories, category_weights = zip(*KEP_CATEGORIES.items())
+        chains, chain_weights = zip(*CHAINS.items())
+        recent_hashes: List[str] = []
+        arrival, burst_left = 0.0, 0
+
+        for i in range(count):
+            if burst_left == 0 and rng.random() < self.burst_probability:
+                burst_left = self.burst_length
+            rate = self.rate * self.burst_factor if burst_left else self.rate
+            arrival += rng.expovariate(rate)
+            in_burst = burst_left > 0
+            burst_left = max(burst_left - 1, 0)
+
+            wallet = bisect_left(self._wallet_weights, rng.random() * self._wallet_weights[-1])
+            category = rng.choices(categories, category_weights)[0]
+
+            if recent_hashes and rng.random() < self.duplicate_rate:
+                ipfs_hash = rng.choice(recent_hashes)
+            elif rng.random() < self.malformed_rate:
+                ipfs_hash = "ipfs://Qm" + "".join(rng.choices(BASE58, k=rng.randint(6, 30)))
+            elif rng.random() < self.cidv1_share:
+                ipfs_hash = "ipfs://bafybei" + "".join(rng.choices(BASE32, k=52))
+            else:
+                ipfs_hash = "ipfs://Qm" + "".join(rng.choices(BASE58, k=44))
+            recent_hashes.append(ipfs_hash)
+            if len(recent_hashes) > 1024:
+                recent_hashes.pop(0)
+
+            yield {
+                "owner_name": self.owner_name(wallet),
+                "wallet_address": self.wallet_address(wallet),
+                "asset_title": f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_WORDS)} {TITLE_KINDS[category]} #{i}",
+                "ipfs_hash": ipfs_hash,
+                "kep_category": category,
+                "chain_id": rng.choices(chains, chain_weights)[0],
+                "arrival": arrival,
+                "burst": in_burst
+            }
+
+    def wallet_address(self, wallet: int) -> str:
+        return "0x" + hashlib.sha256(f"{self.seed}:{wallet}".encode()).hexdigest()[:40]
+
+    def owner_name(self, wallet: int) -> str:
+        return f"{FIRST_NAMES[wallet % len(FIRST_NAMES)]} {LAST_NAMES[wallet // len(FIRST_NAMES) % len(LAST_NAMES)]}"
+
+    def stardate(self, arrival: float) -> str:
+        """Forge stardate (years counted from 1900) for an arrival offset."""
+        moment = self.start + timedelta(seconds=arrival)
+        return f"{moment.year - 1900}{moment.month:02d}{moment.day:02d}.{moment.hour:02d}{moment.minute:02d}"
+
+    def dals_serial(self, i: int, metadata: dict) -> str:
+        code = {"Knowledge": "K", "Asset": "A", "Identity": "I"}.get(metadata["kep_category"], "X")
+        moment = self.start + timedelta(seconds=metadata["arrival"])
+        return f"DALS{code}M{moment:%Y%m%d}-{i:08X}"
+
+    def signed_payload(self, i: int, metadata: dict) -> Tuple[dict, dict]:
+        """
+        Forge payload and signature bundle, shaped like ``CryptoAnchorEngine``
+        output but with deterministic stand-in signature material (not Ed25519).
+        """
+        dals_serial = self.dals_serial(i, metadata)
+        payload = {
+            "dals_serial": dals_serial,
+            "owner": metadata["owner_name"],
+            "wallet": metadata["wallet_address"],
+            "ipfs_hash": metadata["ipfs_hash"],
+            "stardate": self.stardate(metadata["arrival"]),
+            "kep_category": metadata["kep_category"]
+        }
+        payload_hash = hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+        return payload, {
+            "payload_hash": payload_hash,
+            "ed25519_signature": hashlib.sha512(payload_hash.encode()).hexdigest(),
+            "verifying_key": hashlib.sha256(f"root:{self.seed}".encode()).hexdigest()
+        }
+
+
+def describe(certificates: List[dict]) -> dict:
+    """Shape of a generated workload, for the report."""
+    wallets = Counter(c["wallet_address"] for c in certificates)
+    hashes = Counter(c["ipfs_hash"] for c in certificates)
+    top = wallets.most_common(max(len(wallets) // 100, 1))
+    return {
+        "certificates": len(certificates),
+        "distinct_wallets": len(wallets),
+        "largest_holder": top[0][1] if top else 0,
+        "top_1pct_wallet_share": sum(n for _, n in top) / max(len(certificates), 1),
+        "categories": dict(Counter(c["kep_category"] for c in certificates)),
+        "chains": dict(Counter(c["chain_id"] for c in certificates)),
+        "duplicate_content": sum(n - 1 for n in hashes.values()),
+        "burst_share": sum(c["burst"] for c in certificates) / max(len(certificates), 1),
+        "simulated_seconds": certificates[-1]["arrival"] if certificates else 0.0
+    }
+
+
+# ----------------------------------------------------------------------
+# Drivers: each returns per-certificate latencies in seconds
+# ----------------------------------------------------------------------
+
+async def _paced(certificates: List[dict], speedup: float):
+    """Yield certificates at their arrival times / ``speedup`` (0: no pacing)."""
+    started = time.perf_counter()
+    for i, metadata in enumerate(certificates):
+        if speedup:
+            delay = metadata["arrival"] / speedup - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield i, metadata
+
+
+async def drive_skg(workload: SyntheticWorkload, certificates: List[dict], vault_path: Path,
+                    speedup: float = 0.0, engine_options: Optional[dict] = None) -> dict:
+    """Ingest straight into a SwarmKnowledgeGraphEngine."""
+    from skg_engine import SwarmKnowledgeGraphEngine
+
+    engine = SwarmKnowledgeGraphEngine(vault_path, "load_generator_worker", **(engine_options or {}))
+    latencies = []
+    async for i, metadata in _paced(certificates, speedup):
+        payload, signature_bundle = workload.signed_payload(i, metadata)
+        certificate_data = {**metadata, **payload, **signature_bundle}
+        started = time.perf_counter()
+        engine.ingest_certificate(certificate_data, f"VAULT_TXN_{certificate_data['dals_serial']}")
+        latencies.append(time.perf_counter() - started)
+    engine.flush()
+    stats = {"latencies": latencies, "skg": engine.get_swarm_knowledge_summary(),
+             "storage": engine.get_storage_metrics()}
+    engine.close()
+    return stats
+
+
+async def drive_vault(workload: SyntheticWorkload, certificates: List[dict], vault_path: Path,
+                      speedup: float = 0.0) -> dict:
+    """Vault logging and swarm broadcast through VaultFusionBridge (no PDFs, no SKG)."""
+    from integration_bridge import VaultFusionBridge
+
+    vault = VaultFusionBridge(vault_path)
+    latencies = []
+    async for i, metadata in _paced(certificates, speedup):
+        payload, signature_bundle = workload.signed_payload(i, metadata)
+        dals_serial = payload["dals_serial"]
+        started = time.perf_counter()
+        vault_txn = await vault.record_certificate_issuance(
+            worker_id="load_generator_worker",
+            dals_serial=dals_serial,
+            pdf_path=vault.certificate_dir_for(dals_serial) / f"{dals_serial}.pdf",
+            payload=payload,
+            signature=signature_bundle["ed25519_signature"],
+            payload_hash=signature_bundle["payload_hash"]
+        )
+        await vault.broadcast_to_swarm({
+            "event_type": "CERTIFICATE_MINTED",
+            "dals_serial": dals_serial,
+            "vault_txn": vault_txn,
+            "asset_metadata": payload,
+            "certificate_data": {**metadata, **payload, **signature_bundle}
+        })
+        latencies.append(time.perf_counter() - started)
+    vault.fusion_queue.close()
+    vault.summary_store.close()
+    vault.vault_writer.close()
+    vault.serial_index.close()
+    return {"latencies": latencies}
+
+
+async def drive_forge(workload: SyntheticWorkload, certificates: List[dict], vault_path: Path,
+                      speedup: float = 0.0) -> dict:
+    """Full mint path through TrueMarkForge: signing, PDF, vault, SKG queue, broadcast."""
+    from certificate_forge import TrueMarkForge
+
+    forge = TrueMarkForge(vault_base_path=vault_path)
+    latencies = []
+    async for _, metadata in _paced(certificates, speedup):
+        forge_metadata = {key: value for key, value in metadata.items() if key not in ("arrival", "burst")}
+        started = time.perf_counter()
+        await forge.mint_official_certificate(forge_metadata)
+        latencies.append(time.perf_counter() - started)
+    drain_started = time.perf_counter()
+    forge.skg_bridge.flush()
+    stats = {"latencies": latencies, "skg_drain_seconds": time.perf_counter() - drain_started,
+             "skg_ingest": forge.skg_bridge.get_ingest_metrics(),
+             "skg": forge.skg_bridge.get_skg_health_metrics()}
+    forge.close()
+    return stats
+
+
+DRIVERS = {"skg": drive_skg, "vault": drive_vault, "forge": drive_forge}
+
+
+def run(target: str, workload: SyntheticWorkload, count: int, vault_path: Path,
+        speedup: float = 0.0, trace_memory: bool = False) -> dict:
+    """Generate ``count`` certificates, drive ``target`` and build the report."""
+    certificates = list(workload.certificates(count))
+    if trace_memory:
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    stats = asyncio.run(DRIVERS[target](workload, certificates, vault_path, speedup))
+    seconds = time.perf_counter() - started
+
+    latencies = sorted(stats.pop("latencies"))
+
+    def percentile(q: float) -> float:
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000 if latencies else 0.0
+
+    report = {
+        "target": target,
+        "seed": workload.seed,
+        "workload": describe(certificates),
+        "throughput": {"seconds": seconds, "certificates_per_second": count / max(seconds, 1e-9)},
+        "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95),
+                       "p99": percentile(0.99), "max": percentile(1.0)},
+        # ru_maxrss is KiB on Linux
+        "memory": {"max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024},
+        **stats
+    }
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report["memory"].update({"traced_current_mb": current / 2 ** 20, "traced_peak_mb": peak / 2 ** 20})
+    return report
+
+
+# CLI Wrapper (run this)
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Drive the forge, vault or SKG with a deterministic synthetic workload")
+    parser.add_argument("--target", choices=sorted(DRIVERS), default="skg")
+    parser.add_argument("--certificates", type=int, default=10_000)
+    parser.add_argument("--wallets", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--zipf", type=float, default=0.9, help="Wallet reuse skew")
+    parser.add_argument("--rate", type=float, default=2.0, help="Baseline certificates per simulated second")
+    parser.add_argument("--burst-probability", type=float, default=0.001)
+    parser.add_argument("--burst-factor", type=float, default=50.0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--speedup", type=float, default=0.0,
+                        help="Replay arrivals at this multiple of simulated time (0: as fast as possible)")
+    parser.add_argument("--vault", default=None, help="Vault directory (default: a temporary one)")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report tracemalloc peak (slower)")
+    parser.add_argument("--report", default=None, help="Write the JSON report here as well")
+
+    args = parser.parse_args()
+
+    workload = SyntheticWorkload(seed=args.seed, wallets=args.wallets, zipf_exponent=args.zipf, rate=args.rate,
+                                 burst_probability=args.burst_probability, burst_factor=args.burst_factor,
+                                 duplicate_rate=args.duplicate_rate)
+    with tempfile.TemporaryDirectory() as scratch:
+        vault_path = Path(args.vault) if args.vault else Path(scratch)
+        report = run(args.target, workload, args.certificates, vault_path, args.speedup, args.trace_memory)
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.report:
+        Path(args.report).write_text(output)
+    print(output)
@@ -0,0 +1,274 @@
+# summary_store.py
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def serial_digest(dals_serial: str) -> bytes:
+    """Fixed-width 16 byte key used by the on-disk summary index."""
+    return hashlib.blake2b(dals_serial.encode(), digest_size=16).digest()
+
+
+def certificate_shard(dals_serial: str) -> Path:
+    """
+    Relative shard directory for a certificate's artifacts.
+
+    DALS serials look like ``DALSKM20251210-38A4ECD1``; artifacts are spread
+    over ``20251210/38/`` so no single directory grows past ~1/256 of a day's
+    issuance. Serials that do not follow the DALS-001 layout fall back to a
+    hash-derived bucket.
+    """
+    prefix, _, unique = dals_serial.rpartition("-")
+    issued_on = prefix[-8:]
+    if issued_on.isdigit() and len(unique) >= 2:
+        return Path(issued_on) / unique[:2].lower()
+    return Path("unsorted") / serial_digest(dals_serial).hex()[:2]
+
+
+class CertificateSummaryStore:
+    """
+    Packed, append-only store for certificate summaries.
+
+    Summaries are appended as compact JSON lines into size-rotated segment
+    files. When a segment is sealed its serial→offset index is written next to
+    it as a sorted array of fixed-width records, so lookups are a binary
+    search over an mmap instead of a directory scan. The hot (unsealed)
+    segment is indexed in memory and rebuilt from the segment on start-up.
+    """
+
+    SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+    INDEX_RECORD = struct.Struct("<16sQI")  # serial digest, offset, length
+
+    def __init__(self, store_path: Path, segment_max_bytes: int = SEGMENT_MAX_BYTES):
+        self.store_path = store_path
+        self.store_path.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+
+        # Sealed segments: segment number -> (segment mmap, index mmap)
+        self._sealed: Dict[int, Tuple[mmap.mmap, mmap.mmap]] = {}
+        self._hot_index: Dict[bytes, Tuple[int, int]] = {}
+
+        segments = self._list_segments()
+        for segment_no in segments[:-1]:
+            if not self._index_path(segment_no).exists():
+                self._write_sealed_index(segment_no, self._scan_segment(segment_no))
+
+        self.hot_segment = segments[-1] if segments else 1
+        self._hot_index = self._scan_segment(self.hot_segment)
+        self._hot_file = open(self._segment_path(self.hot_segment), "ab")
+        self._hot_size = self._hot_file.tell()
+
+    def append(self, dals_serial: str, summary: dict) -> Tuple[int, int, int]:
+        """
+        Append a summary record. Returns (segment, offset, length).
+        """
+        line = json.dumps(summary, separators=(",", ":")).encode() + b"\n"
+
+        if self._hot_size and self._hot_size + len(line) > self.segment_max_bytes:
+            self._rotate()
+
+        offset = self._hot_size
+        self._hot_file.write(line)
+        self._hot_file.flush()
+        self._hot_size += len(line)
+        self._hot_index[serial_digest(dals_serial)] = (offset, len(line))
+
+        return self.hot_segment, offset, len(line)
+
+    def get(self, dals_serial: str) -> Optional[dict]:
+        """Look up a summary by DALS serial, newest segment first."""
+        location = self.locate(dals_serial)
+        if location is None:
+            return None
+        return json.loads(self.read_at(*location))
+
+    def locate(self, dals_serial: str) -> Optional[Tuple[int, int, int]]:
+        """Return (segment, offset, length) for a serial, or None."""
+        digest = serial_digest(dals_serial)
+
+        hit = self._hot_index.get(digest)
+        if hit is not None:
+            return (self.hot_segment, *hit)
+
+        for segment_no in sorted(self._sealed_segments(), reverse=True):
+            hit = self._search_sealed_index(segment_no, digest)
+            if hit is not None:
+                return (segment_no, *hit)
+
+        return None
+
+    def read_at(self, segment_no: int, offset: int, length: int) -> bytes:
+        """Read a raw summary record from a known location."""
+        if segment_no == self.hot_segment:
+            self._hot_file.flush()
+            with open(self._segment_path(segment_no), "rb") as f:
+                return os.pread(f.fileno(), length, offset)
+        segment_map, _ = self._open_sealed(segment_no)
+        return segment_map[offset:offset + length]
+
+    def __contains__(self, dals_serial: str) -> bool:
+        return self.locate(dals_serial) is not None
+
+    def iter_summaries(self) -> Iterator[dict]:
+        """Stream every stored summary in append order."""
+        self._hot_file.flush()
+        for segment_no in self._list_segments():
+            with open(self._segment_path(segment_no), "rb") as f:
+                for line in f:
+                    if line.endswith(b"\n"):
+                        yield json.loads(line)
+
+    def close(self):
+        self._hot_file.close()
+        for segment_map, index_map in self._sealed.values():
+            segment_map.close()
+            index_map.close()
+        self._sealed.clear()
+
+    # ------------------------------------------------------------------
+    # Segment management
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, segment_no: int) -> Path:
+        return self.store_path / f"summaries_{segment_no:06d}.jsonl"
+
+    def _index_path(self, segment_no: int) -> Path:
+        return self.store_path / f"summaries_{segment_no:06d}.idx"
+
+    def _list_segments(self) -> List[int]:
+        return sorted(
+            int(p.stem.split("_")[1])
+            for p in self.store_path.glob("summaries_*.jsonl")
+        )
+
+    def _sealed_segments(self) -> List[int]:
+        return [s for s in self._list_segments() if s != self.hot_segment]
+
+    def _rotate(self):
+        """Seal the hot segment and start a new one."""
+        self._hot_file.close()
+        self._write_sealed_index(self.hot_segment, self._hot_index)
+
+        self.hot_segment += 1
+        self._hot_index = {}
+        self._hot_file = open(self._segment_path(self.hot_segment), "ab")
+        self._hot_size = 0
+
+    def _scan_segment(self, segment_no: int) -> Dict[bytes, Tuple[int, int]]:
+        """Rebuild a segment's index, dropping a torn trailing record."""
+        index: Dict[bytes, Tuple[int, int]] = {}
+        path = self._segment_path(segment_no)
+        if not path.exists():
+            return index
+
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                record = json.loads(line)
+                index[serial_digest(record["dals_serial"])] = (offset, len(line))
+                offset += len(line)
+
+        if offset != path.stat().st_size:
+            os.truncate(path, offset)
+
+        return index
+
+    def _write_sealed_index(self, segment_no: int, index: Dict[bytes, Tuple[int, int]]):
+        """Persist a sorted fixed-width index for a sealed segment."""
+        tmp_path = self._index_path(segment_no).with_suffix(".idx.tmp")
+        with open(tmp_path, "wb") as f:
+            for digest in sorted(index):
+                f.write(self.INDEX_RECORD.pack(digest, *index[digest]))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._index_path(segment_no))
+
+    def _open_sealed(self, segment_no: int) -> Tuple[mmap.mmap, mmap.mmap]:
+        if segment_no not in self._sealed:
+            maps = []
+            for path in (self._segment_path(segment_no), self._index_path(segment_no)):
+                with open(path, "rb") as f:
+                    maps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                                if path.stat().st_size else b"")
+            self._sealed[segment_no] = tuple(maps)
+        return self._sealed[segment_no]
+
+    def _search_sealed_index(self, segment_no: int, digest: bytes) -> Optional[Tuple[int, int]]:
+        _, index_map = self._open_sealed(segment_no)
+        record_size = self.INDEX_RECORD.size
+        lo, hi = 0, len(index_map) // record_size
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mid * record_size
+            key = index_map[start:start + 16]
+            if key < digest:
+                lo = mid + 1
+            elif key > digest:
+                hi = mid
+            else:
+                _, offset, length = self.INDEX_RECORD.unpack_from(index_map, start)
+                return offset, length
+
+        return None
+
+
+def migrate_legacy_summaries(issued_path: Path, store: CertificateSummaryStore,
+                             keep_legacy: bool = False) -> dict:
+    """
+    Pack flat ``{serial}_summary.json`` files into the segment store and move
+    ``{serial}_OFFICIAL.pdf`` files into the sharded layout.
+    """
+    stats = {"packed": 0, "skipped": 0, "pdfs_moved": 0}
+
+    for summary_file in sorted(issued_path.glob("*_summary.json")):
+        with open(summary_file, "r") as f:
+            summary = json.load(f)
+        dals_serial = summary["dals_serial"]
+
+        pdf_file = issued_path / f"{dals_serial}_OFFICIAL.pdf"
+        if pdf_file.exists():
+            shard_dir = issued_path / certificate_shard(dals_serial)
+            shard_dir.mkdir(parents=True, exist_ok=True)
+            new_pdf = shard_dir / pdf_file.name
+            os.replace(pdf_file, new_pdf)
+            summary["pdf_path"] = str(new_pdf)
+            stats["pdfs_moved"] += 1
+
+        if dals_serial in store:
+            stats["skipped"] += 1
+        else:
+            store.append(dals_serial, summary)
+            stats["packed"] += 1
+
+        if not keep_legacy:
+            summary_file.unlink()
+
+    return stats
+
+
+# CLI Wrapper (migration tool)
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pack legacy certificate summaries into segment files")
+    parser.add_argument("--vault", default="vault_system")
+    parser.add_argument("--keep-legacy", action="store_true",
+                        help="Leave the original *_summary.json files in place")
+
+    args = parser.parse_args()
+
+    certificates_path = Path(args.vault) / "certificates"
+    store = CertificateSummaryStore(certificates_path / "summaries")
+    result = migrate_legacy_summaries(certificates_path / "issued", store, args.keep_legacy)
+    store.close()
+
+    print(f"📦 Packed: {result['packed']}")
+    print(f"⏭️  Already packed: {result['skipped']}")
+    print(f"📄 PDFs resharded: {result['pdfs_moved']}")
@@ -0,0 +1,152 @@
+# vault_index.py
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# (log, segment, offset, length)
+Location = Tuple[str, int, int, int]
+
+
+class VaultSerialIndex:
+    """
+    Secondary index from DALS serial, payload hash and wallet to record
+    locations across every vault log (worker events, summaries, FusionQueue
+    and SKG logs).
+
+    Appenders report (log, segment, offset, length) as they write, so a
+    lookup is one indexed SQLite probe plus a positioned read per record.
+    """
+
+    KEY_TYPES = ("serial", "payload_hash", "wallet")
+
+    def __init__(self, index_path: Path):
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(index_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS locations (
+                key TEXT NOT NULL,
+                log TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_locations_key ON locations (key)")
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        # Held by lookups across locate + read, and by compactors across a
+        # segment swap + relocate, so a lookup never reads a stale position
+        self._relocation_lock = threading.RLock()
+        self._readers: Dict[str, Callable[[str, int, int, int], bytes]] = {}
+
+    def add(self, log: str, segment: int, offset: int, length: int,
+            serial: Optional[str] = None, payload_hash: Optional[str] = None,
+            wallet: Optional[str] = None):
+        """Index one record location under every key it carries."""
+        keys = {"serial": serial, "payload_hash": payload_hash, "wallet": wallet}
+        rows = [(f"{key_type}:{value}", log, segment, offset, length)
+                for key_type, value in keys.items() if value]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany("INSERT INTO locations VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def add_many(self, entries: List[Tuple[str, int, int, int, Dict[str, Optional[str]]]]):
+        """Index a batch of (log, segment, offset, length, keys) in one commit."""
+        rows = [(f"{key_type}:{value}", log, segment, offset, length)
+                for log, segment, offset, length, keys in entries
+                for key_type, value in keys.items() if value]
+        if not rows:
+            return
+        
+        with self._lock:
+            self._conn.executemany("INSERT INTO locations VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+    
+    def locate(self, key_type: str, value: str) -> List[Location]:
+        """All record locations for a key, in insertion order."""
+        if key_type not in self.KEY_TYPES:
+            raise ValueError(f"Unknown key type: {key_type}")
+
+        with self._lock:
+            return self._conn.execute(
+                "SELECT log, segment, offset, length FROM locations WHERE key = ? ORDER BY rowid",
+                (f"{key_type}:{value}",)
+            ).fetchall()
+
+    def positions(self, log: str, segments: List[int]) -> Set[Tuple[int, int]]:
+        """(segment, offset) of every indexed record of ``log`` in ``segments``."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT segment, offset FROM locations WHERE log = ? "
+                f"AND segment IN ({','.join('?' * len(segments))})",
+                (log, *segments)
+            ).fetchall()
+        return set(rows)
+    
+    def relocate(self, log: str, segments: List[int],
+                 moves: Dict[Tuple[int, int], Tuple[int, int, int]]):
+        """
+        Repoint entries after ``segments`` of ``log`` were compacted.
+        ``moves`` maps each old (segment, offset) to its record's new
+        (segment, offset, length); unmapped or now-duplicate entries are
+        dropped.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT rowid, key, segment, offset FROM locations WHERE log = ? "
+                f"AND segment IN ({','.join('?' * len(segments))}) ORDER BY rowid",
+                (log, *segments)
+            ).fetchall()
+            
+            updates, deletes, seen = [], [], set()
+            for rowid, key, segment, offset in rows:
+                moved = moves.get((segment, offset))
+                if moved is None or (key, moved) in seen:
+                    deletes.append((rowid,))
+                    continue
+                seen.add((key, moved))
+                updates.append((*moved, rowid))
+            
+            self._conn.executemany("UPDATE locations SET segment = ?, offset = ?, length = ? WHERE rowid = ?", updates)
+            self._conn.executemany("DELETE FROM locations WHERE rowid = ?", deletes)
+            self._conn.commit()
+    
+    def relocating(self) -> threading.RLock:
+        """
+        Lock to hold while a log's records move and ``relocate`` repoints
+        them; ``lookup`` waits for it.
+        """
+        return self._relocation_lock
+
+    def register_reader(self, log_prefix: str, reader: Callable[[str, int, int, int], bytes]):
+        """
+        Register how to read raw records for logs named ``{log_prefix}...``.
+        The reader receives (log, segment, offset, length).
+        """
+        self._readers[log_prefix] = reader
+
+    def read(self, location: Location) -> bytes:
+        log = location[0]
+        for prefix, reader in self._readers.items():
+            if log.startswith(prefix):
+                return reader(*location)
+        raise KeyError(f"No reader registered for log {log}")
+
+    def lookup(self, key_type: str, value: str) -> Dict[str, List[bytes]]:
+        """Raw records for a key grouped by log name."""
+        records: Dict[str, List[bytes]] = {}
+        with self._relocation_lock:
+            for location in self.locate(key_type, value):
+                records.setdefault(location[0], []).append(self.read(location))
+        return records
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
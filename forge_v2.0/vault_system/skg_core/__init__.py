@@ -7,6 +7,7 @@ from .skg_integration import CertificateSKGBridge
 from .skg_pattern_learner import SKGPatternLearner
 from .skg_drift_analyzer import SKGDriftAnalyzer
 from .skg_serializer import SKGSerializer
+from .skg_binary_snapshot import MappedGraphSnapshot
 
 __all__ = [
     'SwarmKnowledgeGraphEngine',
@@ -16,5 +17,6 @@ __all__ = [
     'CertificateSKGBridge',
     'SKGPatternLearner',
     'SKGDriftAnalyzer',
-    'SKGSerializer'
+    'SKGSerializer',
+    'MappedGraphSnapshot'
 ]
\ No newline at end of file
@@ -0,0 +1,476 @@
+# segmented_log.py
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BLOCK_ENTRY = struct.Struct("<QQII")     # uncompressed offset, compressed offset, compressed len, uncompressed len
+BLOCK_TRAILER = struct.Struct("<QI8s")   # index offset, block count, magic
+BLOCK_MAGIC = b"TMZBLK01"
+
+
+def compress_segment(source: Path, target: Path, block_size: int = 64 * 1024, level: int = 6):
+    """
+    Rewrite a plain JSONL segment as independently compressed blocks.
+
+    Blocks are cut on line boundaries and indexed by their uncompressed start
+    offset, so (segment, offset) locations recorded against the plain file
+    remain valid and a positioned read only inflates one block.
+    """
+    tmp_path = target.with_suffix(target.suffix + ".tmp")
+    entries = []
+    uncompressed_offset = 0
+
+    with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+        block = bytearray()
+
+        def emit():
+            nonlocal uncompressed_offset
+            compressed = zlib.compress(bytes(block), level)
+            entries.append((uncompressed_offset, dst.tell(), len(compressed), len(block)))
+            dst.write(compressed)
+            uncompressed_offset += len(block)
+            block.clear()
+
+        for line in src:
+            block += line
+            if len(block) >= block_size:
+                emit()
+        if block:
+            emit()
+
+        index_offset = dst.tell()
+        for entry in entries:
+            dst.write(BLOCK_ENTRY.pack(*entry))
+        dst.write(BLOCK_TRAILER.pack(index_offset, len(entries), BLOCK_MAGIC))
+        dst.flush()
+        os.fsync(dst.fileno())
+
+    os.replace(tmp_path, target)
+
+
+class CompressedSegment:
+    """Random-access reader for a block-compressed segment (mmap-backed)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        index_offset, count, magic = BLOCK_TRAILER.unpack_from(self._map, len(self._map) - BLOCK_TRAILER.size)
+        if magic != BLOCK_MAGIC:
+            raise ValueError(f"Not a block-compressed segment: {path}")
+
+        self._blocks = [BLOCK_ENTRY.unpack_from(self._map, index_offset + i * BLOCK_ENTRY.size)
+                        for i in range(count)]
+        self._starts = [b[0] for b in self._blocks]
+        self.size = self._blocks[-1][0] + self._blocks[-1][3] if self._blocks else 0
+        self._cached: Tuple[int, bytes] = (-1, b"")
+
+    def _block(self, i: int) -> bytes:
+        # Read the cache once: another thread may replace it between reads
+        cached = self._cached
+        if cached[0] != i:
+            _, c_off, c_len, _ = self._blocks[i]
+            cached = (i, zlib.decompress(self._map[c_off:c_off + c_len]))
+            self._cached = cached
+        return cached[1]
+
+    def read(self, offset: int, length: int) -> bytes:
+        out = bytearray()
+        i = bisect_right(self._starts, offset) - 1
+        while length > 0 and 0 <= i < len(self._blocks):
+            data = self._block(i)
+            start = offset - self._blocks[i][0]
+            chunk = data[start:start + length]
+            out += chunk
+            offset += len(chunk)
+            length -= len(chunk)
+            i += 1
+        return bytes(out)
+
+    def iter_lines(self, start_offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+        i = max(bisect_right(self._starts, start_offset) - 1, 0)
+        for j in range(i, len(self._blocks)):
+            base = self._blocks[j][0]
+            data = zlib.decompress(self._map[self._blocks[j][1]:self._blocks[j][1] + self._blocks[j][2]])
+            pos = 0
+            for line in data.splitlines(keepends=True):
+                if base + pos >= start_offset:
+                    yield base + pos, line
+                pos += len(line)
+
+    def iter_lines_reverse(self) -> Iterator[Tuple[int, bytes]]:
+        """Lines newest first; blocks end on line boundaries."""
+        for j in range(len(self._blocks) - 1, -1, -1):
+            base = self._blocks[j][0]
+            lines = self._block(j).splitlines(keepends=True)
+            offsets = []
+            pos = base
+            for line in lines:
+                offsets.append(pos)
+                pos += len(line)
+            yield from zip(reversed(offsets), reversed(lines))
+
+    def close(self):
+        self._map.close()
+
+
+class SegmentedLog:
+    """
+    Append-only JSONL log with size/time rotation and compressed cold segments.
+
+    The hot segment keeps the log's original file name (e.g. ``nodes.jsonl``)
+    and stays plain text. Sealed segments become ``nodes.000003.zblk``;
+    records are addressed by (segment, offset) where the offset is the byte
+    position in the uncompressed segment, so addresses survive compression.
+    """
+
+    SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, directory: Path, name: str,
+                 max_segment_bytes: int = SEGMENT_MAX_BYTES,
+                 max_segment_age: Optional[float] = None,
+                 block_size: int = BLOCK_SIZE,
+                 compress_in_background: bool = True,
+                 read_only: bool = False,
+                 fsync_on_rotate: bool = False):
+        self.directory = directory
+        self.name = name
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.block_size = block_size
+        self.compress_in_background = compress_in_background
+        self.read_only = read_only
+        # Set by owners that fsync: ``fsync`` only reaches the current hot
+        # segment, so records left in an outgoing one are synced at rotation
+        self.fsync_on_rotate = fsync_on_rotate
+
+        self.hot_path = directory / f"{name}.jsonl"
+        self._readers: Dict[int, CompressedSegment] = {}
+        self._compressors: List[threading.Thread] = []
+        self._lock = threading.RLock()
+        self._hot_opened_at = time.time()
+
+        if read_only:
+            # Another process owns the log: no writes, cleanup or compression
+            self.sealed: List[int] = self._scan_sealed() if directory.exists() else []
+            self.hot_segment = self.sealed[-1] + 1 if self.sealed else 0
+            self._hot_file = None
+            self.hot_size = self.hot_path.stat().st_size if self.hot_path.exists() else 0
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stale in directory.glob(f"{name}.*.compact*"):
+            stale.unlink()
+        self.sealed = self._scan_sealed()
+        self.hot_segment = self.sealed[-1] + 1 if self.sealed else 0
+
+        self._hot_file = open(self.hot_path, "ab")
+        self.hot_size = self._hot_file.tell()
+
+        # Finish compressions interrupted by a crash
+        for segment in self.sealed:
+            if not self._compressed_path(segment).exists():
+                self._start_compression(segment)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, data: bytes) -> Tuple[int, int]:
+        """
+        Append one or more complete lines. Returns (segment, offset) of the
+        first byte written.
+        """
+        with self._lock:
+            if self._should_rotate(len(data)):
+                self.rotate()
+
+            location = (self.hot_segment, self.hot_size)
+            self._hot_file.write(data)
+            self.hot_size += len(data)
+            return location
+
+    def flush(self):
+        with self._lock:
+            if self._hot_file is not None:
+                self._hot_file.flush()
+
+    def fsync(self):
+        """
+        Flush, then fsync the hot segment without holding the lock so appends
+        continue meanwhile. The duplicate descriptor keeps the file open if
+        it is rotated away in between; records already in sealed segments
+        were synced by ``rotate`` when ``fsync_on_rotate`` is set.
+        """
+        with self._lock:
+            if self._hot_file is None:
+                return
+            self._hot_file.flush()
+            fd = os.dup(self._hot_file.fileno())
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def rotate(self):
+        """Seal the hot segment and hand it to the compressor."""
+        with self._lock:
+            if not self.hot_size:
+                return
+            if self.fsync_on_rotate:
+                self._hot_file.flush()
+                os.fsync(self._hot_file.fileno())
+            self._hot_file.close()
+            sealed_segment = self.hot_segment
+            os.replace(self.hot_path, self._plain_path(sealed_segment))
+            self.sealed.append(sealed_segment)
+
+            self.hot_segment += 1
+            self._hot_file = open(self.hot_path, "ab")
+            self.hot_size = 0
+            self._hot_opened_at = time.time()
+
+            self._start_compression(sealed_segment)
+
+    def truncate_hot(self, size: int):
+        """Drop a torn tail from the hot segment."""
+        with self._lock:
+            self._hot_file.flush()
+            os.truncate(self.hot_path, size)
+            self.hot_size = size
+
+    def stage_compacted(self, segments: List[int], compacted_plain: Path) -> Path:
+        """Compress a compacted run of ``segments`` ready for ``replace_sealed``."""
+        staged = self.directory / f"{self.name}.{segments[-1]:06d}.compacted"
+        compress_segment(compacted_plain, staged, self.block_size)
+        compacted_plain.unlink()
+        return staged
+
+    def replace_sealed(self, segments: List[int], staged: Path):
+        """
+        Atomically swap a run of sealed segments for one compacted segment
+        (from ``stage_compacted``).
+
+        The compacted records take the ID of the last replaced segment, so
+        every later segment (and any position recorded against one) is
+        unaffected. The new segment is renamed into place before the older
+        ones are unlinked: after a crash in between, replay still sees the
+        old records first and the compacted (latest) versions last.
+        """
+        target = segments[-1]
+        with self._lock:
+            os.replace(staged, self._compressed_path(target))
+            for segment in segments[:-1]:
+                self._compressed_path(segment).unlink(missing_ok=True)
+                self._plain_path(segment).unlink(missing_ok=True)
+            self.sealed = [s for s in self.sealed if s not in segments[:-1]]
+            # In-flight readers keep their mapping until they drop it
+            for segment in segments:
+                self._readers.pop(segment, None)
+
+            # Lets external readers notice that offsets they hold went stale
+            marker = self.directory / f"{self.name}.compactions"
+            staged_marker = self.directory / f"{self.name}.compactions.tmp"
+            staged_marker.write_text(str(self.compaction_generation() + 1))
+            os.replace(staged_marker, marker)
+
+    def compaction_generation(self) -> int:
+        """Number of compactions applied to this log so far."""
+        marker = self.directory / f"{self.name}.compactions"
+        return int(marker.read_text()) if marker.exists() else 0
+
+    def wait_for_compression(self):
+        for thread in list(self._compressors):
+            thread.join()
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if not self.hot_size:
+            return False
+        if self.hot_size + incoming > self.max_segment_bytes:
+            return True
+        return self.max_segment_age is not None and time.time() - self._hot_opened_at >= self.max_segment_age
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def segments(self) -> List[int]:
+        return self.sealed + [self.hot_segment]
+
+    def read_at(self, segment: int, offset: int, length: int) -> bytes:
+        """
+        Positioned read from any segment, compressed or plain. Raises
+        FileNotFoundError for a segment compaction merged away; positions
+        are only stable while the caller excludes compaction (see
+        ``VaultSerialIndex.relocating``).
+        """
+        if segment == self.hot_segment:
+            self.flush()
+        reader = self._compressed_reader(segment)
+        if reader is None:
+            try:
+                with open(self._plain_segment_path(segment), "rb") as f:
+                    return os.pread(f.fileno(), length, offset)
+            except FileNotFoundError:
+                # Compressed while we were looking
+                reader = self._compressed_reader(segment)
+                if reader is None:
+                    raise FileNotFoundError(
+                        f"{self.name} segment {segment} no longer exists (merged away by compaction)"
+                    ) from None
+        return reader.read(offset, length)
+
+    def iter_lines(self, start_segment: Optional[int] = None,
+                   start_offset: int = 0) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Stream complete lines as (segment, offset, line) from a position
+        onwards, crossing compressed and plain segments transparently.
+        """
+        self.flush()
+        for segment in self.segments():
+            if start_segment is not None and segment < start_segment:
+                continue
+            offset = start_offset if segment == start_segment else 0
+
+            plain = None
+            reader = self._compressed_reader(segment)
+            if reader is None:
+                try:
+                    plain = open(self._plain_segment_path(segment), "rb")
+                except FileNotFoundError:
+                    reader = self._compressed_reader(segment)
+                    if reader is None:
+                        # Merged away by compaction
+                        continue
+
+            if reader is not None:
+                for line_offset, line in reader.iter_lines(offset):
+                    yield segment, line_offset, line
+                continue
+
+            with plain:
+                plain.seek(offset)
+                for line in plain:
+                    if not line.endswith(b"\n"):
+                        break
+                    yield segment, offset, line
+                    offset += len(line)
+
+    def iter_lines_reverse(self) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Stream complete lines newest first as (segment, offset, line). Plain
+        segments are read backwards in block-sized positioned reads, so the
+        cost is proportional to what the caller consumes, not the log size.
+        """
+        self.flush()
+        for segment in reversed(self.segments()):
+            reader = self._compressed_reader(segment)
+            if reader is None:
+                try:
+                    plain = open(self._plain_segment_path(segment), "rb")
+                except FileNotFoundError:
+                    reader = self._compressed_reader(segment)
+                    if reader is None:
+                        continue
+
+            if reader is not None:
+                for offset, line in reader.iter_lines_reverse():
+                    yield segment, offset, line
+                continue
+
+            with plain:
+                yield from self._plain_lines_reverse(segment, plain.fileno())
+
+    def _plain_lines_reverse(self, segment: int, fd: int) -> Iterator[Tuple[int, int, bytes]]:
+        pos = os.fstat(fd).st_size
+        carry = b""          # partial line continuing past the block just read
+        at_end = True
+        while pos > 0:
+            size = min(self.block_size, pos)
+            pos -= size
+            data = os.pread(fd, size, pos) + carry
+
+            # Lines starting inside this block; the head belongs to an earlier one
+            start = 0 if pos == 0 else data.find(b"\n") + 1
+            if start == 0 and pos > 0:
+                carry = data
+                continue
+            carry = data[:start]
+
+            lines = data[start:].splitlines(keepends=True)
+            if at_end and lines and not lines[-1].endswith(b"\n"):
+                lines.pop()      # torn tail
+            at_end = False
+
+            offsets = []
+            offset = pos + start
+            for line in lines:
+                offsets.append(offset)
+                offset += len(line)
+            for offset, line in zip(reversed(offsets), reversed(lines)):
+                yield segment, offset, line
+
+    def close(self):
+        self.wait_for_compression()
+        with self._lock:
+            if self._hot_file is not None:
+                self._hot_file.close()
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+
+    # ------------------------------------------------------------------
+    # Segment files
+    # ------------------------------------------------------------------
+
+    def _plain_path(self, segment: int) -> Path:
+        return self.directory / f"{self.name}.{segment:06d}.jsonl"
+
+    def _compressed_path(self, segment: int) -> Path:
+        return self.directory / f"{self.name}.{segment:06d}.zblk"
+
+    def _plain_segment_path(self, segment: int) -> Path:
+        return self.hot_path if segment == self.hot_segment else self._plain_path(segment)
+
+    def _scan_sealed(self) -> List[int]:
+        pattern = re.compile(rf"^{re.escape(self.name)}\.(\d{{6}})\.(jsonl|zblk)$")
+        segments = set()
+        for path in self.directory.iterdir():
+            match = pattern.match(path.name)
+            if match:
+                segments.add(int(match.group(1)))
+        return sorted(segments)
+
+    def _compressed_reader(self, segment: int) -> Optional[CompressedSegment]:
+        if segment == self.hot_segment:
+            return None
+        reader = self._readers.get(segment)
+        if reader is None and self._compressed_path(segment).exists():
+            with self._lock:
+                reader = self._readers.setdefault(segment, CompressedSegment(self._compressed_path(segment)))
+        return reader
+
+    def _start_compression(self, segment: int):
+        if self.compress_in_background:
+            thread = threading.Thread(target=self._compress, args=(segment,), daemon=True)
+            self._compressors = [t for t in self._compressors if t.is_alive()] + [thread]
+            thread.start()
+        else:
+            self._compress(segment)
+
+    def _compress(self, segment: int):
+        plain = self._plain_path(segment)
+        if not plain.exists():
+            return
+        compress_segment(plain, self._compressed_path(segment), self.block_size)
+        # Readers holding the plain file open keep their descriptor
+        plain.unlink()
@@ -0,0 +1,198 @@
+# skg_benchmark.py
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from statistics import median
+
+# Add skg_core to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from skg_engine import SwarmKnowledgeGraphEngine
+from skg_node import SKGNode, SKGNodeType
+from skg_rescore import _score_drift_python, extract_drift_features, np, score_drift
+
+
+def synthetic_certificate(i: int, wallet_count: int) -> dict:
+    """Deterministic certificate payload; wallets follow a skewed reuse curve."""
+    wallet = int(wallet_count * (random.random() ** 3))
+    return {
+        "dals_serial": f"DALSKM20251210-{i:08X}",
+        "asset_title": f"Benchmark Asset {i}",
+        "ipfs_hash": f"ipfs://Qm{i:044d}",
+        "stardate": "1251210.2312",
+        "wallet_address": f"0xBench{wallet:08d}",
+        "owner_name": f"Bench Owner {wallet}",
+        "ed25519_signature": "ab" * 64,
+        "verifying_key": "cd" * 32,
+        "chain_id": "Polygon",
+        "kep_category": ("Knowledge", "Art", "Music", "Research")[i % 4]
+    }
+
+
+def bench_wallet_queries(certificates: int, wallets: int, queries: int = 1000) -> dict:
+    """Ingest a synthetic graph and time query_by_wallet."""
+    random.seed(42)
+    with tempfile.TemporaryDirectory() as vault:
+        engine = SwarmKnowledgeGraphEngine(Path(vault), "benchmark_worker")
+
+        started = time.perf_counter()
+        for i in range(certificates):
+            engine.ingest_certificate(synthetic_certificate(i, wallets), f"VAULT_TXN_{i}")
+        ingest_seconds = time.perf_counter() - started
+
+        timings, sizes = [], []
+        for _ in range(queries):
+            wallet = f"0xBench{random.randrange(wallets):08d}"
+            started = time.perf_counter()
+            sizes.append(len(engine.query_by_wallet(wallet)))
+            timings.append(time.perf_counter() - started)
+
+        engine.close()
+
+    return {
+        "certificates": certificates,
+        "ingest_per_second": certificates / ingest_seconds,
+        "query_median_ms": median(timings) * 1000,
+        "query_max_ms": max(timings) * 1000,
+        "median_result_size": median(sizes)
+    }
+
+
+def bench_warm_start(certificates: int, tail: int, wallets: int = 10_000) -> dict:
+    """Compare full log replay against snapshot + tail replay at start-up."""
+    random.seed(42)
+    with tempfile.TemporaryDirectory() as vault:
+        engine = SwarmKnowledgeGraphEngine(Path(vault), "benchmark_worker", snapshot_interval=0)
+        for i in range(certificates):
+            engine.ingest_certificate(synthetic_certificate(i, wallets), f"VAULT_TXN_{i}")
+        engine.close()
+
+        full_replay = SwarmKnowledgeGraphEngine(Path(vault), "benchmark_worker", snapshot_interval=0)
+        full_stats = full_replay.load_stats
+        full_replay.snapshot(background=False)
+        for i in range(certificates, certificates + tail):
+            full_replay.ingest_certificate(synthetic_certificate(i, wallets), f"VAULT_TXN_{i}")
+        full_replay.close()
+
+        warm = SwarmKnowledgeGraphEngine(Path(vault), "benchmark_worker", snapshot_interval=0)
+        warm_stats = warm.load_stats
+        warm.close()
+
+    return {
+        "graph_nodes": warm_stats["total_nodes"],
+        "full_replay_seconds": full_stats["seconds"],
+        "snapshot_start_seconds": warm_stats["seconds"],
+        "tail_records_replayed": warm_stats["replayed_nodes"] + warm_stats["replayed_edges"]
+    }
+
+
+def bench_ingest(certificates: int, wallets: int = 10_000) -> dict:
+    """Ingest throughput and commit latency per durability mode / batch size."""
+    results = {}
+    for durability, batch in (("flush", 1), ("flush", 256), ("fsync", 1), ("fsync", 256), ("fsync_interval", 256)):
+        random.seed(42)
+        with tempfile.TemporaryDirectory() as vault:
+            engine = SwarmKnowledgeGraphEngine(Path(vault), "benchmark_worker", snapshot_interval=0,
+                                               durability=durability, batch_transactions=batch)
+            started = time.perf_counter()
+            for i in range(certificates):
+                engine.ingest_certificate(synthetic_certificate(i, wallets), f"VAULT_TXN_{i}")
+            engine.flush()
+            seconds = time.perf_counter() - started
+            metrics = engine.serializer.metrics()
+            engine.close()
+
+        results[f"{durability}/batch={batch} ingest_per_second"] = certificates / seconds
+        results[f"{durability}/batch={batch} commit_p99_ms"] = metrics["commit_latency_p99_ms"]
+    return results
+
+
+def bench_concurrent_ingest(certificates: int, wallets: int = 10_000,
+                            thread_counts=(1, 4, 16), durability: str = "fsync") -> dict:
+    """Ingest throughput from a thread pool, checking the graph stays consistent."""
+    random.seed(42)
+    payloads = [synthetic_certificate(i, wallets) for i in range(certificates)]
+    results = {}
+    for threads in thread_counts:
+        with tempfile.TemporaryDirectory() as vault:
+            engine = SwarmKnowledgeGraphEngine(Path(vault), "benchmark_worker", snapshot_interval=0,
+                                               durability=durability)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(lambda i: engine.ingest_certificate(payloads[i], f"VAULT_TXN_{i}"), range(certificates)))
+            engine.flush()
+            seconds = time.perf_counter() - started
+            metrics = engine.serializer.metrics()
+            mismatches = engine.check_summary_consistency()
+            engine.close()
+
+        results[f"threads={threads} ingest_per_second"] = certificates / seconds
+        results[f"threads={threads} commits_per_fsync"] = metrics["commits"] / max(metrics["fsyncs"], 1)
+        results[f"threads={threads} summary_mismatches"] = len(mismatches)
+    return results
+
+
+def bench_rescore(certificates: int, baseline_interval: float = 600.0) -> dict:
+    """
+    Time drift scoring and check the NumPy path against the pure-Python
+    reference on certificates mixing valid, ISO, unparseable and missing
+    stardates (including a leading unparseable run) and malformed signatures.
+    """
+    random.seed(42)
+    stardates = ("1251210.2312", "1251210.2340", "2025-12-10T23:50:00Z", "1251399.0000", "not-a-stardate", "")
+    signatures = ("ab" * 64, "ab" * 10, "zz" * 64, "")
+    keys = ("cd" * 32, "cd" * 5, "")
+    cids = ("ipfs://Qm" + "1" * 44, "ipfs://Qmshort", "Qm" + "1" * 44)
+    nodes = [SKGNode(f"cert:bench:{i}", SKGNodeType.CERTIFICATE, {
+        "minted_at": "garbage" if i < 3 else random.choice(stardates),
+        "ed25519_signature": random.choice(signatures),
+        "verifying_key": random.choice(keys),
+        "ipfs_hash": random.choice(cids)
+    }, "benchmark_worker") for i in range(certificates)]
+    features = extract_drift_features(nodes)
+
+    started = time.perf_counter()
+    scores = score_drift(features, baseline_interval)
+    scored = time.perf_counter()
+    reference = _score_drift_python(features, baseline_interval)
+    finished = time.perf_counter()
+
+    scores = scores.tolist() if np is not None else scores
+    differences = [abs(score - expected) for score, expected in zip(scores, reference)]
+    return {
+        "vectorized": np is not None,
+        "score_seconds": scored - started,
+        "python_seconds": finished - scored,
+        "max_score_difference": max(differences, default=0.0),
+        "score_mismatches": sum(difference > 1e-12 for difference in differences) + abs(len(scores) - len(reference))
+    }
+
+
+# CLI Wrapper (run this)
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark SKG queries and warm start")
+    parser.add_argument("--certificates", type=int, default=1_000_000)
+    parser.add_argument("--wallets", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--suite", choices=["queries", "warm_start", "ingest", "concurrent", "rescore"], default="queries")
+    parser.add_argument("--tail", type=int, default=10_000)
+
+    args = parser.parse_args()
+
+    if args.suite == "rescore":
+        result = bench_rescore(args.certificates)
+    elif args.suite == "concurrent":
+        result = bench_concurrent_ingest(args.certificates, args.wallets)
+    elif args.suite == "ingest":
+        result = bench_ingest(args.certificates, args.wallets)
+    elif args.suite == "warm_start":
+        result = bench_warm_start(args.certificates, args.tail, args.wallets)
+    else:
+        result = bench_wallet_queries(args.certificates, args.wallets, args.queries)
+    for key, value in result.items():
+        print(f"{key:>20}: {value:,.3f}" if isinstance(value, float) else f"{key:>20}: {value:,}")
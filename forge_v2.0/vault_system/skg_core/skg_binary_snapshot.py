@@ -0,0 +1,406 @@
+# skg_binary_snapshot.py
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from skg_node import SKGNode, SKGEdge, SKGNodeType, NO_TIMESTAMP, edge_type_name
+
+MAGIC = b"SKGBIN01"
+VERSION = 2
+
+# magic, version, node/edge/string/column counts, 9 section offsets
+HEADER = struct.Struct("<8sIIIII9Q")
+NODE = struct.Struct("<IBBxxIqI")        # id sid, type code, active, created_by sid, created_at µs, version
+COLUMN = struct.Struct("<IIQQI4x")       # key sid, entry count, entries offset, value index offset, value index count
+COLUMN_ENTRY = struct.Struct("<IB3xQ")   # node index, value tag, payload
+VALUE_ENTRY = struct.Struct("<II")       # value sid, node index
+EDGE = struct.Struct("<IIIIqdI")         # source, target, type sid, id sid, created_at µs, confidence, properties sid
+EDGE_V1 = struct.Struct("<IIIIqfI")      # version 1: float32 confidence
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+
+NODE_TYPES = list(SKGNodeType)
+ABSENT_NODE = 255                        # referenced by an edge but no node record
+
+TAG_NONE, TAG_STR, TAG_INT, TAG_FLOAT, TAG_BOOL, TAG_JSON = range(6)
+
+
+def _encode_value(value: Any, sids: Dict[str, int]) -> Tuple[int, int]:
+    if value is None:
+        return TAG_NONE, 0
+    if isinstance(value, bool):
+        return TAG_BOOL, int(value)
+    if isinstance(value, int) and -(2 ** 63) <= value < 2 ** 63:
+        return TAG_INT, value & 0xFFFFFFFFFFFFFFFF
+    if isinstance(value, float):
+        return TAG_FLOAT, struct.unpack("<Q", struct.pack("<d", value))[0]
+    if isinstance(value, str):
+        return TAG_STR, sids[value]
+    return TAG_JSON, sids[json.dumps(value, sort_keys=True)]
+
+
+def _property_strings(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return value
+    if value is None or isinstance(value, (bool, float)) or (isinstance(value, int) and -(2 ** 63) <= value < 2 ** 63):
+        return None
+    return json.dumps(value, sort_keys=True)
+
+
+def write_binary_snapshot(path: Path, nodes: List[SKGNode], edges: List[SKGEdge], metadata: dict):
+    """
+    Write a memory-mappable graph snapshot.
+
+    All strings live in one sorted, interned table; nodes are a fixed-width
+    array sorted by ID; properties are stored column-wise per key with a
+    value→node index for string values; edges are fixed-width records in CSR
+    order by source, with a second CSR permutation by target.
+    """
+    node_ids = {node.node_id for node in nodes}
+    for edge in edges:
+        node_ids.add(edge.source_id)
+        node_ids.add(edge.target_id)
+
+    strings = set(node_ids)
+    for node in nodes:
+        strings.add(node.created_by)
+        for key, value in node.properties.items():
+            strings.add(key)
+            encoded = _property_strings(value)
+            if encoded is not None:
+                strings.add(encoded)
+    for edge in edges:
+        strings.update((edge_type_name(edge.edge_type), edge.edge_id, json.dumps(edge.properties, sort_keys=True)))
+
+    table = sorted(strings)
+    sids = {s: i for i, s in enumerate(table)}
+    ordered_ids = sorted(node_ids)
+    node_index = {node_id: i for i, node_id in enumerate(ordered_ids)}
+    by_id = {node.node_id: node for node in nodes}
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        sections = []
+
+        # Metadata (JSON)
+        sections.append(f.tell())
+        meta = json.dumps(metadata).encode()
+        f.write(U32.pack(len(meta)) + meta)
+
+        # String table: offsets then UTF-8 blob
+        encoded_strings = [s.encode() for s in table]
+        sections.append(f.tell())
+        position = 0
+        for blob in encoded_strings:
+            f.write(U64.pack(position))
+            position += len(blob)
+        f.write(U64.pack(position))
+        sections.append(f.tell())
+        for blob in encoded_strings:
+            f.write(blob)
+
+        # Node array + property columns
+        columns: Dict[int, List[Tuple[int, int, int]]] = {}
+        sections.append(f.tell())
+        for i, node_id in enumerate(ordered_ids):
+            node = by_id.get(node_id)
+            if node is None:
+                f.write(NODE.pack(sids[node_id], ABSENT_NODE, 0, 0, NO_TIMESTAMP, 0))
+                continue
+            f.write(NODE.pack(sids[node_id], NODE_TYPES.index(node.node_type), int(node.is_active),
+                              sids[node.created_by], node.created_at_us, node.version))
+            for key, value in node.properties.items():
+                tag, payload = _encode_value(value, sids)
+                columns.setdefault(sids[key], []).append((i, tag, payload))
+
+        column_dir = []
+        for key_sid in sorted(columns):
+            entries = columns[key_sid]
+            entries_offset = f.tell()
+            for entry in entries:
+                f.write(COLUMN_ENTRY.pack(*entry))
+            value_index = sorted((payload, i) for i, tag, payload in entries if tag == TAG_STR)
+            value_offset = f.tell()
+            for entry in value_index:
+                f.write(VALUE_ENTRY.pack(*entry))
+            column_dir.append((key_sid, len(entries), entries_offset, value_offset, len(value_index)))
+
+        sections.append(f.tell())
+        for column in column_dir:
+            f.write(COLUMN.pack(*column))
+
+        # Edges in CSR order by (source, type)
+        edge_rows = sorted(
+            (node_index[e.source_id], sids[edge_type_name(e.edge_type)], node_index[e.target_id], sids[e.edge_id],
+             e.created_at_us, e.confidence, sids[json.dumps(e.properties, sort_keys=True)])
+            for e in edges
+        )
+        out_offsets = [0] * (len(ordered_ids) + 1)
+        for row in edge_rows:
+            out_offsets[row[0] + 1] += 1
+        for i in range(len(ordered_ids)):
+            out_offsets[i + 1] += out_offsets[i]
+
+        sections.append(f.tell())
+        for value in out_offsets:
+            f.write(U32.pack(value))
+        sections.append(f.tell())
+        for source, type_sid, target, id_sid, created, confidence, props_sid in edge_rows:
+            f.write(EDGE.pack(source, target, type_sid, id_sid, created, confidence, props_sid))
+
+        # Incoming permutation by (target, type)
+        in_order = sorted(range(len(edge_rows)), key=lambda e: (edge_rows[e][2], edge_rows[e][1]))
+        in_offsets = [0] * (len(ordered_ids) + 1)
+        for row in edge_rows:
+            in_offsets[row[2] + 1] += 1
+        for i in range(len(ordered_ids)):
+            in_offsets[i + 1] += in_offsets[i]
+
+        sections.append(f.tell())
+        for value in in_offsets:
+            f.write(U32.pack(value))
+        sections.append(f.tell())
+        for edge_index in in_order:
+            f.write(U32.pack(edge_index))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(ordered_ids), len(edge_rows), len(table),
+                            len(column_dir), *sections))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+
+class MappedGraphSnapshot:
+    """
+    Read-only graph view over a binary snapshot via mmap.
+
+    Lookups decode only the records they touch, so queries run against the
+    mapped file without materializing the graph.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.node_count, self.edge_count, self.string_count, column_count,
+         self._meta_off, self._str_offsets, self._str_blob, self._nodes_off, self._columns_off,
+         self._out_offsets, self._edges_off, self._in_offsets, self._in_edges) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an SKG binary snapshot: {path}")
+        self._edge = EDGE if version >= 2 else EDGE_V1
+
+        (meta_len,) = U32.unpack_from(self._map, self._meta_off)
+        self.metadata = json.loads(self._map[self._meta_off + 4:self._meta_off + 4 + meta_len])
+
+        self._columns: Dict[str, Tuple[int, int, int, int]] = {}
+        for i in range(column_count):
+            key_sid, count, entries_off, values_off, values_count = COLUMN.unpack_from(
+                self._map, self._columns_off + i * COLUMN.size)
+            self._columns[self.string(key_sid)] = (count, entries_off, values_off, values_count)
+
+    # ------------------------------------------------------------------
+    # Low-level accessors
+    # ------------------------------------------------------------------
+
+    def string(self, sid: int) -> str:
+        start, end = struct.unpack_from("<QQ", self._map, self._str_offsets + sid * 8)
+        return self._map[self._str_blob + start:self._str_blob + end].decode()
+
+    def string_id(self, value: str) -> Optional[int]:
+        """Binary search the sorted string table."""
+        target = value.encode()
+        lo, hi = 0, self.string_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = struct.unpack_from("<QQ", self._map, self._str_offsets + mid * 8)
+            probe = self._map[self._str_blob + start:self._str_blob + end]
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def node_index(self, node_id: str) -> Optional[int]:
+        sid = self.string_id(node_id)
+        if sid is None:
+            return None
+        lo, hi = 0, self.node_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (probe,) = U32.unpack_from(self._map, self._nodes_off + mid * NODE.size)
+            if probe < sid:
+                lo = mid + 1
+            elif probe > sid:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def _decode_value(self, tag: int, payload: int) -> Any:
+        if tag == TAG_STR:
+            return self.string(payload)
+        if tag == TAG_INT:
+            return payload - (1 << 64) if payload >= 1 << 63 else payload
+        if tag == TAG_FLOAT:
+            return struct.unpack("<d", struct.pack("<Q", payload))[0]
+        if tag == TAG_BOOL:
+            return bool(payload)
+        if tag == TAG_JSON:
+            return json.loads(self.string(payload))
+        return None
+
+    def node_properties(self, index: int) -> Dict[str, Any]:
+        properties = {}
+        for key, (count, entries_off, _, _) in self._columns.items():
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                (probe,) = U32.unpack_from(self._map, entries_off + mid * COLUMN_ENTRY.size)
+                if probe < index:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < count:
+                probe, tag, payload = COLUMN_ENTRY.unpack_from(self._map, entries_off + lo * COLUMN_ENTRY.size)
+                if probe == index:
+                    properties[key] = self._decode_value(tag, payload)
+        return properties
+
+    def node_at(self, index: int) -> Optional[SKGNode]:
+        sid, type_code, active, created_by, created_at, version = NODE.unpack_from(
+            self._map, self._nodes_off + index * NODE.size)
+        if type_code == ABSENT_NODE:
+            return None
+        return SKGNode(
+            node_id=self.string(sid),
+            node_type=NODE_TYPES[type_code],
+            properties=self.node_properties(index),
+            created_by=self.string(created_by),
+            created_at=created_at,
+            version=version,
+            is_active=bool(active)
+        )
+
+    def node_id_at(self, index: int) -> str:
+        (sid,) = U32.unpack_from(self._map, self._nodes_off + index * NODE.size)
+        return self.string(sid)
+
+    def edge_at(self, index: int) -> SKGEdge:
+        source, target, type_sid, id_sid, created_at, confidence, props_sid = self._edge.unpack_from(
+            self._map, self._edges_off + index * self._edge.size)
+        return SKGEdge(
+            edge_id=self.string(id_sid),
+            source_id=self.node_id_at(source),
+            target_id=self.node_id_at(target),
+            edge_type=self.string(type_sid),
+            properties=json.loads(self.string(props_sid)),
+            created_at=created_at,
+            # Version 1 stored float32; rounding recovers the usual short decimals
+            confidence=confidence if self._edge is EDGE else round(confidence, 6)
+        )
+
+    # ------------------------------------------------------------------
+    # Graph queries
+    # ------------------------------------------------------------------
+
+    def get_node(self, node_id: str) -> Optional[SKGNode]:
+        index = self.node_index(node_id)
+        return self.node_at(index) if index is not None else None
+
+    def find_nodes(self, prop: str, value: str) -> List[str]:
+        """Node IDs whose string property ``prop`` equals ``value``."""
+        column = self._columns.get(prop)
+        sid = self.string_id(value)
+        if column is None or sid is None:
+            return []
+
+        _, _, values_off, values_count = column
+        lo, hi = 0, values_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (probe,) = U32.unpack_from(self._map, values_off + mid * VALUE_ENTRY.size)
+            if probe < sid:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        matches = []
+        while lo < values_count:
+            probe, index = VALUE_ENTRY.unpack_from(self._map, values_off + lo * VALUE_ENTRY.size)
+            if probe != sid:
+                break
+            matches.append(self.node_id_at(index))
+            lo += 1
+        return matches
+
+    def _csr_range(self, offsets_off: int, index: int) -> Tuple[int, int]:
+        return struct.unpack_from("<II", self._map, offsets_off + index * 4)
+
+    def edges_from(self, node_id: str, edge_type: Optional[str] = None) -> Iterator[SKGEdge]:
+        index = self.node_index(node_id)
+        if index is None:
+            return
+        type_sid = self.string_id(edge_type) if edge_type else None
+        start, end = self._csr_range(self._out_offsets, index)
+        for e in range(start, end):
+            if type_sid is None or U32.unpack_from(self._map, self._edges_off + e * self._edge.size + 8)[0] == type_sid:
+                yield self.edge_at(e)
+
+    def edges_to(self, node_id: str, edge_type: Optional[str] = None) -> Iterator[SKGEdge]:
+        index = self.node_index(node_id)
+        if index is None:
+            return
+        type_sid = self.string_id(edge_type) if edge_type else None
+        start, end = self._csr_range(self._in_offsets, index)
+        for i in range(start, end):
+            (e,) = U32.unpack_from(self._map, self._in_edges + i * 4)
+            if type_sid is None or U32.unpack_from(self._map, self._edges_off + e * self._edge.size + 8)[0] == type_sid:
+                yield self.edge_at(e)
+
+    def query_by_wallet(self, wallet_address: str) -> List[Dict[str, Any]]:
+        """Same result shape as SwarmKnowledgeGraphEngine.query_by_wallet."""
+        results = []
+        for owner_id in self.find_nodes("wallet_address", wallet_address):
+            for edge in self.edges_to(owner_id, "OWNED_BY"):
+                cert = self.get_node(edge.source_id)
+                if cert and cert.node_type == SKGNodeType.CERTIFICATE:
+                    results.append({"certificate": cert.properties, "ownership": edge.properties})
+        return results
+
+    def iter_nodes(self) -> Iterator[SKGNode]:
+        """Decode every node, reading each property column sequentially once."""
+        properties: List[Dict[str, Any]] = [{} for _ in range(self.node_count)]
+        for key, (count, entries_off, _, _) in self._columns.items():
+            for index, tag, payload in COLUMN_ENTRY.iter_unpack(
+                    self._map[entries_off:entries_off + count * COLUMN_ENTRY.size]):
+                properties[index][key] = self._decode_value(tag, payload)
+
+        for index, (sid, type_code, active, created_by, created_at, version) in enumerate(
+                NODE.iter_unpack(self._map[self._nodes_off:self._nodes_off + self.node_count * NODE.size])):
+            if type_code == ABSENT_NODE:
+                continue
+            yield SKGNode(
+                node_id=self.string(sid),
+                node_type=NODE_TYPES[type_code],
+                properties=properties[index],
+                created_by=self.string(created_by),
+                created_at=created_at,
+                version=version,
+                is_active=bool(active)
+            )
+
+    def iter_edges(self) -> Iterator[SKGEdge]:
+        for index in range(self.edge_count):
+            yield self.edge_at(index)
+
+    def close(self):
+        self._map.close()
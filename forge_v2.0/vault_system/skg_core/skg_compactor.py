@@ -0,0 +1,133 @@
+# skg_compactor.py
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add skg_core to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from segmented_log import SegmentedLog
+
+# Record key per compactable log; transactions are an audit trail and are kept whole
+RECORD_KEYS = {"nodes": "node_id", "edges": "edge_id"}
+
+
+def compact_log(log: SegmentedLog, kind: str, boundary_segment: int,
+                serial_index=None, index_log: Optional[str] = None,
+                min_dead_ratio: float = 0.2) -> dict:
+    """
+    Rewrite the sealed segments of a nodes/edges log below ``boundary_segment``
+    down to the latest version of each node or edge.
+
+    Pass one finds, per key, the last full record and any ``node_patch``
+    records after it; pass two streams the segments again and emits one
+    record per key (patches merged in). Appends to the hot segment carry on
+    throughout; only the final segment swap takes the log lock (and, with a
+    serial index, blocks index lookups until the entries are repointed).
+    Returns compaction statistics.
+    """
+    started = time.perf_counter()
+    key_field = RECORD_KEYS[kind]
+    log.wait_for_compression()
+    segments = [s for s in log.sealed if s < boundary_segment]
+    stats = {"kind": kind, "segments": len(segments), "records_in": 0, "records_out": 0, "compacted": False}
+    if not segments:
+        return stats
+
+    # Pass 1: latest base record and trailing patches per key
+    base: Dict[str, Tuple[int, int]] = {}
+    patches: Dict[str, List[Tuple[int, int]]] = {}
+    for segment, offset, line in log.iter_lines(segments[0]):
+        if segment > segments[-1]:
+            break
+        record = json.loads(line)
+        key = record[key_field]
+        if record.get("record_type") == "node_patch":
+            if key in base:
+                patches.setdefault(key, []).append((segment, offset))
+        else:
+            base[key] = (segment, offset)
+            patches.pop(key, None)
+        stats["records_in"] += 1
+
+    dead = stats["records_in"] - len(base)
+    if stats["records_in"] == 0 or (len(segments) == 1 and dead / stats["records_in"] < min_dead_ratio):
+        return stats
+
+    indexed = serial_index.positions(index_log, segments) if serial_index is not None else set()
+    owner_of: Dict[Tuple[int, int], str] = {}
+
+    # Pass 2: emit each key once, at its base (or last patch) position
+    target = segments[-1]
+    new_location: Dict[str, Tuple[int, int, int]] = {}
+    pending: Dict[str, dict] = {}
+    compacted_plain = log.directory / f"{log.name}.{target:06d}.compacting"
+    with open(compacted_plain, "wb") as out:
+        for segment, offset, line in log.iter_lines(segments[0]):
+            if segment > segments[-1]:
+                break
+            record = json.loads(line)
+            key = record[key_field]
+            if (segment, offset) in indexed:
+                owner_of[(segment, offset)] = key
+
+            if base.get(key) == (segment, offset):
+                if key in patches:
+                    pending[key] = record
+                    continue
+            elif key in pending and record.get("record_type") == "node_patch":
+                merged = pending[key]
+                merged["properties"].update(record["properties"])
+                merged["version"] = record["version"]
+                if (segment, offset) != patches[key][-1]:
+                    continue
+                line = (json.dumps(merged) + "\n").encode()
+                del pending[key]
+            else:
+                continue
+
+            new_location[key] = (target, out.tell(), len(line))
+            out.write(line)
+            stats["records_out"] += 1
+
+    staged = log.stage_compacted(segments, compacted_plain)
+
+    if serial_index is None:
+        log.replace_sealed(segments, staged)
+    else:
+        # Index lookups wait while the segments swap and their entries move,
+        # so none reads an old position from the new files
+        moves = {position: new_location[key] for position, key in owner_of.items() if key in new_location}
+        with serial_index.relocating():
+            log.replace_sealed(segments, staged)
+            serial_index.relocate(index_log, segments, moves)
+
+    stats.update({"compacted": True, "seconds": time.perf_counter() - started})
+    return stats
+
+
+# CLI Wrapper (run this) - for a stopped worker; live engines use engine.compact()
+if __name__ == "__main__":
+    import argparse
+
+    from skg_serializer import SKGSerializer
+
+    parser = argparse.ArgumentParser(description="Compact a worker's SKG node and edge logs")
+    parser.add_argument("--vault", default="vault_system")
+    parser.add_argument("--worker", default="certificate_forge_worker_001")
+
+    args = parser.parse_args()
+
+    serial_index = None
+    index_path = Path(args.vault) / "index" / "serial_index.db"
+    if index_path.exists():
+        sys.path.insert(0, str(Path(__file__).parents[2]))
+        from vault_index import VaultSerialIndex
+        serial_index = VaultSerialIndex(index_path)
+
+    serializer = SKGSerializer(Path(args.vault) / "skg_graph", args.worker, serial_index=serial_index)
+    for result in serializer.compact_logs():
+        print(result)
+    serializer.close()
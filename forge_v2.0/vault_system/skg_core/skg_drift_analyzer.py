@@ -1,8 +1,15 @@
 # skg_drift_analyzer.py
-from typing import Dict, List
-from skg_node import SKGNode, SKGNodeType
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+from segmented_log import SegmentedLog
+from skg_node import SKGNode, SKGNodeType, NO_TIMESTAMP, stardate_to_micros
+from skg_sketches import Ewma, RunningStats, WindowedHistogram
 import statistics
-from datetime import datetime
+
+DRIFT_COMPONENTS = ("temporal", "signature", "pattern", "drift")
 
 class SKGDriftAnalyzer:
     """
@@ -11,16 +18,46 @@ class SKGDriftAnalyzer:
     - Signature validity
     - Pattern deviation
     - Chain anchor lag
+
+    Aggregates are kept online: per component a Welford mean/variance, an
+    EWMA and a sliding-window histogram for quantiles. The issuance-interval
+    baseline adapts to an EWMA of recent intervals once ``BASELINE_WARMUP``
+    have been seen. Only the latest ``recent`` analyses stay in memory; with
+    a ``history_path`` every analysis is appended to a segmented
+    ``drift_history`` log there, and the aggregates are checkpointed to
+    ``drift_stats.json`` on ``checkpoint()`` so a restart replays only the tail.
     """
     
-    def __init__(self):
+    BASELINE_WARMUP = 32
+    MIN_BASELINE_INTERVAL = 1.0
+    
+    def __init__(self, history_path: Optional[Path] = None, recent: int = 1000,
+                 window: int = 1024, ewma_alpha: float = 0.05):
         self.baseline_metrics = {
             "avg_issuance_interval": 300.0,  # 5 minutes baseline
             "signature_validation_rate": 1.0,
             "chain_lag_seconds": 45.0
         }
         
-        self.certificate_history: List[Dict] = []
+        self.certificate_history: Deque[Dict] = deque(maxlen=recent)
+        self.window = window
+        self.ewma_alpha = ewma_alpha
+        self._reset_aggregates()
+        
+        self.history = None
+        self.stats_path = None
+        if history_path is not None:
+            self.history = SegmentedLog(history_path, "drift_history")
+            self.stats_path = history_path / "drift_stats.json"
+            self._restore()
+    
+    def _reset_aggregates(self):
+        self.stats = {component: RunningStats() for component in DRIFT_COMPONENTS}
+        self.ewma = {component: Ewma(self.ewma_alpha) for component in DRIFT_COMPONENTS}
+        self.windows = {component: WindowedHistogram(self.window) for component in DRIFT_COMPONENTS}
+        self.interval_stats = RunningStats()
+        self.interval_ewma = Ewma(self.ewma_alpha)
+        self._last_issued_at: Optional[float] = None
     
     def analyze_certificate_drift(self, cert_node: SKGNode) -> float:
         """
@@ -44,7 +81,7 @@ class SKGDriftAnalyzer:
         combined_drift = statistics.mean(drift_components)
         
         # Store for monitoring
-        self.certificate_history.append({
+        record = {
             "node_id": cert_node.node_id,
             "drift_score": combined_drift,
             "components": {
@@ -53,10 +90,24 @@ class SKGDriftAnalyzer:
                 "pattern": pattern_drift
             },
             "analyzed_at": cert_node.created_at
-        })
+        }
+        self._record(record)
+        if self.history is not None:
+            self.history.append((json.dumps(record) + "\n").encode())
         
         return combined_drift
     
+    def _record(self, record: dict):
+        self.certificate_history.append(record)
+        values = dict(record["components"], drift=record["drift_score"])
+        for component in DRIFT_COMPONENTS:
+            self._observe(component, values[component])
+    
+    def _observe(self, component: str, value: float):
+        self.stats[component].add(value)
+        self.ewma[component].add(value)
+        self.windows[component].add(value)
+    
     def _calculate_temporal_drift(self, cert_node: SKGNode) -> float:
         """
         Detect if certificate timing deviates from normal issuance pattern.
@@ -66,15 +117,14 @@ class SKGDriftAnalyzer:
         try:
             # Convert from ISS stardate format to seconds
             current_timestamp = self._stardate_to_timestamp(stardate_str)
+            last_timestamp, self._last_issued_at = self._last_issued_at, current_timestamp
             
-            if not self.certificate_history:
+            if last_timestamp is None:
                 return 0.0
             
             # Calculate interval from last certificate
-            last_timestamp = self._stardate_to_timestamp(
-                self.certificate_history[-1]['analyzed_at']
-            )
             interval = current_timestamp - last_timestamp
+            self._learn_interval(interval)
             
             # Drift is deviation from baseline
             baseline = self.baseline_metrics['avg_issuance_interval']
@@ -85,6 +135,13 @@ class SKGDriftAnalyzer:
         except Exception:
             return 0.5  # Neutral drift if parsing fails
     
+    def _learn_interval(self, interval: float):
+        """Adapt the issuance baseline to recent intervals once warmed up."""
+        self.interval_stats.add(interval)
+        recent = self.interval_ewma.add(interval)
+        if self.interval_stats.count >= self.BASELINE_WARMUP:
+            self.baseline_metrics['avg_issuance_interval'] = max(recent, self.MIN_BASELINE_INTERVAL)
+    
     def _calculate_signature_drift(self, cert_node: SKGNode) -> float:
         """
         Verify signature and detect anomalies.
@@ -129,17 +186,114 @@ class SKGDriftAnalyzer:
         
         return 0.0
     
-    def get_global_drift_average(self) -> float:
-        """Return average drift across all certificates."""
-        if not self.certificate_history:
-            return 0.0
+    def get_global_drift_average(self, recompute: bool = False) -> float:
+        """
+        Return average drift across all certificates. O(1) from the running
+        mean; ``recompute`` rescans the full history instead.
+        """
+        if recompute:
+            scores = [record['drift_score'] for record in self.iter_history()]
+            return statistics.mean(scores) if scores else 0.0
+        return self.stats["drift"].mean
+    
+    def get_drift_statistics(self) -> dict:
+        """Online aggregates per component plus the learned baseline."""
+        statistics_by_component = {
+            component: {
+                "count": self.stats[component].count,
+                "mean": self.stats[component].mean,
+                "stddev": self.stats[component].stddev,
+                "min": self.stats[component].min,
+                "max": self.stats[component].max,
+                "ewma": self.ewma[component].value,
+                "p50": self.windows[component].quantile(0.5),
+                "p95": self.windows[component].quantile(0.95),
+                "p99": self.windows[component].quantile(0.99)
+            }
+            for component in DRIFT_COMPONENTS
+        }
+        statistics_by_component["issuance_interval"] = {
+            "count": self.interval_stats.count,
+            "mean": self.interval_stats.mean,
+            "stddev": self.interval_stats.stddev,
+            "ewma": self.interval_ewma.value,
+            "baseline": self.baseline_metrics['avg_issuance_interval']
+        }
+        return statistics_by_component
+    
+    def iter_history(self) -> Iterator[dict]:
+        """Every analysis oldest first: from the history log if spilled, else the in-memory window."""
+        if self.history is None:
+            yield from self.certificate_history
+            return
+        for _, _, line in self.history.iter_lines():
+            yield json.loads(line)
+    
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    
+    def checkpoint(self):
+        """Flush the history log and save the aggregates with its end position."""
+        if self.history is None:
+            return
+        self.history.flush()
+        state = {
+            "position": [self.history.hot_segment, self.history.hot_size],
+            "stats": {component: stats.to_dict() for component, stats in self.stats.items()},
+            "ewma": {component: ewma.value for component, ewma in self.ewma.items()},
+            "interval_stats": self.interval_stats.to_dict(),
+            "interval_ewma": self.interval_ewma.value,
+            "last_issued_at": self._last_issued_at,
+            "baseline_metrics": self.baseline_metrics
+        }
+        tmp_path = self.stats_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state))
+        os.replace(tmp_path, self.stats_path)
+    
+    def close(self):
+        if self.history is not None:
+            self.checkpoint()
+            self.history.close()
+    
+    def _restore(self):
+        """Load the checkpoint, replay history written after it, refill the windows."""
+        segment, offset = None, 0
+        if self.stats_path.exists():
+            state = json.loads(self.stats_path.read_text())
+            segment, offset = state["position"]
+            for component in DRIFT_COMPONENTS:
+                self.stats[component] = RunningStats(**state["stats"][component])
+                self.ewma[component].value = state["ewma"][component]
+            self.interval_stats = RunningStats(**state["interval_stats"])
+            self.interval_ewma.value = state["interval_ewma"]
+            self._last_issued_at = state["last_issued_at"]
+            self.baseline_metrics.update(state["baseline_metrics"])
+        
+        for _, _, line in self.history.iter_lines(segment, offset):
+            record = json.loads(line)
+            values = dict(record["components"], drift=record["drift_score"])
+            for component in DRIFT_COMPONENTS:
+                self.stats[component].add(values[component])
+                self.ewma[component].add(values[component])
         
-        return statistics.mean([c['drift_score'] for c in self.certificate_history])
+        # Windows and the in-memory tail only need the newest records
+        newest: List[dict] = []
+        for _, _, line in self.history.iter_lines_reverse():
+            if len(newest) >= max(self.window, self.certificate_history.maxlen):
+                break
+            newest.append(json.loads(line))
+        for record in reversed(newest):
+            self.certificate_history.append(record)
+            values = dict(record["components"], drift=record["drift_score"])
+            for component in DRIFT_COMPONENTS:
+                self.windows[component].add(values[component])
     
     def _stardate_to_timestamp(self, stardate_str: str) -> float:
         """
         Convert ISS stardate to Unix timestamp.
-        Placeholder: implement your actual stardate parser.
         """
-        # For now, return current time as fallback
-        return datetime.utcnow().timestamp()
\ No newline at end of file
+        micros = stardate_to_micros(stardate_str)
+        if micros == NO_TIMESTAMP:
+            raise ValueError(f"Unparseable stardate: {stardate_str!r}")
+        return micros / 1_000_000
@@ -1,41 +1,143 @@
 # skg_engine.py
 import json
 import sys
+import threading
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from uuid import uuid4
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 
 # Add skg_core to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from skg_node import SKGNode, SKGEdge, SKGNodeType
+from skg_node import SKGNode, SKGEdge, SKGNodeType, edge_id_for, edge_type_name
 from skg_serializer import SKGSerializer
 from skg_pattern_learner import SKGPatternLearner
 from skg_drift_analyzer import SKGDriftAnalyzer
+from skg_query import PatternQuery, Prefix, SortedKeys
+from skg_rescore import rescore_drift
+from skg_tiered_store import FrozenTier, TieredAdjacency, TieredStore
+from skg_search import SearchIndex
+
+class _LockGroup:
+    """Acquire several locks in the given order; release in reverse."""
+    
+    __slots__ = ("locks",)
+    
+    def __init__(self, locks: List[threading.RLock]):
+        self.locks = locks
+    
+    def __enter__(self):
+        for lock in self.locks:
+            lock.acquire()
+    
+    def __exit__(self, *exc_info):
+        for lock in reversed(self.locks):
+            lock.release()
 
 class SwarmKnowledgeGraphEngine:
     """
     Distributed knowledge graph that learns from certificate forge events.
     Integrates with WorkerVaultWriter and FusionQueueEngine for swarm consensus.
+
+    ``ingest_certificate`` is thread-safe. Node state is guarded by
+    ``SHARD_COUNT`` locks chosen by node-ID hash; an ingest holds the shards
+    of its three nodes while it merges them and stages its transaction, so
+    ingests touching different nodes run concurrently. The shared secondary
+    indexes, the pattern/drift learners and the serializer each have their
+    own short critical section, and log commits are grouped across threads.
     """
     
-    def __init__(self, vault_base_path: Path, worker_id: str):
+    # Node properties with an exact-match value index
+    INDEXED_PROPERTIES = ("wallet_address", "dals_serial", "ipfs_hash", "kep_category", "chain_id")
+    
+    # Indexed properties whose distinct values are also kept sorted, so
+    # ``Prefix`` filters scan a key range instead of every node
+    PREFIX_PROPERTIES = ("ipfs_hash",)
+    
+    # Minimum transactions between automatic graph snapshots; the interval
+    # also grows with the graph (tail <= 25% of certificates) so snapshot
+    # cost stays amortized O(1) per ingest
+    SNAPSHOT_INTERVAL = 10000
+    
+    SHARD_COUNT = 64
+    
+    def __init__(self, vault_base_path: Path, worker_id: str, serial_index=None,
+                 snapshot_interval: int = SNAPSHOT_INTERVAL,
+                 durability: str = "flush", batch_transactions: int = 1,
+                 hot_nodes: Optional[int] = None, hot_edges: Optional[int] = None):
         self.worker_id = worker_id
+        self.snapshot_interval = snapshot_interval
         self.vault_path = vault_base_path / "skg_graph"
         self.vault_path.mkdir(parents=True, exist_ok=True)
         
         # Core components
-        self.serializer = SKGSerializer(self.vault_path, worker_id)
+        # Tiered graphs snapshot as gzip JSONL, streamed from the cold tier;
+        # the binary format needs every node in memory at once
+        tiered = hot_nodes is not None or hot_edges is not None
+        self.serializer = SKGSerializer(self.vault_path, worker_id, serial_index=serial_index,
+                                        snapshot_format="jsonl" if tiered else "binary",
+                                        durability=durability, batch_transactions=batch_transactions)
+        if serial_index is not None:
+            serial_index.register_reader(
+                f"skg:{worker_id}:",
+                lambda log, segment, offset, length: self.serializer.read_at(log.rsplit(":", 1)[1], segment, offset, length)
+            )
         self.pattern_learner = SKGPatternLearner()
-        self.drift_analyzer = SKGDriftAnalyzer()
+        self.drift_analyzer = SKGDriftAnalyzer(history_path=self.serializer.worker_skg_path)
         
-        # In-memory graph cache
-        self.nodes: Dict[str, SKGNode] = {}
-        self.edges: Dict[str, SKGEdge] = {}
+        # Graph cache: plain dicts, or with ``hot_nodes``/``hot_edges`` an LRU
+        # of that many objects over a disk-backed cold tier (same interface)
+        worker_path = self.serializer.worker_skg_path
+        self.nodes: Dict[str, SKGNode] = {} if hot_nodes is None else TieredStore(
+            worker_path / "cold_nodes.dat", hot_nodes, SKGNode.to_dict, SKGNode.from_dict)
+        self.edges: Dict[str, SKGEdge] = {} if hot_edges is None else TieredStore(
+            worker_path / "cold_edges.dat", hot_edges, SKGEdge.to_dict, SKGEdge.from_dict)
+        
+        # Secondary indexes. nodes_by_type uses dicts as insertion-ordered
+        # sets; adjacency and property buckets are plain lists of interned
+        # IDs since almost all of them hold one or two entries. With a tiered
+        # edge store the adjacency lists move to disk too
+        self.nodes_by_type: Dict[SKGNodeType, Dict[str, None]] = defaultdict(dict)
+        self.outgoing: Dict[str, Dict[str, List[str]]] = {} if hot_edges is None else TieredAdjacency(
+            worker_path / "cold_outgoing.dat")
+        self.incoming: Dict[str, Dict[str, List[str]]] = {} if hot_edges is None else TieredAdjacency(
+            worker_path / "cold_incoming.dat")
+        self.property_index: Dict[str, Dict[Any, List[str]]] = {
+            prop: {} for prop in self.INDEXED_PROPERTIES
+        }
+        self.prefix_index: Dict[str, SortedKeys] = {prop: SortedKeys() for prop in self.PREFIX_PROPERTIES}
+        
+        # Identity nodes per wallet, kept in step with the graph so the
+        # monitoring summary never walks it
+        self.owner_wallets: Dict[str, int] = {}
+        
+        # Per-wallet change counter, bumped whenever a certificate is ingested
+        # for the wallet or a patch touches its identity or certificates;
+        # portfolio caches compare it to decide if an entry is current
+        self.wallet_versions: Dict[str, int] = {}
+        
+        # Concurrency: node shards, then the index lock (innermost). The
+        # analysis lock orders learner/drift updates and is never held while
+        # taking shards
+        self._shards = [threading.RLock() for _ in range(self.SHARD_COUNT)]
+        self._index_lock = threading.Lock()
+        self._analysis_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        
+        # Snapshot bookkeeping
+        self._transactions_since_snapshot = 0
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self.load_stats: dict = {}
+        self.compaction_stats: List[dict] = []
+        
+        # Title/owner search, persisted next to the snapshots
+        self.search_index_path = self.serializer.snapshots_path / "search_index.bin"
+        self.search_index = SearchIndex.load(self.search_index_path)
         
         # Load existing graph from vault
         self._load_from_vault()
+        self._sync_search_index()
     
     def ingest_certificate(self, certificate_data: dict, vault_txn_id: str) -> str:
         """
@@ -52,6 +154,7 @@ class SwarmKnowledgeGraphEngine:
                 "asset_title": certificate_data.get('asset_title', ''),
                 "ipfs_hash": certificate_data['ipfs_hash'],
                 "minted_at": certificate_data['stardate'],
+                "kep_category": certificate_data.get('kep_category', ''),
                 "vault_txn_id": vault_txn_id,
                 "ed25519_signature": certificate_data.get('ed25519_signature', ''),
                 "verifying_key": certificate_data.get('verifying_key', '')
@@ -59,12 +162,14 @@ class SwarmKnowledgeGraphEngine:
             created_by=self.worker_id
         )
         
+        wallet_address = certificate_data.get('wallet_address', certificate_data.get('wallet', ''))
+        
         # Create owner node (identity entity)
         owner_node = SKGNode(
-            node_id=f"owner:{certificate_data.get('wallet_address', certificate_data.get('wallet', ''))}",
+            node_id=f"owner:{wallet_address}",
             node_type=SKGNodeType.IDENTITY,
             properties={
-                "wallet_address": certificate_data.get('wallet_address', certificate_data.get('wallet', '')),
+                "wallet_address": wallet_address,
                 "owner_name": certificate_data.get('owner', certificate_data.get('owner_name', '')),
                 "first_seen": certificate_data['stardate']
             },
@@ -83,24 +188,25 @@ class SwarmKnowledgeGraphEngine:
             created_by=self.worker_id
         )
         
-        # Create edges (relationships)
+        # Create edges (relationships); IDs are deterministic so a wallet's
+        # TRANSACTS_ON edge is written once, not once per certificate
         edges = [
             SKGEdge(
-                edge_id=f"edge:{uuid4().hex[:8]}",
+                edge_id=edge_id_for(cert_node.node_id, "OWNED_BY", owner_node.node_id),
                 source_id=cert_node.node_id,
                 target_id=owner_node.node_id,
                 edge_type="OWNED_BY",
                 properties={"ownership_type": "primary"}
             ),
             SKGEdge(
-                edge_id=f"edge:{uuid4().hex[:8]}",
+                edge_id=edge_id_for(cert_node.node_id, "ANCHORED_ON", chain_node.node_id),
                 source_id=cert_node.node_id,
                 target_id=chain_node.node_id,
                 edge_type="ANCHORED_ON",
                 properties={"anchor_type": "blockchain"}
             ),
             SKGEdge(
-                edge_id=f"edge:{uuid4().hex[:8]}",
+                edge_id=edge_id_for(owner_node.node_id, "TRANSACTS_ON", chain_node.node_id),
                 source_id=owner_node.node_id,
                 target_id=chain_node.node_id,
                 edge_type="TRANSACTS_ON",
@@ -108,64 +214,513 @@ class SwarmKnowledgeGraphEngine:
             )
         ]
         
-        # Add to graph
-        self.nodes[cert_node.node_id] = cert_node
-        self.nodes[owner_node.node_id] = owner_node
-        self.nodes[chain_node.node_id] = chain_node
+        # Merge into the graph; only new nodes/edges and changed properties
+        # are logged. The transaction is staged under the same shard locks so
+        # log order matches the order changes were applied to each node
+        with self._locked(cert_node.node_id, owner_node.node_id, chain_node.node_id):
+            # Score drift before the node is published, so the score is part
+            # of the logged record (or a patch on re-ingest) and replay
+            # restores it like a snapshot does
+            with self._analysis_lock:
+                cert_node.properties["drift_score"] = self.drift_analyzer.analyze_certificate_drift(cert_node)
+            
+            new_nodes, node_patches = [], []
+            for node, set_once in ((cert_node, ()), (owner_node, ("first_seen",)), (chain_node, ())):
+                change = self._upsert_node(node, set_once=set_once)
+                if change is node:
+                    new_nodes.append(node)
+                elif change is not None:
+                    node_patches.append(change)
+            
+            cert_node = self.nodes[cert_node.node_id]
+            owner_node = self.nodes[owner_node.node_id]
+            chain_node = self.nodes[chain_node.node_id]
+            
+            new_edges = [edge for edge in edges if self._upsert_edge(edge)]
+            
+            # Serialize to vault
+            skg_txn_id = self.serializer.stage_transaction(
+                nodes=new_nodes,
+                edges=new_edges,
+                event_type="CERTIFICATE_INGESTION",
+                node_patches=node_patches,
+                index_keys={
+                    "serial": certificate_data['dals_serial'],
+                    "payload_hash": certificate_data.get('payload_hash'),
+                    "wallet": wallet_address
+                }
+            )
+            
+            # Search index, still under the shard locks so a snapshot's saved
+            # index covers every transaction before its log positions; a
+            # renamed owner re-indexes all its certificates
+            renamed = any(patch["node_id"] == owner_node.node_id and "owner_name" in patch["properties"]
+                          for patch in node_patches)
+            for indexed in ([self.nodes.get(edge.source_id) for edge in self.edges_to(owner_node.node_id, "OWNED_BY")]
+                            if renamed else [cert_node]):
+                if indexed is not None:
+                    self.search_index.add(indexed.node_id, indexed.properties.get("asset_title", ""),
+                                          owner_node.properties.get("owner_name", ""))
         
-        for edge in edges:
-            self.edges[edge.edge_id] = edge
+        # Write (and flush/fsync) outside the shard locks, grouped with any
+        # transactions other threads staged meanwhile
+        self.serializer.commit_if_due()
         
-        # Serialize to vault
-        skg_txn_id = self.serializer.serialize_transaction(
-            nodes=[cert_node, owner_node, chain_node],
-            edges=edges,
-            event_type="CERTIFICATE_INGESTION"
-        )
+        with self._analysis_lock:
+            # Learn patterns
+            self.pattern_learner.learn_from_certificate(cert_node, owner_node, chain_node)
+            
+            with self._index_lock:
+                self._touch_wallet(owner_node.properties["wallet_address"])
+            
+            self._transactions_since_snapshot += 1
+            snapshot_due = self.snapshot_interval and self._transactions_since_snapshot >= max(
+                self.snapshot_interval, len(self.nodes_by_type[SKGNodeType.CERTIFICATE]) // 4
+            )
+        
+        if snapshot_due:
+            self.snapshot()
         
-        # Learn patterns
-        self.pattern_learner.learn_from_certificate(cert_node, owner_node, chain_node)
+        return skg_txn_id
+    
+    def _shard(self, node_id: str) -> threading.RLock:
+        return self._shards[hash(node_id) % self.SHARD_COUNT]
+    
+    def _locked(self, *node_ids: str) -> _LockGroup:
+        """The shard locks of ``node_ids``, acquired in shard order."""
+        shards = sorted({hash(node_id) % self.SHARD_COUNT for node_id in node_ids})
+        return _LockGroup([self._shards[shard] for shard in shards])
+    
+    def _locked_all(self) -> _LockGroup:
+        """Every shard: no ingest is between merging and staging."""
+        return _LockGroup(self._shards)
+    
+    def snapshot(self, background: bool = True, compact: bool = False) -> Optional[threading.Thread]:
+        """
+        Capture the graph and log positions, then write the snapshot (in a
+        background thread by default). Skipped while a previous one runs.
+        With ``compact`` the hot logs are sealed first and, once the snapshot
+        is written, the node/edge logs before it are compacted.
+        """
+        if not self._snapshot_lock.acquire(blocking=False):
+            return None
+        try:
+            if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+                return None
+            
+            # Nodes and edges are replaced, never mutated, so holding the
+            # current objects pins exactly the state the positions cover;
+            # tiered stores hand out a frozen view decoded while writing
+            with self._locked_all():
+                if compact:
+                    self.serializer.rotate_logs()
+                positions = self.serializer.positions()
+                nodes = self.nodes.frozen() if isinstance(self.nodes, TieredStore) else list(self.nodes.values())
+                edges = self.edges.frozen() if isinstance(self.edges, TieredStore) else list(self.edges.values())
+                transaction_id = self.serializer.last_transaction_id
+            with self._analysis_lock:
+                self._transactions_since_snapshot = 0
+        finally:
+            self._snapshot_lock.release()
         
-        # Analyze drift
-        drift_score = self.drift_analyzer.analyze_certificate_drift(cert_node)
+        def checkpoint():
+            try:
+                self.serializer.write_snapshot(nodes, edges, positions, transaction_id)
+            finally:
+                for view in (nodes, edges):
+                    if isinstance(view, FrozenTier):
+                        view.close()
+            self.search_index.save(self.search_index_path, positions)
+            if compact:
+                self.compaction_stats = self.serializer.compact_logs(positions)
         
-        # Update node with drift score
-        cert_node.properties["drift_score"] = drift_score
+        if not background:
+            checkpoint()
+            return None
         
-        return skg_txn_id
+        self._snapshot_thread = threading.Thread(target=checkpoint, daemon=True)
+        self._snapshot_thread.start()
+        return self._snapshot_thread
+    
+    def compact(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Online log compaction: snapshot the graph, then rewrite the sealed
+        node/edge segments to one record per live node and edge. Ingest keeps
+        appending to the new hot segments meanwhile.
+        """
+        return self.snapshot(background=background, compact=True)
+    
+    def flush(self):
+        """Commit any batched transactions to the vault logs."""
+        self.serializer.commit()
+        with self._analysis_lock:
+            self.drift_analyzer.checkpoint()
+    
+    def close(self):
+        """Wait for pending snapshots and close the vault logs."""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        self.serializer.close()
+        with self._analysis_lock:
+            self.drift_analyzer.close()
+        for store in (self.nodes, self.edges, self.outgoing, self.incoming):
+            if isinstance(store, (TieredStore, TieredAdjacency)):
+                store.close()
+    
+    def add_node(self, node: SKGNode):
+        """Insert or replace a node and keep the type/property indexes current."""
+        with self._shard(node.node_id):
+            self._add_node(node)
+    
+    def _add_node(self, node: SKGNode):
+        with self._index_lock:
+            previous = self.nodes.get(node.node_id)
+            if previous is not None:
+                self._unindex_node(previous)
+            
+            self.nodes[node.node_id] = node
+            self.nodes_by_type[node.node_type][node.node_id] = None
+            for prop in self.INDEXED_PROPERTIES:
+                self._index_property(node.node_id, prop, node.properties.get(prop))
+            self._count_owner(node, 1)
+    
+    def upsert_node(self, node: SKGNode, set_once=()) -> Union[SKGNode, dict, None]:
+        """
+        Merge a node into the graph.
+
+        A new node is inserted and returned as-is. For an existing node, the
+        changed properties are merged into a new version of it (keys in
+        ``set_once`` are only filled when missing) and a ``node_patch``
+        record is returned. Returns None when nothing changed.
+        """
+        with self._shard(node.node_id):
+            return self._upsert_node(node, set_once)
+    
+    def _upsert_node(self, node: SKGNode, set_once=()) -> Union[SKGNode, dict, None]:
+        existing = self.nodes.get(node.node_id)
+        if existing is None:
+            self._add_node(node)
+            return node
+        
+        changed = {
+            key: value for key, value in node.properties.items()
+            if key not in existing.properties
+            or (key not in set_once and existing.properties[key] != value)
+        }
+        if not changed:
+            return None
+        
+        patch = {
+            "record_type": "node_patch",
+            "node_id": node.node_id,
+            "version": existing.version + 1,
+            "properties": changed
+        }
+        self._apply_node_patch(patch)
+        return patch
+    
+    def apply_node_patch(self, patch: dict):
+        """Apply a ``node_patch`` record (live or during replay)."""
+        with self._shard(patch["node_id"]):
+            self._apply_node_patch(patch)
+    
+    def _apply_node_patch(self, patch: dict):
+        # Copy-on-write: published nodes are never mutated, so snapshots and
+        # readers holding a node keep a consistent version of it
+        previous = self.nodes.get(patch["node_id"])
+        if previous is None:
+            return
+        node = previous.patched(patch["properties"], patch["version"])
+        
+        with self._index_lock:
+            reindexed = [prop for prop in self.INDEXED_PROPERTIES if prop in patch["properties"]]
+            for prop in reindexed:
+                self._unindex_property(node.node_id, prop, previous.properties.get(prop))
+            if "wallet_address" in reindexed:
+                self._count_owner(previous, -1)
+                self._touch_owners(previous)
+            self.nodes[node.node_id] = node
+            for prop in reindexed:
+                self._index_property(node.node_id, prop, node.properties.get(prop))
+            if "wallet_address" in reindexed:
+                self._count_owner(node, 1)
+            self._touch_owners(node)
+    
+    def upsert_edge(self, edge: SKGEdge) -> bool:
+        """Insert an edge unless an identical one exists. Returns True if written."""
+        with self._locked(edge.source_id, edge.target_id):
+            return self._upsert_edge(edge)
+    
+    def _upsert_edge(self, edge: SKGEdge) -> bool:
+        existing = self.edges.get(edge.edge_id)
+        if existing is not None and (existing.properties, existing.confidence) == (edge.properties, edge.confidence):
+            return False
+        
+        self._add_edge(edge)
+        return True
+    
+    def add_edge(self, edge: SKGEdge):
+        """Insert or replace an edge and keep the adjacency indexes current."""
+        with self._locked(edge.source_id, edge.target_id):
+            self._add_edge(edge)
+    
+    def _add_edge(self, edge: SKGEdge):
+        previous = self.edges.get(edge.edge_id)
+        self.edges[edge.edge_id] = edge
+        if previous is not None:
+            if (previous.source_id, previous.target_id, previous.edge_type) == (
+                    edge.source_id, edge.target_id, edge.edge_type):
+                return
+            self._unindex_edge(previous)
+        
+        for adjacency, node_id in ((self.outgoing, edge.source_id), (self.incoming, edge.target_id)):
+            if isinstance(adjacency, TieredAdjacency):
+                adjacency.add(node_id, edge_type_name(edge.edge_type), edge.edge_id)
+            else:
+                adjacency.setdefault(node_id, {}).setdefault(edge.edge_type, []).append(edge.edge_id)
+    
+    def _unindex_edge(self, edge: SKGEdge):
+        for adjacency, node_id in ((self.outgoing, edge.source_id), (self.incoming, edge.target_id)):
+            if isinstance(adjacency, TieredAdjacency):
+                adjacency.remove(node_id, edge_type_name(edge.edge_type), edge.edge_id)
+                continue
+            bucket = adjacency.get(node_id, {}).get(edge.edge_type)
+            if bucket and edge.edge_id in bucket:
+                bucket.remove(edge.edge_id)
+    
+    def _unindex_node(self, node: SKGNode):
+        self.nodes_by_type[node.node_type].pop(node.node_id, None)
+        for prop in self.INDEXED_PROPERTIES:
+            self._unindex_property(node.node_id, prop, node.properties.get(prop))
+        self._count_owner(node, -1)
+    
+    def _count_owner(self, node: SKGNode, delta: int):
+        wallet = node.properties.get("wallet_address")
+        if node.node_type != SKGNodeType.IDENTITY or not wallet:
+            return
+        count = self.owner_wallets.get(wallet, 0) + delta
+        if count > 0:
+            self.owner_wallets[wallet] = count
+        else:
+            self.owner_wallets.pop(wallet, None)
+    
+    def _touch_wallet(self, wallet: str):
+        self.wallet_versions[wallet] = self.wallet_versions.get(wallet, 0) + 1
+    
+    def _touch_owners(self, node: SKGNode):
+        """Bump the version of every wallet whose portfolio includes ``node``."""
+        if node.node_type == SKGNodeType.IDENTITY:
+            wallets = [node.properties.get("wallet_address")]
+        elif node.node_type == SKGNodeType.CERTIFICATE:
+            wallets = [
+                self.nodes[self.edges[edge_id].target_id].properties.get("wallet_address")
+                for edge_id in self.outgoing.get(node.node_id, {}).get("OWNED_BY", ())
+                if self.edges[edge_id].target_id in self.nodes
+            ]
+        else:
+            return
+        for wallet in wallets:
+            if wallet:
+                self._touch_wallet(wallet)
+    
+    def wallet_version(self, wallet_address: str) -> int:
+        """Change counter for a wallet's portfolio (0 if never touched)."""
+        return self.wallet_versions.get(wallet_address, 0)
+    
+    def _index_property(self, node_id: str, prop: str, value: Any):
+        # Empty values are indexed too: find_nodes("wallet_address", "")
+        # must find identities minted without a wallet
+        if value is not None:
+            bucket = self.property_index[prop].get(value)
+            if bucket is None:
+                bucket = self.property_index[prop][value] = []
+                if prop in self.prefix_index and isinstance(value, str):
+                    self.prefix_index[prop].add(value)
+            bucket.append(node_id)
+    
+    def _unindex_property(self, node_id: str, prop: str, value: Any):
+        bucket = self.property_index[prop].get(value) if value is not None else None
+        if bucket is not None and node_id in bucket:
+            bucket.remove(node_id)
+            if not bucket:
+                del self.property_index[prop][value]
+                if prop in self.prefix_index and isinstance(value, str):
+                    self.prefix_index[prop].discard(value)
+    
+    def rescore_drift(self, baseline_interval: Optional[float] = None) -> dict:
+        """Re-score every certificate's drift in bulk (see ``skg_rescore``)."""
+        return rescore_drift(self, baseline_interval)
+    
+    def query(self) -> "PatternQuery":
+        """Start a pattern query over this graph (see ``skg_query``)."""
+        return PatternQuery(self)
+    
+    def certificates_sharing_ipfs_prefix(self, dals_serial: str, prefix_length: int = 16) -> Iterator[SKGNode]:
+        """Other certificates whose IPFS hash shares a prefix with ``dals_serial``'s."""
+        cert_node = next(iter(self.find_nodes("dals_serial", dals_serial)), None)
+        if cert_node is None:
+            return iter(())
+        prefix = cert_node.properties.get("ipfs_hash", "")[:prefix_length]
+        return (
+            match["cert"] for match in self.query()
+            .match("cert", SKGNodeType.CERTIFICATE, ipfs_hash=Prefix(prefix))
+            .run()
+            if match["cert"].node_id != cert_node.node_id
+        )
+    
+    def find_nodes(self, prop: str, value: Any) -> List[SKGNode]:
+        """Exact-match lookup on an indexed node property."""
+        return [self.nodes[node_id] for node_id in self.property_index[prop].get(value, ())]
+    
+    def edges_from(self, node_id: str, edge_type: str) -> Iterator[SKGEdge]:
+        """Outgoing edges of one type."""
+        by_type = self.outgoing.get(node_id)
+        for edge_id in (by_type.get(edge_type, ()) if by_type else ()):
+            yield self.edges[edge_id]
+    
+    def edges_to(self, node_id: str, edge_type: str) -> Iterator[SKGEdge]:
+        """Incoming edges of one type."""
+        by_type = self.incoming.get(node_id)
+        for edge_id in (by_type.get(edge_type, ()) if by_type else ()):
+            yield self.edges[edge_id]
+    
+    def search_certificates(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        Search-as-you-type over certificate titles and owner names: ranked
+        (certificate ID, score) pairs matching every query token, the last
+        one as a prefix unless the query ends in whitespace.
+        """
+        return [(cert_id, score) for cert_id, score in self.search_index.search(query, limit)
+                if cert_id in self.nodes]
     
     def query_by_wallet(self, wallet_address: str) -> List[Dict[str, Any]]:
         """
         Find all certificates owned by a wallet address.
+        Cost is proportional to the result size via the wallet property index
+        and incoming OWNED_BY adjacency.
         """
         results = []
-        for node in self.nodes.values():
-            if node.node_type == SKGNodeType.CERTIFICATE:
-                # Traverse OWNED_BY edge to find owner
-                for edge in self.edges.values():
-                    if edge.source_id == node.node_id and edge.edge_type == "OWNED_BY":
-                        owner_node = self.nodes.get(edge.target_id)
-                        if owner_node and owner_node.properties.get("wallet_address") == wallet_address:
-                            results.append({
-                                "certificate": node.properties,
-                                "ownership": edge.properties
-                            })
+        for owner_node in self.find_nodes("wallet_address", wallet_address):
+            if owner_node.node_type != SKGNodeType.IDENTITY:
+                continue
+            for edge in self.edges_to(owner_node.node_id, "OWNED_BY"):
+                cert_node = self.nodes.get(edge.source_id)
+                if cert_node and cert_node.node_type == SKGNodeType.CERTIFICATE:
+                    results.append({
+                        "certificate": cert_node.properties,
+                        "ownership": edge.properties
+                    })
         
         return results
     
-    def get_swarm_knowledge_summary(self) -> dict:
+    def get_swarm_knowledge_summary(self, recompute: bool = False) -> dict:
         """
         Generate summary for Super Worker Guardian monitoring.
+        Served from counters maintained during ingest; ``recompute`` rebuilds
+        every figure from a full scan instead (see ``check_summary_consistency``).
         """
+        if recompute:
+            certificate_count = len([n for n in self.nodes.values() if n.node_type == SKGNodeType.CERTIFICATE])
+            unique_owners = len({n.properties.get("wallet_address") for n in self.nodes.values() if n.node_type == SKGNodeType.IDENTITY and n.properties.get("wallet_address")})
+        else:
+            certificate_count = len(self.nodes_by_type[SKGNodeType.CERTIFICATE])
+            unique_owners = len(self.owner_wallets)
+        
         return {
             "total_nodes": len(self.nodes),
             "total_edges": len(self.edges),
-            "certificate_count": len([n for n in self.nodes.values() if n.node_type == SKGNodeType.CERTIFICATE]),
-            "unique_owners": len({n.properties.get("wallet_address") for n in self.nodes.values() if n.node_type == SKGNodeType.IDENTITY and n.properties.get("wallet_address")}),
-            "latest_drift_score": self.drift_analyzer.get_global_drift_average(),
-            "pattern_clusters": self.pattern_learner.get_cluster_count()
+            "certificate_count": certificate_count,
+            "unique_owners": unique_owners,
+            "latest_drift_score": self.drift_analyzer.get_global_drift_average(recompute=recompute),
+            "pattern_clusters": self.pattern_learner.get_cluster_count(recompute=recompute)
+        }
+    
+    def check_summary_consistency(self) -> Dict[str, tuple]:
+        """
+        Compare the incremental summary with a from-scratch recomputation.
+        Returns {key: (incremental, recomputed)} for every mismatch.
+        """
+        def flatten(summary: dict, prefix: str = "") -> dict:
+            flat = {}
+            for key, value in summary.items():
+                if isinstance(value, dict):
+                    flat.update(flatten(value, f"{prefix}{key}."))
+                else:
+                    flat[prefix + key] = value
+            return flat
+        
+        incremental = flatten(self.get_swarm_knowledge_summary())
+        recomputed = flatten(self.get_swarm_knowledge_summary(recompute=True))
+        mismatches = {}
+        for key, value in incremental.items():
+            expected = recomputed.get(key)
+            if isinstance(value, float) and isinstance(expected, float):
+                if abs(value - expected) > 1e-9:
+                    mismatches[key] = (value, expected)
+            elif value != expected:
+                mismatches[key] = (value, expected)
+        return mismatches
+    
+    def get_storage_metrics(self) -> dict:
+        """Hot/cold tier sizes, hit rate and fault latency per tiered store."""
+        return {
+            name: store.metrics()
+            for name, store in (("nodes", self.nodes), ("edges", self.edges))
+            if isinstance(store, TieredStore)
         }
     
+    def _sync_search_index(self):
+        """
+        Bring the persisted search index up to date with the loaded graph.
+        An index saved with the loaded snapshot only needs the certificates
+        touched by the replayed log tail (new or patched certificates, renamed
+        owners, new ownership edges); an older or missing one is checked
+        against every certificate (unchanged ones cost a checksum).
+        """
+        if self.search_index.positions is not None and self.search_index.positions == self.load_stats.get("positions"):
+            cert_ids = self._tail_certificates(self.search_index.positions)
+        else:
+            cert_ids = list(self.nodes_by_type[SKGNodeType.CERTIFICATE])
+        for cert_id in cert_ids:
+            cert = self.nodes.get(cert_id)
+            if cert is None or cert.node_type != SKGNodeType.CERTIFICATE:
+                continue
+            owner = next((self.nodes.get(edge.target_id) for edge in self.edges_from(cert_id, "OWNED_BY")), None)
+            self.search_index.add(cert_id, cert.properties.get("asset_title", ""),
+                                  owner.properties.get("owner_name", "") if owner is not None else "")
+    
+    def _tail_certificates(self, positions: Dict[str, List[int]]) -> Dict[str, None]:
+        """Certificates whose title or owner name may have changed past ``positions``."""
+        cert_ids: Dict[str, None] = {}
+        for kind in ("nodes", "edges"):
+            segment, offset = positions.get(kind, (None, 0))
+            for _, _, line in self.serializer.logs[kind].iter_lines(segment, offset):
+                record = json.loads(line)
+                if kind == "edges":
+                    if record["edge_type"] == "OWNED_BY":
+                        cert_ids[record["source_id"]] = None
+                    continue
+                node = self.nodes.get(record["node_id"])
+                if node is not None and node.node_type == SKGNodeType.IDENTITY:
+                    cert_ids.update((edge.source_id, None) for edge in self.edges_to(node.node_id, "OWNED_BY"))
+                else:
+                    cert_ids[record["node_id"]] = None
+        return cert_ids
+    
     def _load_from_vault(self):
-        """Load existing SKG state from vault JSONL files."""
-        self.serializer.load_graph(self.nodes, self.edges)
\ No newline at end of file
+        """
+        Load existing SKG state: latest snapshot plus log tail replay.
+        Startup time is recorded against graph size in startup_metrics.jsonl.
+        """
+        # Single-threaded during construction, so the unlocked variants are used
+        self.load_stats = self.serializer.load_graph(self._add_node, self._add_edge, self._apply_node_patch)
+        self.load_stats.update({
+            "worker_id": self.worker_id,
+            "total_nodes": len(self.nodes),
+            "total_edges": len(self.edges),
+            "loaded_at": datetime.utcnow().isoformat() + "Z"
+        })
+        
+        metrics_path = self.serializer.worker_skg_path / "startup_metrics.jsonl"
+        with open(metrics_path, "a") as f:
+            f.write(json.dumps(self.load_stats) + "\n")
\ No newline at end of file
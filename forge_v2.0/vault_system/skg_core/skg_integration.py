@@ -1,39 +1,101 @@
 # skg_integration.py
+import asyncio
 import sys
+import threading
+import time
+from collections import deque
 from pathlib import Path
+from statistics import median
+from typing import Optional
 
 # Add skg_core to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from skg_engine import SwarmKnowledgeGraphEngine
+from skg_node import iso_to_micros, now_micros
+from skg_portfolio import PortfolioCache
+
+INGEST_TOPIC = "skg_ingest"
+DEAD_LETTER_TOPIC = "skg_ingest_dead_letter"
 
 class CertificateSKGBridge:
     """
     Bridge between Certificate Forge and SKG.
     Automatically ingests certificates into swarm knowledge.
+    
+    Minted certificates are appended to the ``skg_ingest`` FusionQueue topic
+    and ingested by a dedicated background thread in topic order. The queue
+    is bounded: ``on_certificate_minted`` waits while ``max_pending`` events
+    are unprocessed. The consumer commits its offset only after the graph is
+    flushed, so events queued before a crash are ingested on the next start.
+    A certificate that still fails after ``INGEST_ATTEMPTS`` tries is parked
+    on the ``skg_ingest_dead_letter`` topic before its offset is committed.
+    If the worker thread dies, ``flush``, ``queue_depth`` and
+    ``on_certificate_minted`` raise RuntimeError with its last error.
     """
     
-    def __init__(self, vault_base_path: Path):
+    WORKER_ID = "certificate_forge_worker_001"
+    RETRY_DELAY = 1.0    # seconds before retrying a failed poll/flush/commit/ingest
+    INGEST_ATTEMPTS = 3
+    
+    def __init__(self, vault_base_path: Path, serial_index=None, fusion_queue=None,
+                 max_pending: int = 10_000, poll_batch: int = 256,
+                 portfolio_cache_bytes: int = 64 * 1024 * 1024):
         self.skg = SwarmKnowledgeGraphEngine(
             vault_base_path=vault_base_path,
-            worker_id="certificate_forge_worker_001"
+            worker_id=self.WORKER_ID,
+            serial_index=serial_index
         )
+        self.portfolios = PortfolioCache(self.skg, max_bytes=portfolio_cache_bytes)
+        
+        self._owns_queue = fusion_queue is None
+        if fusion_queue is None:
+            sys.path.insert(0, str(Path(__file__).parents[2]))
+            from fusion_queue_engine import FusionQueueEngine
+            fusion_queue = FusionQueueEngine(vault_base_path / "skg_graph" / "ingest_queue")
+        self.fusion_queue = fusion_queue
+        self.max_pending = max_pending
+        self.poll_batch = poll_batch
+        
+        self._consumer = fusion_queue.consumer(INGEST_TOPIC, f"skg:{self.WORKER_ID}")
+        self._processed_offset = self._consumer.committed_offset
+        self._progress = threading.Condition()
+        self._stopping = threading.Event()
+        
+        self.ingest_metrics = {"enqueued": 0, "ingested": 0, "skipped": 0, "retried": 0,
+                               "dead_lettered": 0, "last_error": None}
+        self._ingest_latencies: deque = deque(maxlen=1024)
+        
+        self._worker = threading.Thread(target=self._ingest_loop, name="skg-ingest", daemon=True)
+        self._worker.start()
     
     async def on_certificate_minted(self, certificate_data: dict, vault_txn_id: str):
         """
         Hook called by certificate_forge.py after minting.
+        Returns once the certificate is fsynced to the ingest queue; graph
+        ingestion, pattern learning and drift analysis happen in the background.
         """
         
-        # Ingest into SKG
-        skg_txn_id = self.skg.ingest_certificate(certificate_data, vault_txn_id)
+        # Backpressure: wait for the ingest worker while the queue is full
+        # (queue_depth raises if the worker died, rather than spinning)
+        while self.queue_depth() >= self.max_pending:
+            await asyncio.sleep(0.005)
+        
+        receipt = self.fusion_queue.publish(
+            INGEST_TOPIC,
+            {"certificate_data": certificate_data, "vault_txn_id": vault_txn_id},
+            key=certificate_data['dals_serial'],
+            sync=True
+        )
+        self.ingest_metrics["enqueued"] += 1
         
         # Get drift score for monitoring
         drift_score = certificate_data.get('drift_score', 0.0)
         
         # Prepare FusionQueue payload for swarm broadcast
         fusion_payload = {
-            "event_type": "SKG_CERTIFICATE_INGESTED",
-            "skg_transaction_id": skg_txn_id,
+            "event_type": "SKG_CERTIFICATE_QUEUED",
+            "skg_ingest_offset": receipt["offset"],
             "vault_transaction_id": vault_txn_id,
             "dals_serial": certificate_data['dals_serial'],
             "drift_score": drift_score,
@@ -43,22 +105,197 @@ class CertificateSKGBridge:
         
         return fusion_payload
     
+    def _ingest_loop(self):
+        """
+        Background worker: ingest queued certificates in offset order. A
+        failing poll, flush or commit is recorded in ``last_error`` and the
+        batch's flush and commit are retried after ``RETRY_DELAY``; a failing
+        certificate is retried, then dead-lettered (see ``_ingest_record``).
+        """
+        try:
+            while not self._stopping.is_set():
+                try:
+                    self._ingest_batch()
+                except Exception as error:
+                    self.ingest_metrics["last_error"] = f"ingest loop: {error!r}"
+                    self._stopping.wait(self.RETRY_DELAY)
+        except BaseException as error:
+            self.ingest_metrics["last_error"] = f"ingest worker died: {error!r}"
+            raise
+        finally:
+            # Wake flush() waiters so they notice the worker is gone
+            with self._progress:
+                self._progress.notify_all()
+
+    def _ingest_batch(self):
+        records = self._consumer.poll(max_records=self.poll_batch, timeout=0.1)
+        
+        for record in records:
+            try:
+                self._ingest_record(record)
+            except BaseException:
+                # Not ingested or parked: resume from it, committing only
+                # the records before it
+                self._consumer.seek(record["offset"])
+                raise
+            self._ingest_latencies.append((now_micros() - iso_to_micros(record["timestamp"])) / 1_000_000)
+        
+        # Also reached with no new records when a previous flush/commit failed
+        if self._consumer.position == self._processed_offset:
+            return
+        
+        # Durable graph first, then the queue position
+        self.skg.flush()
+        self._consumer.commit()
+        with self._progress:
+            self._processed_offset = self._consumer.position
+            self._progress.notify_all()
+    
+    def _ingest_record(self, record: dict):
+        """
+        Ingest one queued certificate, retrying ``INGEST_ATTEMPTS`` times
+        ``RETRY_DELAY`` apart. A certificate that keeps failing is published
+        (fsynced, with its offset and error) to the dead-letter topic, so
+        committing past it never drops it.
+        """
+        payload = record["payload"]
+        certificate_data = payload.get("certificate_data", {})
+        for attempt in range(self.INGEST_ATTEMPTS):
+            try:
+                # Already in the graph when replayed after a crash
+                if f"cert:{certificate_data['dals_serial']}" in self.skg.nodes:
+                    self.ingest_metrics["skipped"] += 1
+                else:
+                    self.skg.ingest_certificate(certificate_data, payload["vault_txn_id"])
+                    self._refresh_portfolio(certificate_data['dals_serial'])
+                    self.ingest_metrics["ingested"] += 1
+                return
+            except Exception as error:
+                self.ingest_metrics["last_error"] = f"offset {record['offset']}: {error!r}"
+                if attempt + 1 < self.INGEST_ATTEMPTS:
+                    self.ingest_metrics["retried"] += 1
+                    time.sleep(self.RETRY_DELAY)
+        
+        self.fusion_queue.publish(
+            DEAD_LETTER_TOPIC,
+            {**payload, "skg_ingest_offset": record["offset"], "error": self.ingest_metrics["last_error"]},
+            key=certificate_data.get('dals_serial'),
+            sync=True
+        )
+        self.ingest_metrics["dead_lettered"] += 1
+    
+    def _check_worker(self):
+        """Raise instead of waiting on an ingest worker that has died."""
+        if not self._worker.is_alive() and not self._stopping.is_set():
+            raise RuntimeError(f"SKG ingest worker stopped (last error: {self.ingest_metrics['last_error']})")
+    
+    def queue_depth(self) -> int:
+        """Events enqueued but not yet ingested. Raises RuntimeError if the ingest worker died."""
+        self._check_worker()
+        return self._pending()
+    
+    def _pending(self) -> int:
+        return max(self.fusion_queue.next_offset(INGEST_TOPIC) - self._processed_offset, 0)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event enqueued so far is ingested and committed.
+        Returns False if ``timeout`` (seconds) expired first; raises
+        RuntimeError if the ingest worker died.
+        """
+        target = self.fusion_queue.next_offset(INGEST_TOPIC)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._progress:
+            while self._processed_offset < target:
+                self._check_worker()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._progress.wait(0.1 if remaining is None else min(remaining, 0.1))
+        return True
+    
+    def get_ingest_metrics(self) -> dict:
+        """Queue depth, throughput counters and enqueue-to-ingest latency."""
+        latencies = sorted(self._ingest_latencies)
+        return {
+            **self.ingest_metrics,
+            "queue_depth": self._pending(),
+            "worker_alive": self._worker.is_alive(),
+            "max_pending": self.max_pending,
+            "processed_offset": self._processed_offset,
+            "latency_median_ms": median(latencies) * 1000 if latencies else 0.0,
+            "latency_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+        }
+    
+    def close(self):
+        """
+        Drain the ingest queue, stop the worker and close the graph. If the
+        worker died, the graph is still closed and the RuntimeError raised.
+        """
+        try:
+            self.flush()
+        finally:
+            self._stopping.set()
+            self._worker.join()
+            self.skg.close()
+            if self._owns_queue:
+                self.fusion_queue.close()
+    
+    def sync_from_queue(self, consumer, max_records: int = 500, timeout: float = 0.0) -> int:
+        """
+        Incrementally ingest swarm broadcasts from a FusionQueue consumer.
+        Certificates already present in this worker's graph are skipped.
+        Each is ingested from the broadcast's ``certificate_data`` (the same
+        record the minting worker ingested); broadcasts from before it was
+        added only carry ``asset_metadata``, without title or signature.
+        Returns the number of certificates ingested.
+        """
+        ingested = 0
+        for record in consumer.poll(max_records=max_records, timeout=timeout):
+            event = record["payload"].get("certificate_event", {})
+            if event.get("event_type") != "CERTIFICATE_MINTED":
+                continue
+            if f"cert:{event['dals_serial']}" in self.skg.nodes:
+                continue
+            self.skg.ingest_certificate(event.get("certificate_data", event["asset_metadata"]),
+                                        event.get("vault_txn", ""))
+            self._refresh_portfolio(event['dals_serial'])
+            ingested += 1
+
+        consumer.commit()
+        return ingested
+
+    def _refresh_portfolio(self, dals_serial: str):
+        """Fold a just-ingested certificate into its owner's cached portfolio."""
+        cert_id = f"cert:{dals_serial}"
+        for edge in self.skg.edges_from(cert_id, "OWNED_BY"):
+            owner = self.skg.nodes.get(edge.target_id)
+            if owner is not None:
+                self.portfolios.on_certificate_ingested(
+                    owner.properties["wallet_address"],
+                    {"certificate": self.skg.nodes[cert_id].properties, "ownership": edge.properties}
+                )
+    
     def get_owner_portfolio(self, wallet_address: str) -> dict:
         """
         Query SKG for all certificates owned by a wallet.
+        Useful for customer dashboard. Served from the portfolio cache; the
+        certificate rows are shared with the graph and must not be mutated.
+        """
+        return self.portfolios.get(wallet_address)
+    
+    def search_certificates(self, query: str, limit: int = 20) -> dict:
+        """
+        Search-as-you-type over asset titles and owner names.
         Useful for customer dashboard.
         """
-        certificates = self.skg.query_by_wallet(wallet_address)
+        results = []
+        for cert_id, score in self.skg.search_certificates(query, limit):
+            node = self.skg.nodes.get(cert_id)
+            if node is not None:
+                results.append({"certificate": node.properties, "score": score})
         
-        return {
-            "wallet_address": wallet_address,
-            "certificate_count": len(certificates),
-            "certificates": certificates,
-            "drift_analysis": {
-                "average_drift": sum(c['certificate'].get('drift_score', 0) for c in certificates) / len(certificates) if certificates else 0,
-                "highest_drift_certificate": max(certificates, key=lambda c: c['certificate'].get('drift_score', 0)) if certificates else None
-            }
-        }
+        return {"query": query, "result_count": len(results), "results": results}
     
     def get_skg_health_metrics(self) -> dict:
         """
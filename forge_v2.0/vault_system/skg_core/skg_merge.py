@@ -0,0 +1,225 @@
+# skg_merge.py
+import heapq
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add skg_core to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from segmented_log import SegmentedLog
+from skg_engine import SwarmKnowledgeGraphEngine
+from skg_node import SKGNode, SKGEdge, SKGNodeType
+from skg_serializer import transaction_micros
+
+MERGE_KINDS = ("nodes", "edges")  # nodes first within a transaction
+
+# Properties a later worker must not overwrite when the same node is merged
+SET_ONCE = {SKGNodeType.IDENTITY: ("first_seen",)}
+
+
+def read_worker_tail(worker_path: Path, state: dict, include_hot: bool = False) -> Tuple[str, List[tuple], dict]:
+    """
+    Parse the node/edge records one worker wrote since ``state``.
+
+    Runs in a pool process per worker. Only sealed segments are read unless
+    ``include_hot`` (safe for stopped workers), so every position handed back
+    stays valid as segments are compressed. If the worker's logs were
+    compacted since the last run, the positions are stale and that worker is
+    re-read from the start (merging is idempotent).
+    Returns (worker_id, [(micros, kind order, sequence, kind, record)], new state).
+    """
+    worker_id = worker_path.name
+    entries = []
+    new_state = {}
+
+    for order, kind in enumerate(MERGE_KINDS):
+        log = SegmentedLog(worker_path, kind, read_only=True)
+        previous = state.get(kind, {})
+        generation = log.compaction_generation()
+        segment, offset = previous.get("position", (None, 0))
+        if previous.get("generation", 0) != generation:
+            segment, offset = None, 0
+
+        end_segment = log.hot_segment if include_hot else log.hot_segment - 1
+        for line_segment, line_offset, line in log.iter_lines(segment, offset):
+            if line_segment > end_segment:
+                break
+            record = json.loads(line)
+            entries.append((transaction_micros(record["transaction_id"]), order, len(entries), kind, record))
+            segment, offset = line_segment, line_offset + len(line)
+
+        new_state[kind] = {"position": (segment, offset), "generation": generation}
+        log.close()
+
+    # Logs are append-ordered; sort so the k-way merge sees commit-time order
+    entries.sort(key=lambda entry: entry[:3])
+    return worker_id, entries, new_state
+
+
+class SwarmGraphMerger:
+    """
+    Builds the swarm-wide graph from every worker's SKG logs.
+
+    Worker tails are parsed in parallel, k-way merged by transaction commit
+    time and upserted into a consolidated graph kept by its own engine
+    (``swarm_global/``): entities written by several workers collapse into
+    one node or edge, and only what changed is logged. Per-worker positions
+    are saved after each run so the next run consumes only new segments.
+
+    Newly merged certificates are fed, in merge order, to the global
+    engine's pattern learner and drift analyzer once their owner and chain
+    edges are merged too (a certificate whose edges sit in a worker's
+    unsealed segment waits for a later run), so ``summary`` describes the
+    merged graph. Drift aggregates persist with the engine; the pattern
+    learner is rebuilt from the merged certificates on start.
+    """
+
+    def __init__(self, skg_graph_path: Path, processes: Optional[int] = None,
+                 include_hot: bool = False):
+        self.skg_graph_path = skg_graph_path
+        self.workers_path = skg_graph_path / "worker_skg"
+        self.processes = processes
+        self.include_hot = include_hot
+
+        self.global_path = skg_graph_path / "swarm_global"
+        self.state_path = self.global_path / "merge_state.json"
+        self.engine = SwarmKnowledgeGraphEngine(self.global_path, "swarm", snapshot_interval=0)
+
+        saved = json.loads(self.state_path.read_text()) if self.state_path.exists() else {}
+        if "workers" not in saved:    # positions-only state from older runs
+            saved = {"workers": saved}
+        self.state: Dict[str, dict] = saved["workers"]
+        self.pending: List[str] = saved.get("pending_analysis", [])
+
+        waiting = set(self.pending)
+        for cert_id in self.engine.nodes_by_type[SKGNodeType.CERTIFICATE]:
+            if cert_id not in waiting:
+                self._analyze(cert_id, drift=False)
+
+    def merge(self) -> dict:
+        """Run one incremental merge pass. Returns merge statistics."""
+        started = time.perf_counter()
+        workers = sorted(p for p in self.workers_path.iterdir() if p.is_dir()) if self.workers_path.exists() else []
+        stats = {"workers": len(workers), "records": 0, "new_nodes": 0, "node_patches": 0, "new_edges": 0}
+
+        if self.processes == 1 or len(workers) <= 1:
+            results = [read_worker_tail(w, self.state.get(w.name, {}), self.include_hot) for w in workers]
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                results = list(pool.map(
+                    read_worker_tail, workers,
+                    [self.state.get(w.name, {}) for w in workers],
+                    [self.include_hot] * len(workers)
+                ))
+
+        streams = [
+            ((micros, order, worker_id, sequence, kind, record)
+             for micros, order, sequence, kind, record in entries)
+            for worker_id, entries, _ in results
+        ]
+
+        new_nodes, patches, new_edges = [], [], []
+        merged_certificates = []
+        for _, _, _, _, kind, record in heapq.merge(*streams, key=lambda entry: entry[:4]):
+            stats["records"] += 1
+            if kind == "edges":
+                edge = SKGEdge.from_dict(record)
+                if self.engine.upsert_edge(edge):
+                    new_edges.append(edge)
+            elif record.get("record_type") == "node_patch":
+                node = self.engine.nodes.get(record["node_id"])
+                if node is not None:
+                    change = self.engine.upsert_node(
+                        SKGNode(node.node_id, node.node_type, dict(record["properties"]), node.created_by)
+                    )
+                    if change is not None:
+                        patches.append(change)
+            else:
+                node = SKGNode.from_dict(record)
+                change = self.engine.upsert_node(node, set_once=SET_ONCE.get(node.node_type, ()))
+                if change is node:
+                    new_nodes.append(node)
+                    if node.node_type == SKGNodeType.CERTIFICATE:
+                        merged_certificates.append(node.node_id)
+                elif change is not None:
+                    patches.append(change)
+
+        # Learner and drift analyzer, in merge order (earlier waiting ones first)
+        waiting = self.pending + merged_certificates
+        self.pending = [cert_id for cert_id in waiting if not self._analyze(cert_id)]
+        stats["analyzed"] = len(waiting) - len(self.pending)
+        stats["pending_analysis"] = len(self.pending)
+
+        if new_nodes or patches or new_edges:
+            self.engine.serializer.serialize_transaction(
+                nodes=new_nodes, edges=new_edges, event_type="SWARM_MERGE", node_patches=patches
+            )
+        self.engine.flush()
+
+        # Positions are saved only once the merged records are in the log
+        for worker_id, _, worker_state in results:
+            self.state[worker_id] = worker_state
+        self._save_state()
+
+        stats.update({"new_nodes": len(new_nodes), "node_patches": len(patches),
+                      "new_edges": len(new_edges), "seconds": time.perf_counter() - started})
+        return stats
+
+    def _analyze(self, cert_id: str, drift: bool = True) -> bool:
+        """
+        Feed a merged certificate with its owner and chain to the pattern
+        learner (and drift analyzer). False if either edge is not merged yet.
+        """
+        engine = self.engine
+        cert_node = engine.nodes.get(cert_id)
+        if cert_node is None:
+            return True
+        owner_node = next((engine.nodes.get(edge.target_id) for edge in engine.edges_from(cert_id, "OWNED_BY")), None)
+        chain_node = next((engine.nodes.get(edge.target_id) for edge in engine.edges_from(cert_id, "ANCHORED_ON")), None)
+        if owner_node is None or chain_node is None:
+            return False
+
+        engine.pattern_learner.learn_from_certificate(cert_node, owner_node, chain_node)
+        if drift:
+            engine.drift_analyzer.analyze_certificate_drift(cert_node)
+        return True
+
+    def write_snapshot(self):
+        """Emit a consolidated snapshot of the global graph."""
+        self.engine.snapshot(background=False)
+
+    def summary(self) -> dict:
+        return self.engine.get_swarm_knowledge_summary()
+
+    def close(self):
+        self.engine.close()
+
+    def _save_state(self):
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"workers": self.state, "pending_analysis": self.pending}, indent=2))
+        os.replace(tmp_path, self.state_path)
+
+
+# CLI Wrapper (run this)
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Merge every worker's SKG logs into the swarm-wide graph")
+    parser.add_argument("--vault", default="vault_system")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--include-hot", action="store_true", help="Also read hot segments (stopped workers only)")
+    parser.add_argument("--snapshot", action="store_true", help="Write a consolidated snapshot after merging")
+
+    args = parser.parse_args()
+
+    merger = SwarmGraphMerger(Path(args.vault) / "skg_graph", args.processes, args.include_hot)
+    print(merger.merge())
+    if args.snapshot:
+        merger.write_snapshot()
+    print(merger.summary())
+    merger.close()
@@ -1,8 +1,10 @@
 # skg_node.py
+import hashlib
+import sys
+import time
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
 
 class SKGNodeType(Enum):
     """Node types in the knowledge graph."""
@@ -12,17 +14,120 @@ class SKGNodeType(Enum):
     PATTERN = "pattern"
     DRIFT_EVENT = "drift_event"
 
-@dataclass
+class SKGEdgeType(str, Enum):
+    """
+    Known edge types. Members compare and hash equal to their string value,
+    so indexes keyed by the plain string keep working.
+    """
+    OWNED_BY = "OWNED_BY"
+    ANCHORED_ON = "ANCHORED_ON"
+    TRANSACTS_ON = "TRANSACTS_ON"
+
+# Timestamps are held as integer microseconds since the Unix epoch
+EPOCH = datetime(1970, 1, 1)
+NO_TIMESTAMP = -(2 ** 63)
+
+_EDGE_TYPES = {member.value: member for member in SKGEdgeType}
+
+
+def intern_id(value: str) -> str:
+    """
+    Canonical instance of an ID or repeated label. Every node, edge and index
+    referring to the same ID shares one string object, which in CPython is
+    already a one-word handle.
+    """
+    return sys.intern(value)
+
+
+def edge_type_code(edge_type: Union[str, SKGEdgeType]) -> Union[str, SKGEdgeType]:
+    """Enum member for known edge types, interned string otherwise."""
+    return _EDGE_TYPES.get(edge_type) or intern_id(edge_type)
+
+
+def edge_type_name(edge_type: Union[str, SKGEdgeType]) -> str:
+    return edge_type.value if isinstance(edge_type, SKGEdgeType) else edge_type
+
+
+def edge_id_for(source_id: str, edge_type: Union[str, SKGEdgeType], target_id: str) -> str:
+    """Deterministic edge ID, so re-asserting a relationship is idempotent."""
+    key = f"{source_id}|{edge_type_name(edge_type)}|{target_id}".encode()
+    return f"edge:{hashlib.blake2b(key, digest_size=8).hexdigest()}"
+
+
+def now_micros() -> int:
+    return time.time_ns() // 1000
+
+
+def iso_to_micros(iso: str) -> int:
+    """ISO-8601 UTC timestamp (optionally Z-suffixed) to epoch microseconds."""
+    try:
+        parsed = datetime.fromisoformat(iso.rstrip("Z"))
+    except (ValueError, TypeError, AttributeError):
+        return NO_TIMESTAMP
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return (parsed - EPOCH) // timedelta(microseconds=1)
+
+
+def stardate_to_micros(stardate: str) -> int:
+    """
+    Forge stardate (``YYYMMDD.HHMM`` UTC, years counted from 1900, e.g.
+    ``1251210.2312`` for 2025-12-10 23:12) to epoch microseconds. ISO-8601
+    timestamps are accepted too; anything else gives NO_TIMESTAMP.
+    """
+    try:
+        date_part, _, time_part = stardate.partition(".")
+        if len(date_part) < 5 or len(time_part) != 4 or not (date_part + time_part).isdigit():
+            return iso_to_micros(stardate)
+        parsed = datetime(int(date_part[:-4]) + 1900, int(date_part[-4:-2]), int(date_part[-2:]),
+                          int(time_part[:2]), int(time_part[2:]))
+    except (ValueError, TypeError, AttributeError):
+        return NO_TIMESTAMP
+    return (parsed - EPOCH) // timedelta(microseconds=1)
+
+
+def micros_to_iso(micros: int) -> str:
+    if micros == NO_TIMESTAMP:
+        return ""
+    return (EPOCH + timedelta(microseconds=micros)).isoformat() + "Z"
+
+
+def _timestamp(value: Optional[Union[str, int]]) -> int:
+    if value is None:
+        return now_micros()
+    if isinstance(value, int):
+        return value
+    return iso_to_micros(value)
+
+
 class SKGNode:
     """Immutable node representing an entity in the graph."""
-    node_id: str
-    node_type: SKGNodeType
-    properties: Dict[str, Any]
-    created_by: str
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
-    version: int = 1
-    is_active: bool = True
-    
+
+    __slots__ = ("node_id", "node_type", "properties", "created_by", "created_at_us", "version", "is_active")
+
+    def __init__(self, node_id: str, node_type: SKGNodeType, properties: Dict[str, Any],
+                 created_by: str, created_at: Optional[Union[str, int]] = None,
+                 version: int = 1, is_active: bool = True):
+        self.node_id = intern_id(node_id)
+        self.node_type = node_type
+        self.properties = properties
+        self.created_by = intern_id(created_by)
+        self.created_at_us = _timestamp(created_at)
+        self.version = version
+        self.is_active = is_active
+
+    @property
+    def created_at(self) -> str:
+        return micros_to_iso(self.created_at_us)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SKGNode):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"SKGNode(node_id={self.node_id!r}, node_type={self.node_type}, version={self.version})"
+
     def to_dict(self) -> dict:
         return {
             "node_id": self.node_id,
@@ -34,24 +139,73 @@ class SKGNode:
             "is_active": self.is_active
         }
 
-@dataclass
+    def patched(self, properties: Dict[str, Any], version: int) -> "SKGNode":
+        """Copy with ``properties`` merged in; the original is left untouched."""
+        return SKGNode(self.node_id, self.node_type, {**self.properties, **properties},
+                       self.created_by, self.created_at_us, version, self.is_active)
+
+    @classmethod
+    def from_dict(cls, record: dict) -> "SKGNode":
+        """Rebuild a node from its serialized form (extra keys ignored)."""
+        return cls(
+            node_id=record["node_id"],
+            node_type=SKGNodeType(record["node_type"]),
+            properties={intern_id(k): v for k, v in record.get("properties", {}).items()},
+            created_by=record.get("created_by", ""),
+            created_at=record.get("created_at", ""),
+            version=record.get("version", 1),
+            is_active=record.get("is_active", True)
+        )
+
 class SKGEdge:
     """Directed edge representing a relationship."""
-    edge_id: str
-    source_id: str
-    target_id: str
-    edge_type: str
-    properties: Dict[str, Any]
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
-    confidence: float = 1.0
-    
+
+    __slots__ = ("edge_id", "source_id", "target_id", "edge_type", "properties", "created_at_us", "confidence")
+
+    def __init__(self, edge_id: str, source_id: str, target_id: str,
+                 edge_type: Union[str, SKGEdgeType], properties: Dict[str, Any],
+                 created_at: Optional[Union[str, int]] = None, confidence: float = 1.0):
+        self.edge_id = edge_id
+        self.source_id = intern_id(source_id)
+        self.target_id = intern_id(target_id)
+        self.edge_type = edge_type_code(edge_type)
+        self.properties = properties
+        self.created_at_us = _timestamp(created_at)
+        self.confidence = confidence
+
+    @property
+    def created_at(self) -> str:
+        return micros_to_iso(self.created_at_us)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SKGEdge):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (f"SKGEdge(edge_id={self.edge_id!r}, source_id={self.source_id!r}, "
+                f"target_id={self.target_id!r}, edge_type={edge_type_name(self.edge_type)!r})")
+
     def to_dict(self) -> dict:
         return {
             "edge_id": self.edge_id,
             "source_id": self.source_id,
             "target_id": self.target_id,
-            "edge_type": self.edge_type,
+            "edge_type": edge_type_name(self.edge_type),
             "properties": self.properties,
             "created_at": self.created_at,
             "confidence": self.confidence
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_dict(cls, record: dict) -> "SKGEdge":
+        """Rebuild an edge from its serialized form (extra keys ignored)."""
+        return cls(
+            edge_id=record["edge_id"],
+            source_id=record["source_id"],
+            target_id=record["target_id"],
+            edge_type=record["edge_type"],
+            properties=record.get("properties", {}),
+            created_at=record.get("created_at", ""),
+            confidence=record.get("confidence", 1.0)
+        )
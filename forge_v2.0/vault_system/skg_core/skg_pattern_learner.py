@@ -1,69 +1,166 @@
 # skg_pattern_learner.py
-from collections import defaultdict
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple, Union
 from skg_node import SKGNode, SKGNodeType
+from skg_sketches import CountMinSketch, HyperLogLog
 import hashlib
 
+# Cluster families tracked as bounded heavy hitters; IPFS content is indexed exactly
+CLUSTER_FAMILIES = ("wallet_behavior", "issuance_hour", "chain_activity")
+
+
+class PatternCluster:
+    """Exact count of a cluster plus a bounded sample of its members."""
+
+    __slots__ = ("count", "members")
+
+    def __init__(self, count: int = 0, members: List[str] = None):
+        self.count = count
+        self.members = members if members is not None else []
+
+    def add(self, cert_id: str, max_members: int):
+        self.count += 1
+        if len(self.members) < max_members:
+            self.members.append(cert_id)
+
+
 class SKGPatternLearner:
     """
     Detects patterns in certificate data for deduplication and anomaly detection.
     Runs in FusionQueueEngine for swarm-wide pattern convergence.
+
+    Memory is bounded per cluster: each keeps its exact count and at most
+    ``max_members`` certificate IDs. Per family only the ``max_clusters``
+    most frequent clusters are tracked exactly; a count-min sketch gives the
+    frequency of any cluster and a HyperLogLog the number of distinct ones.
+    Duplicate checks are dictionary lookups on the IPFS prefix or full hash.
     """
-    
-    def __init__(self):
-        self.pattern_clusters: Dict[str, List[str]] = defaultdict(list)
-        self.owner_fingerprint_cache: Dict[str, str] = {}
-    
+
+    def __init__(self, max_members: int = 32, max_clusters: int = 1024):
+        self.max_members = max_members
+        self.max_clusters = max_clusters
+
+        self.clusters: Dict[str, Dict[str, PatternCluster]] = {family: {} for family in CLUSTER_FAMILIES}
+        self.frequency = CountMinSketch()
+        self.cardinality = {family: HyperLogLog() for family in CLUSTER_FAMILIES}
+        self._floor = {family: 0 for family in CLUSTER_FAMILIES}
+
+        # IPFS prefix / full hash -> certificate ID, or a cluster once repeated
+        self.content_prefixes: Dict[str, Union[str, PatternCluster]] = {}
+        self.content_hashes: Dict[str, Union[str, PatternCluster]] = {}
+
     def learn_from_certificate(self, cert_node: SKGNode, owner_node: SKGNode, chain_node: SKGNode):
         """
         Extract patterns and cluster similar certificates.
         """
-        
+        cert_id = cert_node.node_id
+
         # Pattern 1: Wallet ownership frequency
         wallet_hash = self._hash_wallet_behavior(owner_node)
-        self.pattern_clusters[f"wallet_behavior:{wallet_hash}"].append(cert_node.node_id)
-        
+        self._observe("wallet_behavior", wallet_hash, cert_id)
+
         # Pattern 2: IPFS storage pattern (detects duplicate content)
-        ipfs_pattern = cert_node.properties['ipfs_hash'][:16]  # First 16 chars
-        self.pattern_clusters[f"ipfs_prefix:{ipfs_pattern}"].append(cert_node.node_id)
-        
+        ipfs_hash = cert_node.properties['ipfs_hash']
+        self._index_content(self.content_prefixes, ipfs_hash[:16], cert_id)  # First 16 chars
+        self._index_content(self.content_hashes, ipfs_hash, cert_id)
+
         # Pattern 3: Temporal issuance pattern
         hour_bucket = cert_node.properties['minted_at'][:13]  # YYYY-MM-DDTHH
-        self.pattern_clusters[f"issuance_hour:{hour_bucket}"].append(cert_node.node_id)
-        
+        self._observe("issuance_hour", hour_bucket, cert_id)
+
         # Pattern 4: Chain activity pattern
         chain_id = chain_node.properties['chain_id']
-        self.pattern_clusters[f"chain_activity:{chain_id}"].append(cert_node.node_id)
-    
+        self._observe("chain_activity", chain_id, cert_id)
+
+    def _observe(self, family: str, value: str, cert_id: str):
+        """Count ``value`` and keep its cluster if it is among the most frequent."""
+        estimate = self.frequency.add(f"{family}:{value}")
+        self.cardinality[family].add(value)
+
+        tracked = self.clusters[family]
+        cluster = tracked.get(value)
+        if cluster is None:
+            if len(tracked) >= self.max_clusters:
+                # Counts only grow, so the last eviction's count is a lower bound
+                if estimate <= self._floor[family]:
+                    return
+                victim = min(tracked, key=lambda v: tracked[v].count)
+                self._floor[family] = tracked[victim].count
+                if tracked[victim].count >= estimate:
+                    return
+                del tracked[victim]
+            cluster = tracked[value] = PatternCluster(estimate - 1)
+        cluster.add(cert_id, self.max_members)
+
+    def _index_content(self, index: Dict[str, Union[str, PatternCluster]], key: str, cert_id: str):
+        existing = index.get(key)
+        if existing is None:
+            index[key] = cert_id
+        else:
+            if not isinstance(existing, PatternCluster):
+                existing = index[key] = PatternCluster(1, [existing])
+            existing.add(cert_id, self.max_members)
+
     def _hash_wallet_behavior(self, owner_node: SKGNode) -> str:
         """
         Create behavior fingerprint from wallet metadata.
         """
         wallet = owner_node.properties["wallet_address"]
         name = owner_node.properties["owner_name"]
-        
+
         # Simple behavioral hash (expand with transaction history)
         behavior_string = f"{wallet}:{name}"
         return hashlib.md5(behavior_string.encode()).hexdigest()[:8]
-    
-    def detect_duplicates(self, cert_node: SKGNode) -> Set[str]:
+
+    def _content_entry(self, cert_node: SKGNode, exact: bool) -> Union[str, PatternCluster, None]:
+        ipfs_hash = cert_node.properties['ipfs_hash']
+        if exact:
+            return self.content_hashes.get(ipfs_hash)
+        return self.content_prefixes.get(ipfs_hash[:16])
+
+    def detect_duplicates(self, cert_node: SKGNode, exact: bool = False) -> Set[str]:
         """
-        Check if this certificate is a duplicate of existing ones.
+        Check if this certificate is a duplicate of existing ones: certificates
+        sharing its IPFS prefix, or its full IPFS hash with ``exact``. At most
+        ``max_members`` IDs are returned; see ``duplicate_count`` for the total.
         """
-        duplicates = set()
-        ipfs_hash = cert_node.properties['ipfs_hash']
-        
-        for pattern_key, cert_ids in self.pattern_clusters.items():
-            if pattern_key.startswith("ipfs_prefix:") and ipfs_hash[:16] in pattern_key:
-                duplicates.update(cert_ids)
-        
-        return duplicates
-    
-    def get_cluster_count(self) -> dict:
-        """Return pattern cluster statistics."""
+        entry = self._content_entry(cert_node, exact)
+        if entry is None:
+            return set()
+        if isinstance(entry, PatternCluster):
+            return set(entry.members)
+        return {entry}
+
+    def duplicate_count(self, cert_node: SKGNode, exact: bool = False) -> int:
+        """Number of learned certificates sharing this certificate's IPFS content."""
+        entry = self._content_entry(cert_node, exact)
+        if entry is None:
+            return 0
+        return entry.count if isinstance(entry, PatternCluster) else 1
+
+    def cluster_frequency(self, family: str, value: str) -> int:
+        """Certificates in a cluster: exact if tracked, else a count-min estimate."""
+        cluster = self.clusters[family].get(value)
+        if cluster is not None:
+            return cluster.count
+        return self.frequency.estimate(f"{family}:{value}")
+
+    def top_clusters(self, family: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Most frequent tracked clusters of a family as (value, count)."""
+        tracked = self.clusters[family]
+        ranked = sorted(tracked.items(), key=lambda item: item[1].count, reverse=True)
+        return [(value, cluster.count) for value, cluster in ranked[:limit]]
+
+    def get_cluster_count(self, recompute: bool = False) -> dict:
+        """
+        Return pattern cluster statistics (family counts are HyperLogLog
+        estimates). O(1) unless ``recompute``, which rescans the registers.
+        """
+        distinct = {family: self.cardinality[family].count(recompute) for family in CLUSTER_FAMILIES}
         return {
-            "total_clusters": len(self.pattern_clusters),
-            "wallet_behavior_clusters": len([k for k in self.pattern_clusters if k.startswith("wallet_behavior:")]),
-            "ipfs_clusters": len([k for k in self.pattern_clusters if k.startswith("ipfs_prefix:")]),
-            "temporal_clusters": len([k for k in self.pattern_clusters if k.startswith("issuance_hour:")])
-        }
\ No newline at end of file
+            "total_clusters": sum(distinct.values()) + len(self.content_prefixes),
+            "wallet_behavior_clusters": distinct["wallet_behavior"],
+            "ipfs_clusters": len(self.content_prefixes),
+            "temporal_clusters": distinct["issuance_hour"],
+            "chain_clusters": distinct["chain_activity"],
+            "tracked_clusters": sum(len(tracked) for tracked in self.clusters.values())
+        }
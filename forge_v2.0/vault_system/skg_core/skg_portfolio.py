@@ -0,0 +1,149 @@
+# skg_portfolio.py
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class Portfolio:
+    """A wallet's certificates plus the running drift aggregates over them."""
+
+    __slots__ = ("wallet_address", "version", "certificates", "serials", "drift_sum", "highest", "nbytes")
+
+    def __init__(self, wallet_address: str, version: int, certificates: List[Dict[str, Any]]):
+        self.wallet_address = wallet_address
+        self.version = version
+        self.certificates = certificates
+        self.serials = {c['certificate'].get('dals_serial') for c in certificates}
+        self.drift_sum = 0.0
+        self.highest = None
+        for certificate in certificates:
+            self._aggregate(certificate)
+        # Cached rows reference the graph's property dicts, so only the
+        # rows and the list itself count against the cache budget
+        self.nbytes = sys.getsizeof(certificates) + sum(map(sys.getsizeof, certificates))
+
+    def _aggregate(self, certificate: Dict[str, Any]):
+        drift = certificate['certificate'].get('drift_score', 0)
+        self.drift_sum += drift
+        if self.highest is None or drift > self.highest['certificate'].get('drift_score', 0):
+            self.highest = certificate
+
+    def add(self, certificate: Dict[str, Any]):
+        self.certificates.append(certificate)
+        self.serials.add(certificate['certificate'].get('dals_serial'))
+        self._aggregate(certificate)
+        self.nbytes += sys.getsizeof(certificate) + 8
+
+    def to_dict(self) -> dict:
+        count = len(self.certificates)
+        return {
+            "wallet_address": self.wallet_address,
+            "certificate_count": count,
+            "certificates": list(self.certificates),
+            "drift_analysis": {
+                "average_drift": self.drift_sum / count if count else 0,
+                "highest_drift_certificate": self.highest
+            }
+        }
+
+
+class PortfolioCache:
+    """
+    LRU cache of owner portfolios bounded by an approximate memory budget.
+
+    Entries are validated against ``engine.wallet_version``: any ingest or
+    patch touching the wallet makes the entry stale, and it is rebuilt from
+    the graph on the next read. Ingests seen by ``on_certificate_ingested``
+    are folded into a current entry instead, so a holder's dashboard stays
+    warm while it keeps minting.
+    """
+
+    def __init__(self, engine, max_bytes: int = 64 * 1024 * 1024):
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.entries: "OrderedDict[str, Portfolio]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "updates": 0, "invalidations": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def get(self, wallet_address: str) -> dict:
+        """Portfolio for a wallet, served from cache when current."""
+        version = self.engine.wallet_version(wallet_address)
+        with self._lock:
+            entry = self.entries.get(wallet_address)
+            if entry is not None and entry.version == version:
+                self.entries.move_to_end(wallet_address)
+                self.stats["hits"] += 1
+                return entry.to_dict()
+            self.stats["misses"] += 1
+
+        # Read the version first: a change racing the rebuild leaves it stale
+        entry = Portfolio(wallet_address, version, self.engine.query_by_wallet(wallet_address))
+        with self._lock:
+            self._store(entry)
+        return entry.to_dict()
+
+    def on_certificate_ingested(self, wallet_address: str, certificate: Dict[str, Any]):
+        """
+        Fold a just-ingested certificate row ({"certificate", "ownership"})
+        into the wallet's entry. Only applies if the ingest was the single
+        change since the entry was built; otherwise the entry is dropped.
+        """
+        version = self.engine.wallet_version(wallet_address)
+        with self._lock:
+            entry = self.entries.get(wallet_address)
+            if entry is None:
+                return
+            # An entry already holding the certificate was rebuilt mid-ingest,
+            # after the node was published but before the version bump
+            if entry.version == version - 1 and certificate['certificate'].get('dals_serial') not in entry.serials:
+                self.nbytes -= entry.nbytes
+                entry.add(certificate)
+                entry.version = version
+                self.nbytes += entry.nbytes
+                self.stats["updates"] += 1
+                self._evict()
+            elif entry.version != version:
+                self._drop(wallet_address)
+                self.stats["invalidations"] += 1
+
+    def invalidate(self, wallet_address: Optional[str] = None):
+        """Drop one wallet's entry, or every entry."""
+        with self._lock:
+            if wallet_address is None:
+                self.stats["invalidations"] += len(self.entries)
+                self.entries.clear()
+                self.nbytes = 0
+            elif wallet_address in self.entries:
+                self._drop(wallet_address)
+                self.stats["invalidations"] += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self.entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+            }
+
+    def _store(self, entry: Portfolio):
+        if entry.wallet_address in self.entries:
+            self._drop(entry.wallet_address)
+        if entry.nbytes > self.max_bytes:
+            return    # larger than the whole budget; serve uncached
+        self.entries[entry.wallet_address] = entry
+        self.nbytes += entry.nbytes
+        self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self.entries:
+            _, entry = self.entries.popitem(last=False)
+            self.nbytes -= entry.nbytes
+            self.stats["evictions"] += 1
+
+    def _drop(self, wallet_address: str):
+        self.nbytes -= self.entries.pop(wallet_address).nbytes
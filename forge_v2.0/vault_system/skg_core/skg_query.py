@@ -0,0 +1,357 @@
+# skg_query.py
+import base64
+import json
+from bisect import bisect_left
+from collections.abc import Sequence
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from skg_node import SKGNode, SKGNodeType
+
+
+class SortedKeys:
+    """
+    Distinct values of one property in sorted order, for prefix range scans.
+
+    A large sorted list plus a small sorted overflow that new values are
+    inserted into; the overflow is merged in once it grows, so no insert
+    shifts the large list. Removed values are skipped by ``prefix`` and
+    dropped at the next merge.
+    """
+
+    OVERFLOW = 4096
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self._recent: List[str] = []
+        self._removed: set = set()
+
+    def add(self, key: str):
+        self._removed.discard(key)
+        if _sorted_contains(self.keys, key):
+            return
+        index = bisect_left(self._recent, key)
+        if index < len(self._recent) and self._recent[index] == key:
+            return
+        self._recent.insert(index, key)
+        if len(self._recent) > self.OVERFLOW:
+            self._merge()
+
+    def discard(self, key: str):
+        index = bisect_left(self._recent, key)
+        if index < len(self._recent) and self._recent[index] == key:
+            del self._recent[index]
+        elif _sorted_contains(self.keys, key):
+            self._removed.add(key)
+            if len(self._removed) > self.OVERFLOW:
+                self._merge()
+
+    def prefix(self, prefix: str) -> List[str]:
+        """Keys starting with ``prefix``, sorted."""
+        matches = [key for key in _prefix_range(self.keys, prefix) if key not in self._removed]
+        recent = _prefix_range(self._recent, prefix)
+        return sorted(matches + recent) if recent else matches
+
+    def _merge(self):
+        # Two sorted runs: timsort merges them in linear time
+        keys = [key for key in self.keys if key not in self._removed] if self._removed else self.keys
+        self.keys = sorted(keys + self._recent)
+        self._recent = []
+        self._removed.clear()
+
+
+def _sorted_contains(keys: List[str], key: str) -> bool:
+    index = bisect_left(keys, key)
+    return index < len(keys) and keys[index] == key
+
+
+def _prefix_range(keys: List[str], prefix: str) -> List[str]:
+    start = end = bisect_left(keys, prefix)
+    while end < len(keys) and keys[end].startswith(prefix):
+        end += 1
+    return keys[start:end]
+
+
+class Prefix:
+    """Filter value matching strings that start with ``prefix``."""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+
+    def __call__(self, value: Any) -> bool:
+        return isinstance(value, str) and value.startswith(self.prefix)
+
+    def __repr__(self) -> str:
+        return f"Prefix({self.prefix!r})"
+
+
+class NodePattern:
+    """One node position in a path pattern: alias, optional type and filters."""
+
+    def __init__(self, alias: str, node_type: Optional[SKGNodeType], filters: Dict[str, Any]):
+        self.alias = alias
+        self.node_type = node_type
+        self.filters = filters
+
+    def matches(self, node: Optional[SKGNode]) -> bool:
+        if node is None or (self.node_type is not None and node.node_type != self.node_type):
+            return False
+        for prop, expected in self.filters.items():
+            value = node.properties.get(prop)
+            if callable(expected):
+                if not expected(value):
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+
+class PatternQuery:
+    """
+    Path pattern over the SKG, e.g. certificates on chain X owned by wallets
+    that also hold a category Y certificate::
+
+        engine.query() \\
+            .match("held", SKGNodeType.CERTIFICATE, kep_category="Y") \\
+            .out("OWNED_BY", "owner", SKGNodeType.IDENTITY) \\
+            .in_("OWNED_BY", "cert", SKGNodeType.CERTIFICATE) \\
+            .out("ANCHORED_ON", "chain", SKGNodeType.CHAIN, chain_id="X") \\
+            .distinct("cert")
+
+    The planner anchors the walk at the step with the fewest candidates (an
+    exact match on an indexed property, a ``Prefix`` range on a sorted key
+    index, or a node type) and expands outwards along the adjacency lists in
+    both directions, testing filters as each node is bound. Results are generated lazily; ``page()`` returns a
+    cursor that resumes the walk where the previous page stopped.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.steps: List[NodePattern] = []
+        self.hops: List[Tuple[str, str]] = []    # (edge type, "out" | "in") between steps
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def match(self, alias: str, node_type: Optional[SKGNodeType] = None, **filters) -> "PatternQuery":
+        if self.steps:
+            raise ValueError("match() starts a pattern; use out()/in_() to extend it")
+        self.steps.append(NodePattern(alias, node_type, filters))
+        return self
+
+    def out(self, edge_type: str, alias: str, node_type: Optional[SKGNodeType] = None, **filters) -> "PatternQuery":
+        return self._hop(edge_type, "out", alias, node_type, filters)
+
+    def in_(self, edge_type: str, alias: str, node_type: Optional[SKGNodeType] = None, **filters) -> "PatternQuery":
+        return self._hop(edge_type, "in", alias, node_type, filters)
+
+    def _hop(self, edge_type, direction, alias, node_type, filters) -> "PatternQuery":
+        if not self.steps:
+            raise ValueError("Start the pattern with match()")
+        self.hops.append((edge_type, direction))
+        self.steps.append(NodePattern(alias, node_type, filters))
+        return self
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def plan(self) -> dict:
+        """Anchor step, the index it is read from, and the walk order."""
+        anchor, source, estimate, order = self._plan()
+        return {
+            "anchor": self.steps[anchor].alias,
+            "source": source,
+            "estimate": estimate,
+            "order": [self.steps[i].alias for i in order]
+        }
+
+    def _plan(self) -> Tuple[int, str, int, List[int]]:
+        best = None
+        for position, step in enumerate(self.steps):
+            source, estimate = self._anchor_source(step)
+            if best is None or estimate < best[2]:
+                best = (position, source, estimate)
+
+        anchor, source, estimate = best
+        order = list(range(anchor, len(self.steps))) + list(range(anchor - 1, -1, -1))
+        return anchor, source, estimate, order
+
+    def _anchor_source(self, step: NodePattern) -> Tuple[str, int]:
+        engine = self.engine
+        candidates = [
+            (len(engine.property_index[prop].get(value, ())), f"property_index[{prop}]")
+            for prop, value in step.filters.items()
+            if prop in engine.property_index and not callable(value)
+        ]
+        candidates += [
+            (sum(len(engine.property_index[prop].get(key, ())) for key in engine.prefix_index[prop].prefix(value.prefix)),
+             f"prefix_index[{prop}]")
+            for prop, value in step.filters.items()
+            if prop in engine.prefix_index and isinstance(value, Prefix)
+        ]
+        if step.node_type is not None:
+            candidates.append((len(engine.nodes_by_type.get(step.node_type, ())),
+                               f"nodes_by_type[{step.node_type.value}]"))
+        estimate, source = min(candidates, default=(len(engine.nodes), "nodes"))
+        return source, estimate
+
+    def _anchor_candidates(self, step: NodePattern, source: str) -> Iterable[str]:
+        engine = self.engine
+        if source.startswith("property_index["):
+            prop = source[len("property_index["):-1]
+            return engine.property_index[prop].get(step.filters[prop], ())
+        if source.startswith("prefix_index["):
+            prop = source[len("prefix_index["):-1]
+            bucket = engine.property_index[prop]
+            return (node_id for key in engine.prefix_index[prop].prefix(step.filters[prop].prefix)
+                    for node_id in bucket.get(key, ()))
+        if source.startswith("nodes_by_type["):
+            return engine.nodes_by_type.get(step.node_type, {})
+        return engine.nodes
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def run(self, cursor: Optional[str] = None) -> Iterator[Dict[str, SKGNode]]:
+        """Stream matches as {alias: node}, optionally resuming from a cursor."""
+        for match, _ in self._walk(cursor):
+            yield match
+
+    def page(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Dict[str, SKGNode]], Optional[str]]:
+        """Up to ``limit`` matches plus the cursor for the next page (None when done)."""
+        results, next_cursor = [], None
+        for match, position in self._walk(cursor):
+            if len(results) == limit:
+                next_cursor = position
+                break
+            results.append(match)
+        return results, next_cursor
+
+    def distinct(self, alias: str) -> Iterator[SKGNode]:
+        """Distinct nodes bound to ``alias``; memory grows with the distinct count only."""
+        seen = set()
+        for match in self.run():
+            node = match[alias]
+            if node.node_id not in seen:
+                seen.add(node.node_id)
+                yield node
+
+    def _walk(self, cursor: Optional[str]) -> Iterator[Tuple[Dict[str, SKGNode], str]]:
+        """
+        Depth-first walk in plan order. Each level iterates a candidate
+        sequence (anchor index bucket, then adjacency lists). A position is
+        the plan plus, per level, the bound node ID and its index in the
+        sequence; the cursor encodes it, so a resumed walk keeps the plan it
+        started with and finds its place by node ID even if entries before
+        it were removed (the index is only a hint).
+        """
+        if not self.steps:
+            return
+        if cursor:
+            anchor, source, resume = _decode_cursor(cursor)
+            order = list(range(anchor, len(self.steps))) + list(range(anchor - 1, -1, -1))
+        else:
+            anchor, source, _, order = self._plan()
+            resume = None
+        steps, nodes = self.steps, self.engine.nodes
+        bound: Dict[int, SKGNode] = {}
+        path: List[Tuple[int, str]] = []
+
+        def candidates(level: int) -> Iterable[str]:
+            position = order[level]
+            if level == 0:
+                return self._anchor_candidates(steps[position], source)
+            if position > order[0]:
+                edge_type, direction = self.hops[position - 1]
+                return self._neighbours(bound[position - 1].node_id, edge_type, direction)
+            edge_type, direction = self.hops[position]
+            return self._neighbours(bound[position + 1].node_id, edge_type,
+                                    "in" if direction == "out" else "out")
+
+        def descend(level: int, resuming: bool) -> Iterator[Tuple[Dict[str, SKGNode], str]]:
+            position = order[level]
+            sequence = candidates(level)
+            if resuming:
+                hint, resume_id = resume[level]
+                entries, found = _seek(sequence, hint, resume_id)
+            else:
+                entries, found = enumerate(sequence), False
+            for index, node_id in entries:
+                node = nodes.get(node_id)
+                if steps[position].matches(node):
+                    bound[position] = node
+                    path.append((index, node_id))
+                    if level + 1 == len(order):
+                        yield ({steps[i].alias: bound[i] for i in range(len(steps))},
+                               _encode_cursor(anchor, source, path))
+                    else:
+                        # Only the node the cursor stopped in resumes deeper levels
+                        yield from descend(level + 1, found and level + 1 < len(resume))
+                    path.pop()
+                found = False
+
+        yield from descend(0, resume is not None)
+
+    def _neighbours(self, node_id: str, edge_type: str, direction: str) -> "_EdgeEnds":
+        engine = self.engine
+        adjacency = engine.outgoing if direction == "out" else engine.incoming
+        return _EdgeEnds(engine.edges, adjacency.get(node_id, {}).get(edge_type, ()), direction == "out")
+
+
+class _EdgeEnds(Sequence):
+    """Far ends of an adjacency list, read lazily so a resumed walk can index it."""
+
+    def __init__(self, edges, edge_ids: Sequence, outgoing: bool):
+        self.edges = edges
+        self.edge_ids = edge_ids
+        self.outgoing = outgoing
+
+    def __len__(self) -> int:
+        return len(self.edge_ids)
+
+    def __getitem__(self, index: int) -> str:
+        edge = self.edges[self.edge_ids[index]]
+        return edge.target_id if self.outgoing else edge.source_id
+
+
+def _encode_cursor(anchor: int, source: str, path: List[Tuple[int, str]]) -> str:
+    return base64.urlsafe_b64encode(json.dumps([anchor, source, path], separators=(",", ":")).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, str, List[Tuple[int, str]]]:
+    try:
+        anchor, source, path = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(anchor), str(source), [(int(index), str(node_id)) for index, node_id in path]
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Invalid query cursor: {cursor!r}") from error
+
+
+def _seek(sequence: Iterable[str], hint: int, node_id: str) -> Tuple[Iterator[Tuple[int, str]], bool]:
+    """
+    (index, node ID) pairs of ``sequence`` from the entry ``node_id``, plus
+    whether it was found. Candidate sequences only lose entries or gain them
+    at the end, so the entry is at ``hint`` or earlier; if it is gone the
+    walk resumes at ``hint``, where its successor moved to.
+    """
+    if isinstance(sequence, Sequence):
+        index = min(hint, len(sequence) - 1)
+        while index >= 0 and sequence[index] != node_id:
+            index -= 1
+        found = index >= 0
+        start = index if found else min(hint, len(sequence))
+        return ((i, sequence[i]) for i in range(start, len(sequence))), found
+
+    iterator = iter(sequence)
+    if iterator is not sequence:
+        # Re-iterable (dict keys): jump to the hint without a Python loop
+        entry = next(islice(iterator, hint, None), None)
+        if entry == node_id:
+            return enumerate(chain((entry,), iterator), hint), True
+        iterator = iter(sequence)
+    for index, entry in enumerate(iterator):
+        if entry == node_id or index == hint:
+            return enumerate(chain((entry,), iterator), index), entry == node_id
+    return iter(()), False
@@ -0,0 +1,206 @@
+# skg_rescore.py
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Add skg_core to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python scoring fallback
+    np = None
+
+from skg_node import SKGNode, SKGNodeType, NO_TIMESTAMP, stardate_to_micros
+
+FEATURE_COLUMNS = ("issued_at", "signature_length", "key_length", "hex_valid", "ipfs_scheme", "cid_length")
+
+
+def _is_hex(value: str) -> bool:
+    try:
+        int(value, 16)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def extract_drift_features(cert_nodes: Iterable[SKGNode]) -> Dict[str, list]:
+    """
+    One column per drift input, in the order given. ``issued_at`` is epoch
+    seconds (NaN when the stardate does not parse); lengths are 0 for
+    missing signature material.
+    """
+    columns = {name: [] for name in FEATURE_COLUMNS}
+    issued_at, signature_length, key_length, hex_valid, ipfs_scheme, cid_length = columns.values()
+    parsed: Dict[str, float] = {}    # stardates have minute resolution and repeat
+
+    for node in cert_nodes:
+        properties = node.properties
+        stardate = properties.get('minted_at', '')
+        seconds = parsed.get(stardate)
+        if seconds is None:
+            micros = stardate_to_micros(stardate)
+            seconds = parsed[stardate] = float("nan") if micros == NO_TIMESTAMP else micros / 1_000_000
+        issued_at.append(seconds)
+
+        signature = properties.get('ed25519_signature') or ''
+        verifying_key = properties.get('verifying_key') or ''
+        signature_length.append(len(signature))
+        key_length.append(len(verifying_key))
+        hex_valid.append(_is_hex(signature) and _is_hex(verifying_key))
+
+        ipfs_hash = properties.get('ipfs_hash', '')
+        ipfs_scheme.append(ipfs_hash.startswith('ipfs://'))
+        cid_length.append(len(ipfs_hash.replace('ipfs://', '')))
+
+    return columns
+
+
+def score_drift(features: Dict[str, list], baseline_interval: float):
+    """
+    Drift scores for extracted features, matching ``SKGDriftAnalyzer`` for a
+    fixed issuance baseline: temporal drift is measured against the previous
+    certificate with a parseable stardate. Vectorized with NumPy when
+    available; returns an array (or a list without NumPy).
+    """
+    if np is None:
+        return _score_drift_python(features, baseline_interval)
+
+    issued_at = np.asarray(features["issued_at"], dtype=np.float64)
+    count = len(issued_at)
+    valid = ~np.isnan(issued_at)
+
+    # Index of the last parseable stardate strictly before each certificate
+    last_valid = np.maximum.accumulate(np.where(valid, np.arange(count), -1))
+    previous = np.concatenate(([-1], last_valid[:-1])) if count else last_valid
+    interval = issued_at - issued_at[np.maximum(previous, 0)]
+    temporal = np.minimum(np.abs(interval - baseline_interval) / baseline_interval, 1.0)
+    temporal = np.where(previous < 0, 0.0, temporal)
+    temporal = np.where(valid, temporal, 0.5)
+
+    signature_length = np.asarray(features["signature_length"])
+    key_length = np.asarray(features["key_length"])
+    signature = np.select(
+        [(signature_length == 0) | (key_length == 0), signature_length != 128,
+         key_length != 64, ~np.asarray(features["hex_valid"], dtype=bool)],
+        [1.0, 0.8, 0.6, 1.0],
+        0.0
+    )
+
+    cid_length = np.asarray(features["cid_length"])
+    pattern = np.select(
+        [~np.asarray(features["ipfs_scheme"], dtype=bool), cid_length < 40],
+        [0.5, 0.3],
+        0.0
+    )
+
+    return (temporal + signature + pattern) / 3
+
+
+def _score_drift_python(features: Dict[str, list], baseline_interval: float) -> List[float]:
+    scores = []
+    previous = None
+    for issued_at, signature_length, key_length, hex_valid, ipfs_scheme, cid_length in zip(
+            *(features[name] for name in FEATURE_COLUMNS)):
+        if issued_at != issued_at:    # NaN
+            temporal = 0.5
+        else:
+            temporal = 0.0 if previous is None else min(abs(issued_at - previous - baseline_interval) / baseline_interval, 1.0)
+            previous = issued_at
+
+        if not signature_length or not key_length:
+            signature = 1.0
+        elif signature_length != 128:
+            signature = 0.8
+        elif key_length != 64:
+            signature = 0.6
+        else:
+            signature = 0.0 if hex_valid else 1.0
+
+        pattern = 0.5 if not ipfs_scheme else 0.3 if cid_length < 40 else 0.0
+        scores.append((temporal + signature + pattern) / 3)
+    return scores
+
+
+def rescore_drift(engine, baseline_interval: Optional[float] = None, chunk_size: int = 50_000) -> dict:
+    """
+    Re-score every certificate in ``engine`` in ingest order and write the
+    changed ``drift_score`` values back as ``node_patch`` records, one
+    DRIFT_RESCORE transaction per ``chunk_size`` patches. Ingest-time scores
+    are logged with the certificate, so unchanged ones need no record;
+    compaction folds the patches.
+
+    Scoring reads a point-in-time list of certificates without locks (the
+    inputs never change after ingest). Each chunk is then applied and staged
+    under the shard locks of its certificates, re-reading every node there,
+    so it is safe while ingest runs; ingest waits for a chunk at a time.
+    Returns timing and change statistics.
+    """
+    baseline = baseline_interval or engine.drift_analyzer.baseline_metrics['avg_issuance_interval']
+    cert_nodes = [engine.nodes[node_id] for node_id in list(engine.nodes_by_type[SKGNodeType.CERTIFICATE])]
+
+    started = time.perf_counter()
+    features = extract_drift_features(cert_nodes)
+    extracted = time.perf_counter()
+    scores = score_drift(features, baseline)
+    scored = time.perf_counter()
+    if np is not None:
+        scores = scores.tolist()
+
+    rescored = [(node.node_id, score) for node, score in zip(cert_nodes, scores)
+                if node.properties.get("drift_score") != score]
+    changed = 0
+    for start in range(0, len(rescored), chunk_size):
+        chunk = rescored[start:start + chunk_size]
+        with engine._locked(*(node_id for node_id, _ in chunk)):
+            patches = []
+            for node_id, score in chunk:
+                node = engine.nodes.get(node_id)
+                if node is None or node.properties.get("drift_score") == score:
+                    continue
+                patch = {
+                    "record_type": "node_patch",
+                    "node_id": node_id,
+                    "version": node.version + 1,
+                    "properties": {"drift_score": score}
+                }
+                engine.apply_node_patch(patch)
+                patches.append(patch)
+            if patches:
+                engine.serializer.stage_transaction(
+                    nodes=[], edges=[], event_type="DRIFT_RESCORE", node_patches=patches
+                )
+        changed += len(patches)
+        engine.serializer.commit_if_due()
+    engine.flush()
+    finished = time.perf_counter()
+
+    return {
+        "certificates": len(cert_nodes),
+        "changed": changed,
+        "baseline_interval": baseline,
+        "vectorized": np is not None,
+        "extract_seconds": extracted - started,
+        "score_seconds": scored - extracted,
+        "write_seconds": finished - scored,
+        "certificates_per_minute": len(cert_nodes) / max(finished - started, 1e-9) * 60
+    }
+
+
+# CLI Wrapper (run this) - for a stopped worker
+if __name__ == "__main__":
+    import argparse
+
+    from skg_engine import SwarmKnowledgeGraphEngine
+
+    parser = argparse.ArgumentParser(description="Re-score drift for every certificate in a worker's SKG")
+    parser.add_argument("--vault", default="vault_system")
+    parser.add_argument("--worker", default="certificate_forge_worker_001")
+    parser.add_argument("--baseline", type=float, default=None, help="Issuance interval baseline in seconds")
+
+    args = parser.parse_args()
+
+    engine = SwarmKnowledgeGraphEngine(Path(args.vault), args.worker, snapshot_interval=0)
+    print(rescore_drift(engine, args.baseline))
+    engine.close()
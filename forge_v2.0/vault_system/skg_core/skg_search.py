@@ -0,0 +1,321 @@
+# skg_search.py
+import heapq
+import json
+import math
+import os
+import re
+import struct
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Indexed certificate fields and their score weights
+SEARCH_FIELDS = {"asset_title": 2.0, "owner_name": 1.0}
+PREFIX_WEIGHT = 0.5           # relative to an exact token match
+
+MAGIC = b"SKGSRC01"
+U32 = struct.Struct("<I")
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, deduplicated in order."""
+    return list(dict.fromkeys(_TOKEN.findall((text or "").lower())))
+
+
+class SearchIndex:
+    """
+    Tokenized inverted index over certificate titles and owner names.
+
+    Certificates get dense document numbers in index order. A posting is the
+    single document number for a token seen once, or an ``array('I')`` of
+    ascending numbers once repeated. Re-indexing a certificate whose text
+    changed tombstones its old number; once tombstones pass a quarter of the
+    live documents (and ``COMPACT_MIN_DEAD``) the index is renumbered without
+    them, so dead documents stay a bounded share of postings, idf and the
+    saved file. The term vocabulary is a sorted list plus a small unsorted
+    overflow, so prefix lookups are a bisect plus a short scan.
+
+    ``search`` ANDs the query tokens, treating the last one as a prefix while
+    the user is still typing. A document scores, per query token, the best
+    of field weight x match weight x idf over the terms it matched; ties go
+    to the newest certificate. Candidates are walked newest first and the
+    walk stops once ``limit`` documents reach the maximum possible score.
+    """
+
+    MAX_EXPANSIONS = 64       # terms a prefix may expand to
+    OVERFLOW_TERMS = 4096     # unsorted new terms before merging
+    COMPACT_MIN_DEAD = 1024   # tombstones tolerated regardless of index size
+
+    def __init__(self):
+        self.doc_ids: List[Optional[str]] = []
+        self.doc_numbers: Dict[str, int] = {}
+        self.doc_keys = array("Q")    # text fingerprint per document
+        self.live = 0
+        self.postings: Dict[str, Dict[str, Union[int, array]]] = {field: {} for field in SEARCH_FIELDS}
+        self._terms: List[str] = []
+        self._new_terms: set = set()
+        self._lock = threading.Lock()
+        # Log positions of the snapshot this index was saved with (see save)
+        self.positions: Optional[Dict[str, List[int]]] = None
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def add(self, cert_id: str, asset_title: str, owner_name: str) -> bool:
+        """Index (or re-index) a certificate. Returns False if unchanged."""
+        key = zlib.crc32(owner_name.encode(), zlib.crc32(asset_title.encode())) | (len(asset_title) << 32)
+        with self._lock:
+            previous = self.doc_numbers.get(cert_id)
+            if previous is not None and self.doc_keys[previous] == key:
+                return False
+            # Only tokenize once the fingerprint says the text changed
+            fields = [(field, tokenize(text)) for field, text in (("asset_title", asset_title), ("owner_name", owner_name))]
+            if previous is not None:
+                self.doc_ids[previous] = None
+                self.live -= 1
+                self._compact_if_due()
+
+            doc = len(self.doc_ids)
+            self.doc_ids.append(cert_id)
+            self.doc_keys.append(key)
+            self.doc_numbers[cert_id] = doc
+            self.live += 1
+            for field, tokens in fields:
+                postings = self.postings[field]
+                for token in tokens:
+                    posting = postings.get(token)
+                    if posting is None:
+                        postings[token] = doc
+                        self._add_term(token)
+                    elif isinstance(posting, int):
+                        postings[token] = array("I", (posting, doc))
+                    else:
+                        posting.append(doc)
+            return True
+
+    def _compact_if_due(self):
+        if len(self.doc_ids) - self.live > max(self.live // 4, self.COMPACT_MIN_DEAD):
+            self._compact()
+
+    def _compact(self):
+        """
+        Drop tombstoned documents: renumber the live ones densely (keeping
+        their order, so newest-first still holds) and rewrite every posting,
+        dropping terms left without documents.
+        """
+        renumbered = array("i", [-1]) * len(self.doc_ids)
+        doc_ids: List[Optional[str]] = []
+        doc_keys = array("Q")
+        for doc, cert_id in enumerate(self.doc_ids):
+            if cert_id is not None:
+                renumbered[doc] = len(doc_ids)
+                doc_ids.append(cert_id)
+                doc_keys.append(self.doc_keys[doc])
+
+        terms = set()
+        for field, postings in self.postings.items():
+            compacted = {}
+            for term, posting in postings.items():
+                docs = [renumbered[doc] for doc in ((posting,) if isinstance(posting, int) else posting)
+                        if renumbered[doc] >= 0]
+                if docs:
+                    compacted[term] = docs[0] if len(docs) == 1 else array("I", docs)
+                    terms.add(term)
+            self.postings[field] = compacted
+
+        self.doc_ids = doc_ids
+        self.doc_keys = doc_keys
+        self.doc_numbers = {cert_id: doc for doc, cert_id in enumerate(doc_ids)}
+        self._terms = sorted(terms)
+        self._new_terms.clear()
+
+    def _add_term(self, term: str):
+        if term in self._new_terms:
+            return
+        index = bisect_left(self._terms, term)
+        if index < len(self._terms) and self._terms[index] == term:
+            return
+        self._new_terms.add(term)
+        if len(self._new_terms) > self.OVERFLOW_TERMS:
+            # Nearly sorted input: timsort merges the runs in linear time
+            self._terms = sorted(self._terms + sorted(self._new_terms))
+            self._new_terms.clear()
+
+    def __contains__(self, cert_id: str) -> bool:
+        return cert_id in self.doc_numbers
+
+    def __len__(self) -> int:
+        return self.live
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Ranked (certificate ID, score) pairs matching every query token."""
+        tokens = tokenize(query)
+        if not tokens or limit <= 0:
+            return []
+        typing = not query[-1:].isspace()
+
+        with self._lock:
+            clauses = []
+            for position, token in enumerate(tokens):
+                terms = self._expand(token) if typing and position == len(tokens) - 1 else [token]
+                clause = self._clause(token, terms)
+                if not clause:
+                    return []
+                clauses.append(clause)
+
+            # Drive the walk from the clause with the fewest postings
+            clauses.sort(key=lambda clause: sum(_posting_len(posting) for _, posting in clause))
+            ceiling = sum(clause[0][0] for clause in clauses)
+
+            ranked: List[Tuple[float, int]] = []
+            perfect = 0
+            for doc in _descending_union([posting for _, posting in clauses[0]]):
+                if self.doc_ids[doc] is None:
+                    continue
+                score = 0.0
+                for clause in clauses:
+                    weight = next((w for w, posting in clause if _posting_contains(posting, doc)), None)
+                    if weight is None:
+                        break
+                    score += weight
+                else:
+                    entry = (score, doc)
+                    if len(ranked) < limit:
+                        heapq.heappush(ranked, entry)
+                    elif entry > ranked[0]:
+                        heapq.heapreplace(ranked, entry)
+                    # Newest first: once ``limit`` docs hit the ceiling nothing can outrank them
+                    perfect += score >= ceiling - 1e-12
+                    if perfect >= limit:
+                        break
+
+            return [(self.doc_ids[doc], score) for score, doc in sorted(ranked, reverse=True)]
+
+    def _expand(self, prefix: str) -> List[str]:
+        terms = []
+        index = bisect_left(self._terms, prefix)
+        while index < len(self._terms) and len(terms) < self.MAX_EXPANSIONS:
+            term = self._terms[index]
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+            index += 1
+        terms.extend(t for t in self._new_terms if t.startswith(prefix))
+        terms.sort(key=lambda term: (term != prefix, len(term), term))
+        return terms[:self.MAX_EXPANSIONS]
+
+    def _clause(self, token: str, terms: List[str]) -> List[Tuple[float, Union[int, array]]]:
+        """(weight, posting) per matching term and field, best weight first."""
+        documents = max(self.live, 1)
+        clause = []
+        for field, field_weight in SEARCH_FIELDS.items():
+            postings = self.postings[field]
+            for term in terms:
+                posting = postings.get(term)
+                if posting is None:
+                    continue
+                idf = math.log(1 + documents / _posting_len(posting))
+                clause.append((field_weight * (1.0 if term == token else PREFIX_WEIGHT) * idf, posting))
+        clause.sort(key=lambda entry: entry[0], reverse=True)
+        return clause
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path, positions: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Atomically write the index: a JSON header (documents, vocabulary,
+        posting offsets, and the log ``positions`` of the snapshot it is
+        saved with, which it covers at least up to), then every posting as
+        little-endian uint32s and the document fingerprints as uint64s. The
+        lock is only held while the arrays are copied (and any due tombstone
+        compaction runs).
+        """
+        with self._lock:
+            self._compact_if_due()
+            header = {"doc_ids": list(self.doc_ids), "fields": {},
+                      "positions": {kind: list(position) for kind, position in positions.items()} if positions else None}
+            blobs, offset = [], 0
+            for field, postings in self.postings.items():
+                entries = header["fields"][field] = []
+                for term, posting in postings.items():
+                    data = array("I", (posting,)) if isinstance(posting, int) else posting
+                    blobs.append(data.tobytes())
+                    entries.append((term, offset, len(data)))
+                    offset += len(data)
+            keys = self.doc_keys.tobytes()
+
+        meta = json.dumps(header, separators=(",", ":")).encode()
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC + U32.pack(len(meta)) + meta)
+            for blob in blobs:
+                f.write(blob)
+            f.write(keys)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SearchIndex":
+        """Read an index written by ``save``; an empty index if absent or unreadable."""
+        index = cls()
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return index
+        if data[:len(MAGIC)] != MAGIC:
+            return index
+
+        (meta_len,) = U32.unpack_from(data, len(MAGIC))
+        start = len(MAGIC) + U32.size
+        header = json.loads(data[start:start + meta_len])
+        start += meta_len
+
+        words = array("I")
+        total = sum(count for entries in header["fields"].values() for _, _, count in entries)
+        words.frombytes(data[start:start + 4 * total])
+        index.doc_keys.frombytes(data[start + 4 * total:])
+
+        index.doc_ids = header["doc_ids"]
+        index.positions = header.get("positions")
+        index.doc_numbers = {cert_id: doc for doc, cert_id in enumerate(index.doc_ids) if cert_id is not None}
+        index.live = len(index.doc_numbers)
+        terms = set()
+        for field, entries in header["fields"].items():
+            postings = index.postings[field]
+            for term, offset, count in entries:
+                postings[term] = words[offset] if count == 1 else words[offset:offset + count]
+                terms.add(term)
+        index._terms = sorted(terms)
+        return index
+
+
+def _posting_len(posting: Union[int, array]) -> int:
+    return 1 if isinstance(posting, int) else len(posting)
+
+
+def _posting_contains(posting: Union[int, array], doc: int) -> bool:
+    if isinstance(posting, int):
+        return posting == doc
+    index = bisect_left(posting, doc)
+    return index < len(posting) and posting[index] == doc
+
+
+def _descending_union(postings: List[Union[int, array]]) -> Iterator[int]:
+    """Distinct document numbers across postings, newest first."""
+    streams = [(posting,) if isinstance(posting, int) else reversed(posting) for posting in postings]
+    previous = None
+    for doc in heapq.merge(*streams, reverse=True):
+        if doc != previous:
+            previous = doc
+            yield doc
@@ -1,9 +1,96 @@
 # skg_serializer.py
+import gzip
 import json
+import os
+import struct
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from statistics import median
+from typing import Callable, Collection, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
-from skg_node import SKGNode, SKGEdge
+from skg_node import SKGNode, SKGEdge, iso_to_micros, micros_to_iso, now_micros
+from segmented_log import SegmentedLog
+from skg_binary_snapshot import MappedGraphSnapshot, write_binary_snapshot
+from skg_compactor import RECORD_KEYS, compact_log
+
+def transaction_micros(transaction_id: str) -> int:
+    """Commit time embedded in ``SKG_TXN_{worker}_{micros}``."""
+    return int(transaction_id.rsplit("_", 1)[1])
+
+
+def to_micros(value: Union[int, str, datetime]) -> int:
+    """Epoch microseconds from an int, ISO-8601 string or naive UTC datetime."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return iso_to_micros(value)
+
+
+class SparseTimeIndex:
+    """
+    Sparse transaction-time → (segment, offset) index over the transactions
+    log, one entry per ~INTERVAL_BYTES of log plus one per segment. Entries
+    are fixed-width and appended as batches commit; on open, entries past the
+    end of the log are dropped and the unindexed tail is scanned.
+    """
+    
+    ENTRY = struct.Struct("<qQQ")  # micros, segment, offset
+    INTERVAL_BYTES = 64 * 1024
+    
+    def __init__(self, path: Path, log: SegmentedLog):
+        self.path = path
+        self.micros: List[int] = []
+        self.positions: List[Tuple[int, int]] = []
+        self._since_entry = 0
+        
+        end = (log.hot_segment, log.hot_size)
+        if path.exists():
+            data = path.read_bytes()
+            usable = len(data) - len(data) % self.ENTRY.size
+            for micros, segment, offset in self.ENTRY.iter_unpack(data[:usable]):
+                if (segment, offset) >= end:
+                    break
+                self.micros.append(micros)
+                self.positions.append((segment, offset))
+            if len(self.micros) * self.ENTRY.size != len(data):
+                with open(path, "r+b") as f:
+                    f.truncate(len(self.micros) * self.ENTRY.size)
+        
+        self._file = open(path, "ab")
+        start_segment, start_offset = self.positions[-1] if self.positions else (None, 0)
+        self.last_micros = self.micros[-1] if self.micros else 0
+        for segment, offset, line in log.iter_lines(start_segment, start_offset):
+            self.note(transaction_micros(json.loads(line)["transaction_id"]), segment, offset, len(line))
+        self._file.flush()
+    
+    def note(self, micros: int, segment: int, offset: int, length: int):
+        """Register a transaction record; writes an entry when one is due."""
+        if (not self.positions or segment != self.positions[-1][0]
+                or self._since_entry >= self.INTERVAL_BYTES):
+            if not self.positions or (segment, offset) > self.positions[-1]:
+                self.micros.append(micros)
+                self.positions.append((segment, offset))
+                self._file.write(self.ENTRY.pack(micros, segment, offset))
+            self._since_entry = 0
+        self._since_entry += length
+        self.last_micros = max(self.last_micros, micros)
+    
+    def seek(self, micros: int) -> Tuple[Optional[int], int]:
+        """Position at or before the first transaction at ``micros``."""
+        i = bisect_right(self.micros, micros - 1) - 1
+        return self.positions[i] if i >= 0 else (None, 0)
+    
+    def flush(self):
+        self._file.flush()
+    
+    def close(self):
+        self._file.close()
+
 
 class SKGSerializer:
     """
@@ -11,92 +98,464 @@ class SKGSerializer:
     Enables historical replay and Caleon ingestion.
     """
     
-    def __init__(self, vault_path: Path, worker_id: str):
+    LOG_KINDS = ("nodes", "edges", "transactions")
+    SNAPSHOT_FORMAT = "skg-snapshot-v1"
+    SNAPSHOTS_KEPT = 2
+    
+    # none: leave writes in process buffers; flush: hand each batch to the OS;
+    # fsync: fsync every batch; fsync_interval: flush every batch and fsync at
+    # most once per ``fsync_interval`` seconds, with a background flusher
+    # committing and fsyncing whatever is left once writes go idle
+    DURABILITY_MODES = ("none", "flush", "fsync", "fsync_interval")
+    
+    def __init__(self, vault_path: Path, worker_id: str, serial_index=None,
+                 max_segment_bytes: int = SegmentedLog.SEGMENT_MAX_BYTES,
+                 max_segment_age: Optional[float] = None,
+                 snapshot_format: str = "binary",
+                 durability: str = "flush",
+                 fsync_interval: float = 1.0,
+                 batch_transactions: int = 1):
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        
         self.vault_path = vault_path
         self.worker_id = worker_id
+        self.serial_index = serial_index
+        self.snapshot_format = snapshot_format
+        self.durability = durability
+        self.fsync_interval = fsync_interval
+        self.batch_transactions = batch_transactions
         
         # Create worker-specific SKG vault directory
         self.worker_skg_path = vault_path / "worker_skg" / worker_id
         self.worker_skg_path.mkdir(parents=True, exist_ok=True)
         
-        # Open JSONL append-only files
-        self.nodes_file = open(self.worker_skg_path / "nodes.jsonl", "a")
-        self.edges_file = open(self.worker_skg_path / "edges.jsonl", "a")
-        self.transactions_file = open(self.worker_skg_path / "transactions.jsonl", "a")
+        # Append-only JSONL logs (hot segment plain, sealed segments compressed)
+        self.logs: Dict[str, SegmentedLog] = {
+            kind: SegmentedLog(self.worker_skg_path, kind,
+                               max_segment_bytes=max_segment_bytes,
+                               max_segment_age=max_segment_age,
+                               fsync_on_rotate=durability in ("fsync", "fsync_interval"))
+            for kind in self.LOG_KINDS
+        }
+        
+        self.snapshots_path = self.worker_skg_path / "snapshots"
+        self.last_transaction_id: Optional[str] = None
+        self.time_index = SparseTimeIndex(self.worker_skg_path / "transactions.sidx", self.logs["transactions"])
+        
+        # Pending batch: encoded lines and their index keys per log
+        self._lock = threading.RLock()
+        self._pending: Dict[str, List[Tuple[bytes, Optional[Dict[str, str]]]]] = {kind: [] for kind in self.LOG_KINDS}
+        self._pending_transactions = 0
+        self._pending_micros: List[int] = []
+        self._last_fsync = time.monotonic()
+        
+        # Group fsync: commits are numbered; one fsync covers every commit
+        # written before it, so concurrent committers share it
+        self._fsync_lock = threading.Lock()
+        self._committed_seq = 0
+        self._synced_seq = 0
+        
+        # Commit metrics (recent window)
+        self.commit_latencies: deque = deque(maxlen=1024)
+        self.batch_sizes: deque = deque(maxlen=1024)
+        self.totals = {"commits": 0, "transactions": 0, "records": 0, "bytes": 0, "fsyncs": 0}
+        
+        # fsync_interval: bound the loss window even if no further commit comes
+        self._stopping = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if durability == "fsync_interval":
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
     
     def serialize_transaction(self, nodes: List[SKGNode], edges: List[SKGEdge], 
-                             event_type: str) -> str:
+                             event_type: str, index_keys: Optional[Dict[str, str]] = None,
+                             node_patches: Optional[List[dict]] = None) -> str:
         """
         Serialize a batch of nodes/edges as a single transaction.
+        ``node_patches`` are ``node_patch`` records (changed properties and
+        the new version of an existing node) written to the nodes log.
+        Records are indexed under ``index_keys`` (serial/payload_hash/wallet)
+        when a serial index is attached.
+        
+        Records are encoded into the pending batch, which is committed once
+        it holds ``batch_transactions`` transactions (or on ``commit()``).
         Returns transaction ID.
         """
+        transaction_id = self.stage_transaction(nodes, edges, event_type, index_keys, node_patches)
+        self.commit_if_due()
+        return transaction_id
+    
+    def stage_transaction(self, nodes: List[SKGNode], edges: List[SKGEdge],
+                          event_type: str, index_keys: Optional[Dict[str, str]] = None,
+                          node_patches: Optional[List[dict]] = None) -> str:
+        """
+        Encode a transaction into the pending batch without committing it
+        (see ``commit_if_due``). Thread-safe: records are JSON-encoded before
+        the lock is taken and only the transaction ID is spliced in under it.
+        Returns transaction ID.
+        """
+        node_patches = node_patches or []
+        now = now_micros()
         
-        transaction_id = f"SKG_TXN_{self.worker_id}_{int(datetime.utcnow().timestamp() * 1000000)}"
+        # '{"transaction_id": ..., ' + body[1:] equals json.dumps of the merged record
+        bodies = [("nodes", json.dumps({"record_type": "node", **node.to_dict()})[1:]) for node in nodes]
+        bodies += [("nodes", json.dumps(patch)[1:]) for patch in node_patches]
+        bodies += [("edges", json.dumps({"record_type": "edge", **edge.to_dict()})[1:]) for edge in edges]
         
-        # Write transaction header
-        txn_record = {
+        with self._lock:
+            # Strictly increasing, so batched transactions never share an ID
+            # Epoch micros are UTC on any host, matching ``to_micros`` bounds
+            micros = max(now, self.time_index.last_micros + 1)
+            self.time_index.last_micros = micros
+            transaction_id = f"SKG_TXN_{self.worker_id}_{micros}"
+            
+            txn_record = {
+                "transaction_id": transaction_id,
+                "event_type": event_type,
+                "timestamp": micros_to_iso(micros),
+                "worker_id": self.worker_id,
+                "node_count": len(nodes),
+                "edge_count": len(edges),
+                "patch_count": len(node_patches)
+            }
+            self._encode("transactions", txn_record, index_keys)
+            self._pending_micros.append(micros)
+            
+            prefix = '{"transaction_id": ' + json.dumps(transaction_id) + ', '
+            for kind, body in bodies:
+                self._pending[kind].append(((prefix + body + "\n").encode(), index_keys))
+            
+            self.last_transaction_id = transaction_id
+            self._pending_transactions += 1
+        
+        return transaction_id
+    
+    def commit_if_due(self):
+        """Commit once ``batch_transactions`` transactions are pending."""
+        if self._pending_transactions >= self.batch_transactions:
+            self.commit()
+    
+    def _encode(self, kind: str, record: dict, index_keys: Optional[Dict[str, str]]):
+        self._pending[kind].append(((json.dumps(record) + "\n").encode(), index_keys))
+    
+    def commit(self):
+        """
+        Write the pending batch: one framed write per log, one serial index
+        insert, then flush/fsync according to the durability mode. The fsync
+        runs after the lock is released and is shared by concurrent commits.
+        """
+        with self._lock:
+            if not self._pending_transactions:
+                return
+            started = time.perf_counter()
+            
+            index_rows = []
+            written = records = 0
+            for kind, pending in self._pending.items():
+                if not pending:
+                    continue
+                frame = b"".join(line for line, _ in pending)
+                segment, offset = self.logs[kind].append(frame)
+                
+                log_name = f"skg:{self.worker_id}:{kind}"
+                for i, (line, index_keys) in enumerate(pending):
+                    if kind == "transactions":
+                        self.time_index.note(self._pending_micros[i], segment, offset, len(line))
+                    if index_keys and self.serial_index is not None:
+                        index_rows.append((log_name, segment, offset, len(line), index_keys))
+                    offset += len(line)
+                
+                written += len(frame)
+                records += len(pending)
+                pending.clear()
+            self._pending_micros.clear()
+            
+            if index_rows:
+                self.serial_index.add_many(index_rows)
+            
+            if self.durability != "none":
+                for log in self.logs.values():
+                    log.flush()
+                self.time_index.flush()
+            fsync_due = self.durability == "fsync" or (
+                self.durability == "fsync_interval"
+                and time.monotonic() - self._last_fsync >= self.fsync_interval
+            )
+            
+            self.batch_sizes.append(self._pending_transactions)
+            self.totals["commits"] += 1
+            self.totals["transactions"] += self._pending_transactions
+            self.totals["records"] += records
+            self.totals["bytes"] += written
+            self._pending_transactions = 0
+            self._committed_seq += 1
+            sequence = self._committed_seq
+        
+        if fsync_due:
+            self._group_fsync(sequence)
+        self.commit_latencies.append(time.perf_counter() - started)
+    
+    def _group_fsync(self, sequence: int):
+        """Make commit ``sequence`` durable, unless a concurrent fsync already has."""
+        with self._fsync_lock:
+            if self._synced_seq >= sequence:
+                return
+            covered = self._committed_seq
+            self._fsync()
+            self._synced_seq = covered
+    
+    def _flush_periodically(self):
+        """Every ``fsync_interval``: commit the pending batch and fsync unsynced commits."""
+        while not self._stopping.wait(self.fsync_interval):
+            self.commit()
+            sequence = self._committed_seq
+            if sequence > self._synced_seq:
+                self._group_fsync(sequence)
+    
+    def _fsync(self):
+        for log in self.logs.values():
+            log.fsync()
+        self._last_fsync = time.monotonic()
+        self.totals["fsyncs"] += 1
+    
+    def metrics(self) -> dict:
+        """Commit latency and batch size over the recent window, plus totals."""
+        latencies = sorted(self.commit_latencies)
+        return {
+            "durability": self.durability,
+            **self.totals,
+            "pending_transactions": self._pending_transactions,
+            "batch_size_median": median(self.batch_sizes) if self.batch_sizes else 0,
+            "batch_size_max": max(self.batch_sizes, default=0),
+            "commit_latency_median_ms": median(latencies) * 1000 if latencies else 0.0,
+            "commit_latency_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+            "commit_latency_max_ms": latencies[-1] * 1000 if latencies else 0.0
+        }
+    
+    def read_at(self, kind: str, segment: int, offset: int, length: int) -> bytes:
+        """Positioned read of a raw record from nodes/edges/transactions."""
+        return self.logs[kind].read_at(segment, offset, length)
+    
+    def iter_records(self, kind: str) -> Iterator[dict]:
+        """Stream records of one log across compressed and plain segments."""
+        self.commit()
+        for _, _, line in self.logs[kind].iter_lines():
+            yield json.loads(line)
+    
+    def close(self):
+        if self._flusher is not None:
+            self._stopping.set()
+            self._flusher.join()
+        self.commit()
+        if self.durability != "none":
+            with self._fsync_lock:
+                self._fsync()
+        for log in self.logs.values():
+            log.close()
+        self.time_index.close()
+    
+    def positions(self) -> Dict[str, Tuple[int, int]]:
+        """Current end of each log as (segment, offset), after a commit and flush."""
+        self.commit()
+        positions = {}
+        for kind, log in self.logs.items():
+            log.flush()
+            positions[kind] = (log.hot_segment, log.hot_size)
+        return positions
+    
+    def rotate_logs(self):
+        """Seal every hot segment so everything written so far can be compacted."""
+        self.commit()
+        for log in self.logs.values():
+            log.rotate()
+    
+    def compact_logs(self, positions: Optional[Dict[str, Tuple[int, int]]] = None) -> List[dict]:
+        """
+        Compact the node and edge logs up to ``positions`` (defaults to the
+        newest snapshot's positions). Segments at or after the positions a
+        snapshot replays from are never rewritten, so warm start stays valid.
+        Without any snapshot the hot segments are sealed and everything is
+        compacted.
+        """
+        if positions is None:
+            positions = self.snapshot_positions()
+        if positions is None:
+            self.rotate_logs()
+            positions = self.positions()
+        
+        return [
+            compact_log(self.logs[kind], kind, positions[kind][0],
+                        serial_index=self.serial_index,
+                        index_log=f"skg:{self.worker_id}:{kind}")
+            for kind in RECORD_KEYS
+        ]
+    
+    def snapshot_positions(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        """Log positions covered by the newest snapshot, if any."""
+        snapshots = self.list_snapshots()
+        if not snapshots:
+            return None
+        if snapshots[-1].suffix == ".skgbin":
+            mapped = MappedGraphSnapshot(snapshots[-1])
+            header = mapped.metadata
+            mapped.close()
+        else:
+            with gzip.open(snapshots[-1], "rt") as f:
+                header = json.loads(f.readline())
+        return {kind: tuple(pos) for kind, pos in header["positions"].items()}
+    
+    def write_snapshot(self, nodes: Collection[SKGNode], edges: Collection[SKGEdge],
+                       positions: Dict[str, Tuple[int, int]],
+                       transaction_id: Optional[str]) -> Path:
+        """
+        Write a snapshot of the graph covering the logs up to ``positions``:
+        the memory-mappable binary format by default, or gzip JSONL, which
+        is written in one pass over ``nodes`` and ``edges`` (so they can be
+        streamed). Older snapshots beyond SNAPSHOTS_KEPT are pruned.
+        """
+        self.snapshots_path.mkdir(parents=True, exist_ok=True)
+        stamp = int(time.time() * 1000000)
+        
+        header = {
+            "format": self.SNAPSHOT_FORMAT,
             "transaction_id": transaction_id,
-            "event_type": event_type,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "worker_id": self.worker_id,
+            "positions": positions,
             "node_count": len(nodes),
-            "edge_count": len(edges)
+            "edge_count": len(edges),
+            "created_at": datetime.utcnow().isoformat() + "Z"
         }
-        self.transactions_file.write(json.dumps(txn_record) + "\n")
-        
-        # Write nodes
-        for node in nodes:
-            node_record = {
-                "transaction_id": transaction_id,
-                "record_type": "node",
-                **node.to_dict()
-            }
-            self.nodes_file.write(json.dumps(node_record) + "\n")
         
-        # Write edges
-        for edge in edges:
-            edge_record = {
-                "transaction_id": transaction_id,
-                "record_type": "edge",
-                **edge.to_dict()
-            }
-            self.edges_file.write(json.dumps(edge_record) + "\n")
+        if self.snapshot_format == "binary":
+            snapshot_path = self.snapshots_path / f"snapshot_{stamp}.skgbin"
+            write_binary_snapshot(snapshot_path, nodes, edges, header)
+        else:
+            snapshot_path = self.snapshots_path / f"snapshot_{stamp}.jsonl.gz"
+            tmp_path = snapshot_path.with_suffix(".tmp")
+            with gzip.open(tmp_path, "wt", compresslevel=3) as f:
+                f.write(json.dumps(header) + "\n")
+                for node in nodes:
+                    f.write(json.dumps({"n": node.to_dict()}, separators=(",", ":")) + "\n")
+                for edge in edges:
+                    f.write(json.dumps({"e": edge.to_dict()}, separators=(",", ":")) + "\n")
+            os.replace(tmp_path, snapshot_path)
         
-        # Flush to disk (durability)
-        self.nodes_file.flush()
-        self.edges_file.flush()
-        self.transactions_file.flush()
+        for stale in self.list_snapshots()[:-self.SNAPSHOTS_KEPT]:
+            stale.unlink()
         
-        return transaction_id
+        return snapshot_path
+    
+    def list_snapshots(self) -> List[Path]:
+        if not self.snapshots_path.exists():
+            return []
+        snapshots = [p for p in self.snapshots_path.glob("snapshot_*")
+                     if p.name.endswith((".jsonl.gz", ".skgbin"))]
+        return sorted(snapshots, key=lambda p: int(p.name.split("_")[1].split(".")[0]))
+    
+    def open_mapped_snapshot(self) -> Optional[MappedGraphSnapshot]:
+        """Query view over the newest binary snapshot without loading it."""
+        binary = [p for p in self.list_snapshots() if p.suffix == ".skgbin"]
+        return MappedGraphSnapshot(binary[-1]) if binary else None
     
-    def load_graph(self, nodes_dict: Dict, edges_dict: Dict):
+    def load_graph(self, on_node: Callable[[SKGNode], None],
+                   on_edge: Callable[[SKGEdge], None],
+                   on_node_patch: Optional[Callable[[dict], None]] = None) -> dict:
         """
-        Load existing graph from vault JSONL files.
+        Warm-start the graph: load the latest snapshot, then replay only the
+        tail of nodes/edges/transactions written after it. Later records for
+        the same ID replace earlier ones; ``node_patch`` records are handed
+        to ``on_node_patch``.
+        Returns load statistics.
         """
-        # Load nodes
-        nodes_file = self.worker_skg_path / "nodes.jsonl"
-        if nodes_file.exists():
-            with open(nodes_file, "r") as f:
+        started = time.perf_counter()
+        stats = {"snapshot": None, "snapshot_nodes": 0, "snapshot_edges": 0,
+                 "replayed_nodes": 0, "replayed_edges": 0, "replayed_transactions": 0}
+        positions: Dict[str, Tuple[int, int]] = {}
+        
+        snapshots = self.list_snapshots()
+        if snapshots and snapshots[-1].suffix == ".skgbin":
+            mapped = MappedGraphSnapshot(snapshots[-1])
+            positions = {kind: tuple(pos) for kind, pos in mapped.metadata["positions"].items()}
+            self.last_transaction_id = mapped.metadata.get("transaction_id")
+            for node in mapped.iter_nodes():
+                on_node(node)
+                stats["snapshot_nodes"] += 1
+            for edge in mapped.iter_edges():
+                on_edge(edge)
+                stats["snapshot_edges"] += 1
+            mapped.close()
+            stats["snapshot"] = snapshots[-1].name
+        elif snapshots:
+            with gzip.open(snapshots[-1], "rt") as f:
+                header = json.loads(f.readline())
+                positions = {kind: tuple(pos) for kind, pos in header["positions"].items()}
+                self.last_transaction_id = header.get("transaction_id")
                 for line in f:
                     record = json.loads(line)
-                    # Reconstruct node (skipping transaction metadata)
-                    # Implementation depends on your needs for warm-start
-                    pass
+                    if "n" in record:
+                        on_node(SKGNode.from_dict(record["n"]))
+                        stats["snapshot_nodes"] += 1
+                    else:
+                        on_edge(SKGEdge.from_dict(record["e"]))
+                        stats["snapshot_edges"] += 1
+            stats["snapshot"] = snapshots[-1].name
+        
+        stats["positions"] = {kind: list(position) for kind, position in positions.items()} if stats["snapshot"] else None
+
+        # Replay the log tails past the snapshot
+        for kind, builder, callback in (("nodes", SKGNode.from_dict, on_node),
+                                        ("edges", SKGEdge.from_dict, on_edge)):
+            segment, offset = positions.get(kind, (None, 0))
+            for _, _, line in self.logs[kind].iter_lines(segment, offset):
+                record = json.loads(line)
+                if record.get("record_type") == "node_patch":
+                    if on_node_patch is not None:
+                        on_node_patch(record)
+                else:
+                    callback(builder(record))
+                stats[f"replayed_{kind}"] += 1
         
-        # Load edges similarly
-        # Note: For large graphs, implement lazy loading
+        segment, offset = positions.get("transactions", (None, 0))
+        for _, _, line in self.logs["transactions"].iter_lines(segment, offset):
+            self.last_transaction_id = json.loads(line)["transaction_id"]
+            stats["replayed_transactions"] += 1
+        
+        stats["seconds"] = time.perf_counter() - started
+        return stats
     
     def get_transaction_log(self, limit: int = 100) -> List[Dict]:
         """
-        Retrieve recent SKG transactions for monitoring.
+        Retrieve the most recent SKG transactions for monitoring, newest
+        first. Reads the log backwards, so cost is independent of its size.
         """
-        transactions = []
-        txn_file = self.worker_skg_path / "transactions.jsonl"
-        if txn_file.exists():
-            with open(txn_file, "r") as f:
-                for line in f:
-                    transactions.append(json.loads(line))
-                    if len(transactions) >= limit:
-                        break
+        self.commit()
+        lines = islice(self.logs["transactions"].iter_lines_reverse(), limit)
+        return [json.loads(line) for _, _, line in lines]
+    
+    def get_transactions_between(self, start: Optional[Union[int, str, datetime]] = None,
+                                 end: Optional[Union[int, str, datetime]] = None) -> Iterator[Dict]:
+        """
+        Transactions committed in [start, end] (epoch µs, ISO string or UTC
+        datetime), oldest first. The sparse time index positions the scan
+        just before ``start``; the scan stops at the first one past ``end``.
+        """
+        self.commit()
+        start_micros = to_micros(start) if start is not None else None
+        end_micros = to_micros(end) if end is not None else None
+        segment, offset = self.time_index.seek(start_micros) if start_micros is not None else (None, 0)
         
-        return transactions
\ No newline at end of file
+        for _, _, line in self.logs["transactions"].iter_lines(segment, offset):
+            record = json.loads(line)
+            micros = transaction_micros(record["transaction_id"])
+            if start_micros is not None and micros < start_micros:
+                continue
+            if end_micros is not None and micros > end_micros:
+                break
+            yield record
+    
+    def get_transactions_by_id(self, first_id: str, last_id: Optional[str] = None) -> Iterator[Dict]:
+        """Transactions from ``first_id`` through ``last_id`` inclusive."""
+        return self.get_transactions_between(
+            transaction_micros(first_id),
+            transaction_micros(last_id) if last_id is not None else None
+        )
\ No newline at end of file
@@ -0,0 +1,164 @@
+# skg_sketches.py
+import hashlib
+import math
+from array import array
+from collections import deque
+from typing import Deque, Optional
+
+
+def _hash64(key: str, salt: bytes = b"") -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8, salt=salt).digest(), "little")
+
+
+class CountMinSketch:
+    """
+    Approximate per-key frequency in fixed memory (``width * depth`` counters).
+    Estimates never undercount; with the defaults they overcount by at most
+    ~0.13% of the total added, with probability 1 - e^-4.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        for row in range(self.depth):
+            yield row, int.from_bytes(digest[4 * row:4 * row + 4], "little") % self.width
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add ``count`` occurrences of ``key``; returns its new estimate."""
+        self.total += count
+        estimate = None
+        for row, cell in self._cells(key):
+            self.rows[row][cell] += count
+            value = self.rows[row][cell]
+            estimate = value if estimate is None else min(estimate, value)
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(self.rows[row][cell] for row, cell in self._cells(key))
+
+
+class HyperLogLog:
+    """
+    Approximate distinct count in ``2 ** precision`` bytes. The standard
+    error is 1.04 / sqrt(2 ** precision), ~1.6% at the default precision.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        # Running harmonic sum and empty-register count, so count() is O(1)
+        self._inverse_sum = float(len(self.registers))
+        self._zeros = len(self.registers)
+
+    def add(self, key: str):
+        value = _hash64(key)
+        index = value >> (64 - self.precision)
+        remainder = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        previous = self.registers[index]
+        if rank > previous:
+            self.registers[index] = rank
+            self._inverse_sum += 2.0 ** -rank - 2.0 ** -previous
+            if previous == 0:
+                self._zeros -= 1
+
+    def count(self, recompute: bool = False) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        if recompute:
+            inverse_sum, zeros = sum(2.0 ** -r for r in self.registers), self.registers.count(0)
+        else:
+            inverse_sum, zeros = self._inverse_sum, self._zeros
+        estimate = alpha * m * m / inverse_sum
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)    # linear counting for small sets
+        return int(round(estimate))
+
+
+class RunningStats:
+    """Welford's online mean and variance, with min and max."""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 min: Optional[float] = None, max: Optional[float] = None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min
+        self.max = max
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class Ewma:
+    """Exponentially weighted moving average; ``alpha`` is the weight of each new value."""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha: float = 0.05, value: Optional[float] = None):
+        self.alpha = alpha
+        self.value = value
+
+    def add(self, value: float) -> float:
+        self.value = value if self.value is None else self.value + self.alpha * (value - self.value)
+        return self.value
+
+    def to_dict(self) -> dict:
+        return {"alpha": self.alpha, "value": self.value}
+
+
+class WindowedHistogram:
+    """
+    Quantiles over the last ``window`` values of a bounded quantity, as a
+    fixed-bin histogram: O(1) per value, O(bins) per quantile, resolution
+    ``(high - low) / bins``.
+    """
+
+    def __init__(self, window: int = 1024, bins: int = 100, low: float = 0.0, high: float = 1.0):
+        self.bins = bins
+        self.low = low
+        self.width = (high - low) / bins
+        self.counts = [0] * bins
+        self.recent: Deque[int] = deque(maxlen=window)
+
+    def add(self, value: float):
+        bucket = min(self.bins - 1, max(0, int((value - self.low) / self.width)))
+        if len(self.recent) == self.recent.maxlen:
+            self.counts[self.recent[0]] -= 1
+        self.recent.append(bucket)
+        self.counts[bucket] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Midpoint of the bin holding the ``q`` quantile, or None while empty."""
+        if not self.recent:
+            return None
+        rank = q * (len(self.recent) - 1)
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen > rank:
+                return self.low + (bucket + 0.5) * self.width
+        return self.low + (self.bins - 0.5) * self.width
@@ -0,0 +1,300 @@
+# skg_tiered_store.py
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from skg_sketches import RunningStats
+
+# Below this the LRU thrashes on the handful of nodes every ingest touches
+MIN_HOT_CAPACITY = 1024
+
+
+def _open_scratch(path: Path) -> sqlite3.Connection:
+    """
+    Fresh scratch database: rebuilt from the vault logs on every start, so
+    nothing is synced. WAL lets ``frozen`` readers keep a consistent view
+    while the owner keeps writing; reads go through an mmap of the file.
+    """
+    for stale in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+        stale.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA mmap_size=1073741824")
+    return conn
+
+
+class _ScratchDB:
+    """
+    Writes batched into one open transaction per ``COMMIT_EVERY`` statements
+    (the owner's reads see them either way); callers hold ``lock``.
+    """
+
+    COMMIT_EVERY = 4096
+
+    def __init__(self, path: Path, schema: str):
+        self.path = path
+        self.conn = _open_scratch(path)
+        self.conn.execute(schema)
+        self.lock = threading.RLock()
+        self._uncommitted = 0
+
+    def write(self, sql: str, params: tuple) -> int:
+        """Run one statement; returns the number of rows it changed."""
+        if not self._uncommitted:
+            self.conn.execute("BEGIN")
+        changed = self.conn.execute(sql, params).rowcount
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_EVERY:
+            self.commit()
+        return changed
+
+    def commit(self):
+        if self._uncommitted:
+            self.conn.execute("COMMIT")
+            self._uncommitted = 0
+
+    def file_bytes(self) -> Tuple[int, int]:
+        """(database bytes, bytes on the free list)."""
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return pages * page_size, free * page_size
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+        for path in (self.path, self.path.with_name(self.path.name + "-wal"),
+                     self.path.with_name(self.path.name + "-shm")):
+            path.unlink(missing_ok=True)
+
+
+class TieredStore(MutableMapping):
+    """
+    Dict-compatible store with a bounded hot tier over a disk-backed cold tier.
+
+    The hot tier is an LRU of live objects holding at most ``hot_capacity``
+    entries. Evicted objects are written as JSON to a scratch SQLite table
+    keyed by ID, so the cold tier's key index is an on-disk B-tree rather
+    than a per-object entry in memory; reads go through SQLite's mmap of the
+    file and its bounded page cache. A lookup that misses the hot tier
+    faults the object back in (and may evict another). ``len`` never touches
+    the disk; ``in`` and key iteration read the key index.
+
+    The engine replaces objects rather than mutating them, so a reference
+    stays a consistent (if possibly superseded) version after eviction, and
+    ``frozen`` can pin the current contents without copying them. The cold
+    table is rebuilt from the vault logs on every start; SQLite reuses the
+    pages of faulted-in objects.
+    """
+
+    def __init__(self, path: Path, hot_capacity: int,
+                 encode: Callable[[Any], dict], decode: Callable[[dict], Any]):
+        if hot_capacity < MIN_HOT_CAPACITY:
+            raise ValueError(f"hot_capacity must be at least {MIN_HOT_CAPACITY}")
+        self.path = path
+        self.hot_capacity = hot_capacity
+        self._encode = encode
+        self._decode = decode
+
+        self.hot: "OrderedDict[str, Any]" = OrderedDict()
+        self._cold = _ScratchDB(path, "CREATE TABLE cold (key TEXT PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID")
+        self._cold_count = 0
+        self._lock = self._cold.lock
+
+        self.stats = {"hits": 0, "faults": 0, "evictions": 0}
+        self.fault_latency = RunningStats()
+
+    # ------------------------------------------------------------------
+    # Mapping protocol
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            value = self.hot.get(key)
+            if value is not None:
+                self.hot.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+
+            started = time.perf_counter()
+            row = self._cold.conn.execute("SELECT value FROM cold WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                raise KeyError(key)
+            value = self._decode(json.loads(row[0]))
+            self._drop_cold(key)
+            self.hot[key] = value
+            self._evict()
+            self.stats["faults"] += 1
+            self.fault_latency.add(time.perf_counter() - started)
+            return value
+
+    def __setitem__(self, key: str, value: Any):
+        with self._lock:
+            if key not in self.hot:
+                self._drop_cold(key)
+            self.hot[key] = value
+            self.hot.move_to_end(key)
+            self._evict()
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            if key in self.hot:
+                del self.hot[key]
+            elif not self._drop_cold(key):
+                raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self.hot or self._cold.conn.execute(
+                "SELECT 1 FROM cold WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.hot) + self._cold_count
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            keys = list(self.hot) + [key for (key,) in self._cold.conn.execute("SELECT key FROM cold")]
+        return iter(keys)
+
+    def values(self) -> List[Any]:
+        """Every object, without promoting cold ones (for scans and recounts)."""
+        with self._lock:
+            return list(self.hot.values()) + [self._decode(json.loads(value)) for (value,)
+                                              in self._cold.conn.execute("SELECT value FROM cold")]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            return list(self.hot.items()) + [(key, self._decode(json.loads(value))) for key, value
+                                             in self._cold.conn.execute("SELECT key, value FROM cold")]
+
+    def frozen(self) -> "FrozenTier":
+        """
+        Point-in-time view of every object, read lazily: the hot objects plus
+        a read transaction on the cold table, which keeps seeing this state
+        while the store goes on evicting and faulting.
+        """
+        with self._lock:
+            self._cold.commit()
+            reader = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            reader.execute("BEGIN")
+            reader.execute("SELECT 1 FROM cold LIMIT 1").fetchall()    # pins the read snapshot
+            return FrozenTier(list(self.hot.values()), self._cold_count, reader, self._decode)
+
+    # ------------------------------------------------------------------
+    # Cold tier
+    # ------------------------------------------------------------------
+
+    def _evict(self):
+        while len(self.hot) > self.hot_capacity:
+            key, value = self.hot.popitem(last=False)
+            self._cold.write("INSERT INTO cold VALUES (?, ?)", (key, json.dumps(self._encode(value))))
+            self._cold_count += 1
+            self.stats["evictions"] += 1
+
+    def _drop_cold(self, key: str) -> bool:
+        if not self._cold_count:
+            return False
+        if self._cold.write("DELETE FROM cold WHERE key = ?", (key,)):
+            self._cold_count -= 1
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Metrics / lifecycle
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["faults"]
+            cold_bytes, free_bytes = self._cold.file_bytes()
+            return {
+                **self.stats,
+                "hot": len(self.hot),
+                "cold": self._cold_count,
+                "hot_capacity": self.hot_capacity,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 1.0,
+                "fault_latency_mean_us": self.fault_latency.mean * 1_000_000,
+                "fault_latency_max_us": (self.fault_latency.max or 0.0) * 1_000_000,
+                "cold_bytes": cold_bytes,
+                "cold_free_bytes": free_bytes
+            }
+
+    def close(self):
+        with self._lock:
+            self._cold.close()
+
+
+class FrozenTier:
+    """
+    Snapshot of a ``TieredStore`` from ``frozen()``: sized and iterable, with
+    cold objects decoded one at a time as the iteration reaches them.
+    """
+
+    def __init__(self, hot: List[Any], cold_count: int,
+                 reader: Optional[sqlite3.Connection], decode: Callable[[dict], Any]):
+        self._hot = hot
+        self._cold_count = cold_count
+        self._reader = reader
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self._hot) + self._cold_count
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self._hot
+        for (value,) in self._reader.execute("SELECT value FROM cold"):
+            yield self._decode(json.loads(value))
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+class TieredAdjacency:
+    """
+    One direction of the edge adjacency index, kept on disk next to a tiered
+    edge store: ``get(node_id)`` returns ``{edge_type: [edge_id, ...]}`` in
+    insertion order, like the in-memory ``Dict[str, Dict[str, List[str]]]``
+    it replaces, but built from an indexed range read. The lists returned
+    are copies; change the index through ``add`` and ``remove``.
+    """
+
+    def __init__(self, path: Path):
+        self._db = _ScratchDB(path, "CREATE TABLE adjacency (node_id TEXT NOT NULL, edge_type TEXT NOT NULL, "
+                                    "seq INTEGER NOT NULL, edge_id TEXT NOT NULL, "
+                                    "PRIMARY KEY (node_id, edge_type, seq)) WITHOUT ROWID")
+        self._seq = 0
+
+    def get(self, node_id: str, default: Any = None) -> Optional[Dict[str, List[str]]]:
+        with self._db.lock:
+            rows = self._db.conn.execute(
+                "SELECT edge_type, edge_id FROM adjacency WHERE node_id = ? ORDER BY edge_type, seq", (node_id,)
+            ).fetchall()
+        if not rows:
+            return default
+        by_type: Dict[str, List[str]] = {}
+        for edge_type, edge_id in rows:
+            by_type.setdefault(edge_type, []).append(edge_id)
+        return by_type
+
+    def add(self, node_id: str, edge_type: str, edge_id: str):
+        with self._db.lock:
+            self._seq += 1
+            self._db.write("INSERT INTO adjacency VALUES (?, ?, ?, ?)", (node_id, edge_type, self._seq, edge_id))
+
+    def remove(self, node_id: str, edge_type: str, edge_id: str):
+        with self._db.lock:
+            self._db.write("DELETE FROM adjacency WHERE node_id = ? AND edge_type = ? AND edge_id = ?",
+                           (node_id, edge_type, edge_id))
+
+    def close(self):
+        with self._db.lock:
+            self._db.close()
@@ -0,0 +1,235 @@
+# worker_vault_writer.py
+import hashlib
+import json
+import os
+import sys
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Shared segmented log lives with the SKG core
+sys.path.insert(0, str(Path(__file__).parent / "vault_system" / "skg_core"))
+
+from segmented_log import SegmentedLog
+
+GENESIS_HASH = "0" * 64
+
+
+def chain_step(prev_hash: str, record: dict) -> str:
+    """Fold one event into the chain: sha256(prev_hash || canonical record)."""
+    body = {k: v for k, v in record.items() if k != "chain_hash"}
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(prev_hash.encode() + canonical.encode()).hexdigest()
+
+
+class WorkerEventLog:
+    """
+    Hash-chained, append-only event log for one worker.
+
+    Every appended record carries its sequence number and the running chain
+    hash, so the head hash attests to the full history while each append
+    costs O(1). A checkpoint (seq, byte offset, chain hash) is persisted every
+    ``checkpoint_interval`` events; verification of any range starts from the
+    nearest checkpoint instead of genesis.
+
+    The log rotates by size (and optionally age); sealed segments are
+    block-compressed and positions are (segment, offset) pairs.
+    """
+
+    CHECKPOINT_INTERVAL = 1000
+
+    def __init__(self, workers_path: Path, worker_id: str,
+                 checkpoint_interval: int = CHECKPOINT_INTERVAL,
+                 max_segment_bytes: int = SegmentedLog.SEGMENT_MAX_BYTES,
+                 max_segment_age: Optional[float] = None):
+        self.worker_id = worker_id
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints_path = workers_path / f"{worker_id}_checkpoints.jsonl"
+        self.events = SegmentedLog(workers_path, f"{worker_id}_events",
+                                   max_segment_bytes=max_segment_bytes,
+                                   max_segment_age=max_segment_age,
+                                   fsync_on_rotate=True)
+
+        self.checkpoints: List[dict] = self._load_checkpoints()
+        self.head_seq, self.head_hash = self._recover_head()
+
+        # Anchor pre-chain history (or a fresh log) with an initial checkpoint
+        if not self.checkpoints or self.head_seq - self.checkpoints[-1]["seq"] >= self.checkpoint_interval:
+            self.write_checkpoint()
+
+    def append(self, record: dict) -> dict:
+        """
+        Chain and append an event record. Returns its location receipt.
+        """
+        record["seq"] = self.head_seq
+        record["chain_hash"] = chain_step(self.head_hash, record)
+
+        line = json.dumps(record).encode() + b"\n"
+        segment, offset = self.events.append(line)
+        self.events.flush()
+
+        self.head_seq += 1
+        self.head_hash = record["chain_hash"]
+
+        if self.head_seq - self.checkpoints[-1]["seq"] >= self.checkpoint_interval:
+            self.write_checkpoint()
+
+        return {
+            "seq": record["seq"],
+            "segment": segment,
+            "offset": offset,
+            "length": len(line),
+            "chain_hash": record["chain_hash"]
+        }
+
+    def write_checkpoint(self) -> dict:
+        """Persist the current chain head as a durable checkpoint."""
+        self.events.fsync()
+
+        checkpoint = {
+            "seq": self.head_seq,
+            "segment": self.events.hot_segment,
+            "offset": self.events.hot_size,
+            "chain_hash": self.head_hash,
+            "timestamp": datetime.utcnow().isoformat() + "Z"
+        }
+        with open(self.checkpoints_path, "a") as f:
+            f.write(json.dumps(checkpoint) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.checkpoints.append(checkpoint)
+        return checkpoint
+
+    def verify_range(self, start_seq: int, end_seq: Optional[int] = None) -> dict:
+        """
+        Verify events [start_seq, end_seq) against the nearest checkpoint.
+
+        Replays from the last checkpoint at or before ``start_seq`` and runs on
+        to the first checkpoint at or after ``end_seq`` so that a rewritten
+        range cannot hide behind recomputed per-record hashes.
+        """
+        end_seq = self.head_seq if end_seq is None else min(end_seq, self.head_seq)
+
+        seqs = [c["seq"] for c in self.checkpoints]
+        anchor = self.checkpoints[max(bisect_right(seqs, start_seq) - 1, 0)]
+        if anchor["seq"] > start_seq:
+            # Range predates the first checkpoint; replay from genesis
+            anchor = {"seq": 0, "segment": 0, "offset": 0, "chain_hash": GENESIS_HASH}
+
+        expected = {c["seq"]: c["chain_hash"] for c in self.checkpoints if c["seq"] > anchor["seq"]}
+        closing = next((s for s in seqs if s >= end_seq), self.head_seq)
+
+        result = {"valid": True, "start_seq": start_seq, "end_seq": end_seq,
+                  "anchor_seq": anchor["seq"], "records_checked": 0, "first_bad_seq": None}
+
+        seq, chain_hash = anchor["seq"], anchor["chain_hash"]
+        for _, _, line in self.events.iter_lines(anchor.get("segment", 0), anchor["offset"]):
+            if seq >= closing:
+                break
+            record = json.loads(line)
+            chain_hash = chain_step(chain_hash, record)
+            stored = record.get("chain_hash")
+            seq += 1
+            result["records_checked"] += 1
+
+            if (stored is not None and stored != chain_hash) or expected.get(seq, chain_hash) != chain_hash:
+                result["valid"] = False
+                result["first_bad_seq"] = seq - 1
+                break
+
+        if result["valid"] and seq == self.head_seq and chain_hash != self.head_hash:
+            result["valid"] = False
+            result["first_bad_seq"] = seq - 1
+
+        return result
+
+    def read_at(self, segment: int, offset: int, length: int) -> bytes:
+        """Positioned read of a raw event record (hot or compressed)."""
+        return self.events.read_at(segment, offset, length)
+
+    def iter_events(self, start_segment: Optional[int] = None, start_offset: int = 0):
+        """Stream event records across plain and compressed segments."""
+        for _, _, line in self.events.iter_lines(start_segment, start_offset):
+            yield json.loads(line)
+
+    def close(self):
+        self.events.close()
+
+    def _load_checkpoints(self) -> List[dict]:
+        checkpoints = []
+        if self.checkpoints_path.exists():
+            with open(self.checkpoints_path, "r") as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        checkpoints.append(json.loads(line))
+        return checkpoints
+
+    def _recover_head(self):
+        """Replay the tail after the last checkpoint to rebuild the chain head."""
+        if self.checkpoints:
+            last = self.checkpoints[-1]
+            seq, chain_hash = last["seq"], last["chain_hash"]
+            segment, offset = last.get("segment", 0), last["offset"]
+        else:
+            seq, chain_hash, segment, offset = 0, GENESIS_HASH, None, 0
+
+        hot_end = offset if segment == self.events.hot_segment else 0
+        for line_segment, line_offset, line in self.events.iter_lines(segment, offset):
+            chain_hash = chain_step(chain_hash, json.loads(line))
+            seq += 1
+            if line_segment == self.events.hot_segment:
+                hot_end = line_offset + len(line)
+
+        if hot_end != self.events.hot_size:
+            self.events.truncate_hot(hot_end)
+
+        return seq, chain_hash
+
+
+class WorkerVaultWriter:
+    """
+    Vault-side audit writer. Keeps one hash-chained event log per worker.
+    """
+
+    def __init__(self, vault_base_path: Path):
+        self.workers_path = vault_base_path / "workers"
+        self._logs: Dict[str, WorkerEventLog] = {}
+
+    def log_for(self, worker_id: str) -> WorkerEventLog:
+        if worker_id not in self._logs:
+            self._logs[worker_id] = WorkerEventLog(self.workers_path, worker_id)
+        return self._logs[worker_id]
+
+    def append_event(self, worker_id: str, event_record: dict) -> dict:
+        """Append an event to a worker's chained log."""
+        return self.log_for(worker_id).append(event_record)
+
+    def vault_integrity_hash(self, worker_id: str) -> str:
+        """Current chain head for a worker's event log."""
+        return self.log_for(worker_id).head_hash
+
+    def close(self):
+        for log in self._logs.values():
+            log.close()
+
+
+# CLI Wrapper (integrity verifier)
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verify a worker's hash-chained event log")
+    parser.add_argument("--vault", default="vault_system")
+    parser.add_argument("--worker", default="certificate_forge_worker_001")
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--end", type=int, default=None)
+
+    args = parser.parse_args()
+
+    log = WorkerEventLog(Path(args.vault) / "workers", args.worker)
+    result = log.verify_range(args.start, args.end)
+    log.close()
+
+    status = "✅ INTACT" if result["valid"] else f"❌ TAMPERED at seq {result['first_bad_seq']}"
+    print(f"{status} ({result['records_checked']} records replayed from checkpoint {result['anchor_seq']})")